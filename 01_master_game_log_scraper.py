@@ -13,6 +13,19 @@ Key Fixes from V1:
 - Added location detection (home/away/neutral)
 - Better error handling and logging
 - Added validation checks
+- Concurrent scrape mode: bounded worker pool behind a global token-bucket
+  rate limiter (run time is bounded by the request budget, not latency)
+- JSON schedule backend (--backend json): reads the teams/{id}/schedule API
+  instead of parsing the HTML schedule page; same output records
+- TeamID / OpponentID columns (ESPN IDs) for integer joins downstream; the
+  team registry (team_registry.py) is refreshed from the ESPN team list
+
+Usage:
+    python 01_master_game_log_scraper.py                  # concurrent (default)
+    python 01_master_game_log_scraper.py --workers 1      # one team at a time
+    python 01_master_game_log_scraper.py --rps 2.5        # tighter request budget
+    python 01_master_game_log_scraper.py --backend json   # schedule API instead of HTML
+    python 01_master_game_log_scraper.py --benchmark 25   # parse time, both backends
 
 Output: master_game_logs_2026.csv
 """
@@ -22,16 +35,40 @@ from bs4 import BeautifulSoup
 import pandas as pd
 import time
 import re
-from datetime import datetime
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 import logging
 
+import http_cache
+from rate_limiter import TokenBucket
+from team_names import clean_display_name
+import team_registry
+
 # ============================================================================
 # CONFIGURATION
 # ============================================================================
 SEASON_YEAR = 2026
 OUTPUT_FILE = "master_game_logs_2026.csv"
 HEADERS = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
-REQUEST_DELAY = 0.35  # Be respectful to ESPN's servers
+
+SCHEDULE_HTML_URL = "https://www.espn.com/mens-college-basketball/team/schedule/_/id/{team_id}/season/{season}"
+SCHEDULE_API_URL = "http://site.api.espn.com/apis/site/v2/sports/basketball/mens-college-basketball/teams/{team_id}/schedule?season={season}"
+BACKENDS = ('html', 'json')
+
+# Game dates are reported in Eastern time (matches the HTML schedule page).
+# Windows without the tzdata package has no IANA database -> fall back to EST,
+# which only shifts games tipping after 11pm EDT in March.
+try:
+    EASTERN = ZoneInfo("America/New_York")
+except ZoneInfoNotFoundError:
+    EASTERN = timezone(timedelta(hours=-5), "EST")
+
+# Concurrent scrape settings (replaces the old fixed 0.35s REQUEST_DELAY)
+MAX_WORKERS = 8              # Schedule pages in flight at once
+REQUESTS_PER_SECOND = 4.0    # Global budget shared by all workers - be respectful to ESPN
 
 # Setup logging
 logging.basicConfig(
@@ -44,118 +81,15 @@ logger = logging.getLogger(__name__)
 # ============================================================================
 # TEAM NAME STANDARDIZATION
 # ============================================================================
-# Comprehensive mascot list for cleaning opponent names
-MASCOTS = [
-    # SEC
-    'crimson tide', 'razorbacks', 'tigers', 'gators', 'bulldogs', 'wildcats',
-    'rebels', 'commodores', 'gamecocks', 'volunteers', 'aggies', 'longhorns',
-    # Big Ten
-    'buckeyes', 'wolverines', 'spartans', 'nittany lions', 'hawkeyes', 
-    'golden gophers', 'badgers', 'boilermakers', 'hoosiers', 'fighting illini',
-    'cornhuskers', 'scarlet knights', 'terrapins', 'bruins', 'trojans',
-    'ducks', 'huskies', 'cougars',
-    # Big 12
-    'jayhawks', 'red raiders', 'horned frogs', 'bears', 'cyclones', 
-    'sooners', 'cowboys', 'mountaineers', 'bearcats', 'knights', 'cougars',
-    'sun devils', 'buffaloes', 'utes', 'cardinals',
-    # ACC
-    'blue devils', 'tar heels', 'wolfpack', 'demon deacons', 'cavaliers',
-    'hokies', 'yellow jackets', 'seminoles', 'hurricanes', 'orange',
-    'panthers', 'fighting irish', 'eagles', 'cardinal',
-    # Big East
-    'blue jays', 'hoyas', 'red storm', 'pirates', 'friars', 'musketeers',
-    'golden eagles', 'bluejays', 'villanova wildcats',
-    # Other common
-    'tritons', 'billikens', 'gaels', 'toreros', 'dons', 'waves', 'broncos',
-    'aztecs', 'rebels', 'running rebels', 'falcons', 'owls', 'mean green',
-    'miners', 'roadrunners', 'thundering herd', 'rockets', 'redhawks',
-    'bobcats', 'zips', 'flashes', 'penguins', 'flames', 'phoenix',
-    'anteaters', 'gauchos', 'matadors', 'titans', 'highlanders', 'aggies',
-    'mustangs', 'leopards', 'patriots', 'monarchs', 'dukes', 'spiders',
-    'rams', 'explorers', 'hawks', 'jaspers', 'peacocks', 'red foxes',
-    'bonnies', 'flyers', 'raiders', 'colonels', 'bison', 'leathernecks'
-]
-
-# Known name variations that need explicit mapping
-TEAM_ALIASES = {
-    # California schools
-    'uc san diego': 'UC San Diego',
-    'ucsd': 'UC San Diego',
-    'uc davis': 'UC Davis',
-    'uc irvine': 'UC Irvine',
-    'uc riverside': 'UC Riverside',
-    'uc santa barbara': 'UC Santa Barbara',
-    'ucsb': 'UC Santa Barbara',
-    
-    # State abbreviations
-    'usc': 'USC',
-    'ucla': 'UCLA',
-    'unlv': 'UNLV',
-    'utep': 'UTEP',
-    'utsa': 'UTSA',
-    'unc': 'North Carolina',
-    'uconn': 'UConn',
-    'smu': 'SMU',
-    'tcu': 'TCU',
-    'lsu': 'LSU',
-    'vcu': 'VCU',
-    'fiu': 'FIU',
-    'fau': 'FAU',
-    
-    # Saint vs St.
-    "saint mary's": "Saint Mary's",
-    "st. mary's": "Saint Mary's",
-    "saint john's": "St. John's",
-    "saint joseph's": "Saint Joseph's",
-    "saint louis": "Saint Louis",
-    "st. louis": "Saint Louis",
-    "saint peter's": "Saint Peter's",
-    "saint bonaventure": "St. Bonaventure",
-    
-    # Other variations
-    'miami (fl)': 'Miami',
-    'miami florida': 'Miami',
-    'miami (oh)': 'Miami (OH)',
-    'miami ohio': 'Miami (OH)',
-    "hawai'i": "Hawaii",
-    'hawaii rainbow warriors': 'Hawaii',
-    'ole miss': 'Ole Miss',
-    'mississippi': 'Ole Miss',
-    'pitt': 'Pittsburgh',
-    'nc state': 'NC State',
-    'north carolina state': 'NC State',
-}
+# Mascots and aliases live in team_names.py (shared by every stage)
 
 
 def clean_team_name(raw_name: str) -> str:
     """
     Cleans and standardizes team names for consistent matching.
+    (Shared resolver: team_names.clean_display_name)
     """
-    if not isinstance(raw_name, str):
-        return ""
-    
-    name = raw_name.strip()
-    
-    # Remove ranking prefix (e.g., "#5 Duke" -> "Duke")
-    name = re.sub(r'^#\d+\s+', '', name)
-    
-    # Remove @ or vs prefix
-    name = re.sub(r'^(@|vs\.?)\s*', '', name)
-    
-    # Remove trailing asterisks or special chars
-    name = re.sub(r'[\*†‡]+$', '', name).strip()
-    
-    # Check aliases first (case-insensitive)
-    name_lower = name.lower()
-    if name_lower in TEAM_ALIASES:
-        return TEAM_ALIASES[name_lower]
-    
-    # Remove mascots (case-insensitive)
-    for mascot in MASCOTS:
-        pattern = r'\s+' + re.escape(mascot) + r'$'
-        name = re.sub(pattern, '', name, flags=re.IGNORECASE)
-    
-    return name.strip()
+    return clean_display_name(raw_name)
 
 
 def get_master_team_list() -> dict:
@@ -165,10 +99,9 @@ def get_master_team_list() -> dict:
     """
     url = "http://site.api.espn.com/apis/site/v2/sports/basketball/mens-college-basketball/teams?limit=400"
     try:
-        response = requests.get(url, timeout=15)
-        response.raise_for_status()
-        data = response.json()
+        data = http_cache.get_json(url, timeout=15)
         teams = data['sports'][0]['leagues'][0]['teams']
+        team_registry.refresh_from_espn([t['team'] for t in teams])
         
         team_dict = {}
         for t in teams:
@@ -234,89 +167,209 @@ def parse_date(date_text: str) -> str:
         return ""
 
 
+def _href_team_id(link):
+    """ESPN ID from a team profile link (.../team/_/id/150/duke-blue-devils)."""
+    match = re.search(r'/id/(\d+)', link.get('href', '')) if link else None
+    return int(match.group(1)) if match else None
+
+
+def parse_schedule_html(team_name: str, html: bytes, espn_id=None) -> list:
+    """
+    Parses a team's ESPN HTML schedule page into game records.
+    Only includes games against D1 opponents.
+    """
+    soup = BeautifulSoup(html, 'html.parser')
+    
+    games = []
+    rows = soup.find_all('tr', class_='Table__TR')
+    
+    for row in rows:
+        cells = row.find_all('td')
+        if len(cells) < 3:
+            continue
+        
+        # --- NON-D1 FILTER ---
+        # ESPN links D1 teams to their profiles. No <a> tag = non-D1 opponent.
+        opp_cell = cells[1]
+        opp_link = opp_cell.find('a')
+        if not opp_link:
+            continue
+        
+        # --- PARSE OPPONENT ---
+        opp_raw = opp_cell.get_text(strip=True)
+        opp_clean = clean_team_name(opp_raw)
+        
+        if not opp_clean:
+            continue
+        
+        # --- PARSE LOCATION ---
+        location = parse_location(opp_raw, opp_clean)
+        
+        # --- PARSE DATE ---
+        date_str = parse_date(cells[0].get_text(strip=True))
+        
+        # --- PARSE RESULT & SCORES ---
+        result_text = cells[2].get_text(strip=True)
+        
+        # Match patterns like "W 85-72", "L 68-75", "W 102-98 OT"
+        score_match = re.search(r'([WL])\s*(\d+)-(\d+)', result_text)
+        
+        if not score_match:
+            # Game hasn't been played yet or cancelled
+            continue
+        
+        result_letter = score_match.group(1)
+        score_a = int(score_match.group(2))
+        score_b = int(score_match.group(3))
+        
+        # --- SCORE ASSIGNMENT FIX ---
+        # ESPN shows YOUR score first in wins, opponent's first in losses
+        # Actually, ESPN always shows winner-loser format
+        # So we use W/L to determine which is which
+        if result_letter == 'W':
+            tm_score = max(score_a, score_b)
+            opp_score = min(score_a, score_b)
+        else:
+            tm_score = min(score_a, score_b)
+            opp_score = max(score_a, score_b)
+        
+        # Check for overtime
+        is_ot = 'OT' in result_text.upper()
+        
+        games.append({
+            'Date': date_str,
+            'Team': team_name,
+            'Opponent': opp_clean,
+            'Location': location,
+            'Result': result_letter,
+            'TeamScore': tm_score,
+            'OpponentScore': opp_score,
+            'Margin': tm_score - opp_score,
+            'TotalPoints': tm_score + opp_score,
+            'IsOT': is_ot,
+            'TeamID': int(espn_id) if espn_id is not None else None,
+            'OpponentID': _href_team_id(opp_link)
+        })
+    
+    return games
+
+
 def scrape_team_schedule(team_name: str, espn_id: str, session: requests.Session) -> list:
     """
     Scrapes a team's schedule from ESPN and returns game data.
     Only includes games against D1 opponents.
     """
-    url = f"https://www.espn.com/mens-college-basketball/team/schedule/_/id/{espn_id}/season/{SEASON_YEAR}"
+    url = SCHEDULE_HTML_URL.format(team_id=espn_id, season=SEASON_YEAR)
     
     try:
         response = session.get(url, timeout=15)
         response.raise_for_status()
-        soup = BeautifulSoup(response.content, 'html.parser')
+        return parse_schedule_html(team_name, response.content, espn_id)
         
-        games = []
-        rows = soup.find_all('tr', class_='Table__TR')
+    except requests.RequestException as e:
+        logger.warning(f"Request error for {team_name}: {e}")
+        return []
+    except Exception as e:
+        logger.warning(f"Parse error for {team_name}: {e}")
+        return []
+
+
+# ============================================================================
+# JSON SCHEDULE BACKEND
+# ============================================================================
+def _score_value(competitor: dict):
+    """Competitor score from the schedule API (dict with 'value' or a plain string)."""
+    score = competitor.get('score')
+    if isinstance(score, dict):
+        score = score.get('value', score.get('displayValue'))
+    try:
+        return int(float(score))
+    except (TypeError, ValueError):
+        return None
+
+
+def eastern_date(iso_date: str) -> str:
+    """'2025-11-05T00:30Z' -> '2025-11-04' (the game's date in Eastern time)."""
+    for fmt in ('%Y-%m-%dT%H:%MZ', '%Y-%m-%dT%H:%M:%SZ'):
+        try:
+            dt = datetime.strptime(iso_date, fmt).replace(tzinfo=timezone.utc)
+            return dt.astimezone(EASTERN).strftime('%Y-%m-%d')
+        except ValueError:
+            continue
+    return iso_date[:10]
+
+
+def parse_schedule_json(team_name: str, espn_id: str, data: dict, d1_ids: set) -> list:
+    """
+    Parses the teams/{id}/schedule API payload into the same records as
+    parse_schedule_html. Opponents outside `d1_ids` (non-D1) are skipped.
+    """
+    espn_id = str(espn_id)
+    games = []
+    
+    for event in data.get('events', []):
+        comp = (event.get('competitions') or [{}])[0]
+        status = comp.get('status', {}).get('type', {})
+        if not (status.get('completed') or status.get('state') == 'post'):
+            continue
         
-        for row in rows:
-            cells = row.find_all('td')
-            if len(cells) < 3:
-                continue
-            
-            # --- NON-D1 FILTER ---
-            # ESPN links D1 teams to their profiles. No <a> tag = non-D1 opponent.
-            opp_cell = cells[1]
-            if not opp_cell.find('a'):
-                continue
-            
-            # --- PARSE OPPONENT ---
-            opp_raw = opp_cell.get_text(strip=True)
-            opp_clean = clean_team_name(opp_raw)
-            
-            if not opp_clean:
-                continue
-            
-            # --- PARSE LOCATION ---
-            location = parse_location(opp_raw, opp_clean)
-            
-            # --- PARSE DATE ---
-            date_str = parse_date(cells[0].get_text(strip=True))
-            
-            # --- PARSE RESULT & SCORES ---
-            result_text = cells[2].get_text(strip=True)
-            
-            # Match patterns like "W 85-72", "L 68-75", "W 102-98 OT"
-            score_match = re.search(r'([WL])\s*(\d+)-(\d+)', result_text)
-            
-            if not score_match:
-                # Game hasn't been played yet or cancelled
-                continue
-            
-            result_letter = score_match.group(1)
-            score_a = int(score_match.group(2))
-            score_b = int(score_match.group(3))
-            
-            # --- SCORE ASSIGNMENT FIX ---
-            # ESPN shows YOUR score first in wins, opponent's first in losses
-            # Actually, ESPN always shows winner-loser format
-            # So we use W/L to determine which is which
-            if result_letter == 'W':
-                tm_score = max(score_a, score_b)
-                opp_score = min(score_a, score_b)
-            else:
-                tm_score = min(score_a, score_b)
-                opp_score = max(score_a, score_b)
-            
-            # Check for overtime
-            is_ot = 'OT' in result_text.upper()
-            
-            games.append({
-                'Date': date_str,
-                'Team': team_name,
-                'Opponent': opp_clean,
-                'Location': location,
-                'Result': result_letter,
-                'TeamScore': tm_score,
-                'OpponentScore': opp_score,
-                'Margin': tm_score - opp_score,
-                'TotalPoints': tm_score + opp_score,
-                'IsOT': is_ot
-            })
+        comps = comp.get('competitors', [])
+        us = next((c for c in comps if str(c.get('id', c.get('team', {}).get('id'))) == espn_id), None)
+        them = next((c for c in comps if c is not us), None)
+        if us is None or them is None:
+            continue
         
-        return games
+        # --- NON-D1 FILTER ---
+        opp_id = str(them.get('id', them.get('team', {}).get('id')))
+        if opp_id not in d1_ids:
+            continue
         
-    except requests.RequestException as e:
+        opp_team = them.get('team', {})
+        opp_clean = clean_team_name(opp_team.get('location') or opp_team.get('displayName', ''))
+        if not opp_clean:
+            continue
+        
+        tm_score = _score_value(us)
+        opp_score = _score_value(them)
+        if tm_score is None or opp_score is None or tm_score == opp_score:
+            continue
+        
+        if comp.get('neutralSite'):
+            location = 'Neutral'
+        else:
+            location = 'Home' if us.get('homeAway') == 'home' else 'Away'
+        
+        detail = f"{status.get('detail', '')} {status.get('shortDetail', '')}".upper()
+        is_ot = 'OT' in detail or (comp.get('status', {}).get('period') or 0) > 2
+        
+        games.append({
+            'Date': eastern_date(event.get('date') or comp.get('date')),
+            'Team': team_name,
+            'Opponent': opp_clean,
+            'Location': location,
+            'Result': 'W' if tm_score > opp_score else 'L',
+            'TeamScore': tm_score,
+            'OpponentScore': opp_score,
+            'Margin': tm_score - opp_score,
+            'TotalPoints': tm_score + opp_score,
+            'IsOT': is_ot,
+            'TeamID': int(espn_id),
+            'OpponentID': int(opp_id)
+        })
+    
+    return games
+
+
+def scrape_team_schedule_json(team_name: str, espn_id: str, session: requests.Session,
+                              d1_ids: set) -> list:
+    """JSON-backend counterpart of scrape_team_schedule (read through the HTTP cache)."""
+    url = SCHEDULE_API_URL.format(team_id=espn_id, season=SEASON_YEAR)
+    
+    try:
+        data = http_cache.get_json(url, timeout=15, session=session)
+        return parse_schedule_json(team_name, espn_id, data, d1_ids)
+        
+    except (requests.RequestException, ValueError) as e:
         logger.warning(f"Request error for {team_name}: {e}")
         return []
     except Exception as e:
@@ -363,50 +416,149 @@ def validate_data(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
-def main():
-    """Main execution function."""
-    logger.info("=" * 60)
-    logger.info("THE BIBLE - Step 1: Master Game Log Scraper")
-    logger.info("=" * 60)
+def scrape_all_schedules(teams: dict, workers: int = MAX_WORKERS,
+                         rps: float = REQUESTS_PER_SECOND, backend: str = 'html') -> tuple:
+    """
+    Scrapes every team's schedule with a bounded worker pool.
+    All workers share one token bucket, so total request rate never exceeds
+    `rps`. Results are collected in team-list order, so the output is
+    identical to a one-at-a-time scrape.
+    Returns (all_games, errors).
+    """
+    limiter = TokenBucket(rps)
+    cache = http_cache.get_cache()
+    d1_ids = {str(tid) for tid in teams.values()}
+    local = threading.local()
+    items = list(teams.items())
+    total = len(items)
+    
+    def get_session() -> requests.Session:
+        # requests.Session is not guaranteed thread-safe: one per worker
+        if not hasattr(local, 'session'):
+            local.session = requests.Session()
+            local.session.headers.update(HEADERS)
+        return local.session
+    
+    def scrape_one(item):
+        name, tid = item
+        if backend == 'json':
+            # Fresh cache entries cost no request -> don't spend a token on them
+            if not cache.is_fresh(SCHEDULE_API_URL.format(team_id=tid, season=SEASON_YEAR)):
+                limiter.acquire()
+            return scrape_team_schedule_json(name, tid, get_session(), d1_ids)
+        limiter.acquire()
+        return scrape_team_schedule(name, tid, get_session())
+    
+    logger.info(f"Scraping {total} schedules via {backend} backend "
+                f"({workers} workers, {rps:.1f} req/s budget)")
     
-    # Get team list
-    teams = get_master_team_list()
-    if not teams:
-        logger.error("Failed to load team list. Exiting.")
-        return
+    all_games = []
+    errors = []
     
-    # Setup session
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        # executor.map yields in submission order -> deterministic output
+        for i, ((name, _), games) in enumerate(zip(items, executor.map(scrape_one, items)), 1):
+            if games:
+                all_games.extend(games)
+                logger.info(f"[{i}/{total}] {name}: {len(games)} D1 games")
+            else:
+                errors.append(name)
+                logger.info(f"[{i}/{total}] {name}: no games")
+    
+    return all_games, errors
+
+
+def benchmark_backends(teams: dict, sample: int = 25, repeats: int = 5):
+    """
+    Downloads `sample` schedules in both formats once, then times parsing only
+    (the CPU cost the backends differ in) and reports per-team averages.
+    """
+    d1_ids = {str(tid) for tid in teams.values()}
+    items = list(teams.items())[:sample]
     session = requests.Session()
     session.headers.update(HEADERS)
     
-    all_games = []
-    errors = []
+    logger.info(f"Benchmark: downloading {len(items)} schedules in both formats...")
+    payloads = []
+    for name, tid in items:
+        try:
+            html = session.get(SCHEDULE_HTML_URL.format(team_id=tid, season=SEASON_YEAR), timeout=15).content
+            data = http_cache.get_json(SCHEDULE_API_URL.format(team_id=tid, season=SEASON_YEAR),
+                                       timeout=15, session=session)
+            payloads.append((name, tid, html, data))
+        except (requests.RequestException, ValueError) as e:
+            logger.warning(f"Benchmark skip {name}: {e}")
+        time.sleep(0.25)
+    
+    if not payloads:
+        logger.error("Benchmark: nothing downloaded")
+        return
     
-    for i, (name, tid) in enumerate(teams.items(), 1):
-        logger.info(f"[{i}/{len(teams)}] Scraping: {name}")
-        
-        games = scrape_team_schedule(name, tid, session)
-        
-        if games:
-            all_games.extend(games)
-            logger.info(f"    -> Found {len(games)} D1 games")
-        else:
-            errors.append(name)
-        
-        time.sleep(REQUEST_DELAY)
+    timings = {}
+    rows = {}
+    for backend in BACKENDS:
+        start = time.perf_counter()
+        for _ in range(repeats):
+            count = 0
+            for name, tid, html, data in payloads:
+                if backend == 'html':
+                    count += len(parse_schedule_html(name, html, tid))
+                else:
+                    count += len(parse_schedule_json(name, tid, data, d1_ids))
+        timings[backend] = (time.perf_counter() - start) / (repeats * len(payloads))
+        rows[backend] = count
+    
+    logger.info("=" * 60)
+    logger.info(f"PARSE BENCHMARK ({len(payloads)} teams x {repeats} repeats)")
+    for backend in BACKENDS:
+        logger.info(f"  {backend:>4}: {timings[backend] * 1000:8.2f} ms/team   {rows[backend]} games")
+    if timings['json'] > 0:
+        logger.info(f"  json speedup: {timings['html'] / timings['json']:.1f}x")
+
+
+def scrape_game_logs(workers: int = MAX_WORKERS, rps: float = REQUESTS_PER_SECOND,
+                     backend: str = 'html') -> pd.DataFrame:
+    """
+    Scrapes, validates and sorts every team's schedule (in-process entry
+    point; no file I/O). Returns the game-log DataFrame, or None on failure.
+    """
+    # Get team list
+    teams = get_master_team_list()
+    if not teams:
+        logger.error("Failed to load team list. Exiting.")
+        return None
+    
+    start = time.time()
+    all_games, errors = scrape_all_schedules(teams, workers=workers, rps=rps, backend=backend)
+    logger.info(f"Scraped {len(teams)} schedules in {time.time() - start:.1f}s")
     
     if not all_games:
         logger.error("No games scraped. Check ESPN connectivity.")
-        return
+        return None
+    
+    if errors:
+        logger.warning(f"Teams with errors ({len(errors)}): {errors[:10]}...")
     
     # Convert to DataFrame
     df = pd.DataFrame(all_games)
+    df[['TeamID', 'OpponentID']] = df[['TeamID', 'OpponentID']].astype('Int64')
     
     # Validate
     df = validate_data(df)
     
     # Sort by date
-    df = df.sort_values(['Date', 'Team']).reset_index(drop=True)
+    return df.sort_values(['Date', 'Team']).reset_index(drop=True)
+
+
+def main(workers: int = MAX_WORKERS, rps: float = REQUESTS_PER_SECOND, backend: str = 'html'):
+    """Main execution function."""
+    logger.info("=" * 60)
+    logger.info("THE BIBLE - Step 1: Master Game Log Scraper")
+    logger.info("=" * 60)
+    
+    df = scrape_game_logs(workers=workers, rps=rps, backend=backend)
+    if df is None:
+        return
     
     # Save
     df.to_csv(OUTPUT_FILE, index=False)
@@ -419,9 +571,6 @@ def main():
     logger.info(f"Date range: {df['Date'].min()} to {df['Date'].max()}")
     logger.info(f"Output file: {OUTPUT_FILE}")
     
-    if errors:
-        logger.warning(f"Teams with errors ({len(errors)}): {errors[:10]}...")
-    
     # Quick sanity checks
     logger.info("\nSanity Checks:")
     logger.info(f"  Avg points per game: {df['TotalPoints'].mean():.1f}")
@@ -431,4 +580,18 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="THE BIBLE - Step 1: Master Game Log Scraper")
+    parser.add_argument('--workers', type=int, default=MAX_WORKERS,
+                        help=f'Concurrent schedule requests (default {MAX_WORKERS})')
+    parser.add_argument('--rps', type=float, default=REQUESTS_PER_SECOND,
+                        help=f'Global requests-per-second budget (default {REQUESTS_PER_SECOND})')
+    parser.add_argument('--backend', choices=BACKENDS, default='html',
+                        help='Schedule source: ESPN HTML page or teams/{id}/schedule JSON API')
+    parser.add_argument('--benchmark', type=int, metavar='N', default=0,
+                        help='Time schedule parsing for N teams on both backends and exit')
+    args = parser.parse_args()
+    
+    if args.benchmark:
+        benchmark_backends(get_master_team_list(), sample=args.benchmark)
+    else:
+        main(workers=args.workers, rps=args.rps, backend=args.backend)
@@ -5,14 +5,38 @@ THE BIBLE - Data Pipeline Step 2 (FINAL FIXED VERSION)
 Fixes:
 1. Mascot Stripping (matches "Alabama Crimson Tide" -> "Alabama")
 2. Tempo Priority (uses "Tempo" instead of "AdjTempo" for accurate possession counts)
+3. Integer team keys (ESPN TeamID via team_registry.py) for tempo lookups;
+   profiles carry TeamID for Step 3
+4. Vectorized engine: one tempo join, column arithmetic, one groupby -
+   O(games) instead of a filter + iterrows per team
+5. Incremental state: per-team weighted sums / sums of squares / counts are
+   persisted to efficiency_state_2026.json, so a daily run only folds in the
+   new games. Optional exponential recency decay (--half-life DAYS).
+6. Per-game fact table: possessions and efficiencies for every team-game are
+   written to team_game_efficiency_2026.csv (game_facts.py) for Steps 3/4.
+
+Usage:
+    python 02_efficiency_processor.py                 # incremental update (full build on first run)
+    python 02_efficiency_processor.py --half-life 30  # recency-weighted profiles
+    python 02_efficiency_processor.py --rebuild       # ignore the saved state
+    python 02_efficiency_processor.py --verify        # incremental vs full rebuild
+    python 02_efficiency_processor.py --benchmark 10  # loop vs vectorized, 1x..10x games
 """
 
 import pandas as pd
 import numpy as np
+import hashlib
+import argparse
+import json
 import logging
-import re
 import os
 import sys
+import tempfile
+from datetime import datetime
+
+from game_facts import FACT_FILE, to_facts, write_game_facts
+from team_names import team_key
+from team_registry import load_registry, team_ids
 
 # ============================================================================
 # CONFIGURATION
@@ -20,49 +44,23 @@ import sys
 INPUT_GAME_LOGS = "master_game_logs_2026.csv"
 KENPOM_DATA_FILE = "kenpom_2026.csv"
 OUTPUT_FILE = "team_raw_efficiency_profiles_2026.csv"
+STATE_FILE = "efficiency_state_2026.json"
 DEFAULT_TEMPO = 68.0
 
+# Recency weighting: a game HALF_LIFE_DAYS old counts half as much as today's.
+# None = every game weighs the same (the classic season-average profile).
+HALF_LIFE_DAYS = None
+
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(message)s')
 logger = logging.getLogger(__name__)
 
-# ============================================================================
-# DATA: MASCOTS
-# ============================================================================
-MASCOTS = [
-    'crimson tide', 'razorbacks', 'tigers', 'gators', 'bulldogs', 'wildcats',
-    'rebels', 'commodores', 'gamecocks', 'volunteers', 'aggies', 'longhorns',
-    'buckeyes', 'wolverines', 'spartans', 'nittany lions', 'hawkeyes',
-    'golden gophers', 'badgers', 'boilermakers', 'hoosiers', 'fighting illini',
-    'cornhuskers', 'scarlet knights', 'terrapins', 'bruins', 'trojans',
-    'ducks', 'huskies', 'cougars', 'jayhawks', 'red raiders', 'horned frogs',
-    'bears', 'cyclones', 'sooners', 'cowboys', 'mountaineers', 'bearcats',
-    'knights', 'sun devils', 'buffaloes', 'utes', 'cardinals', 'blue devils',
-    'tar heels', 'wolfpack', 'demon deacons', 'cavaliers', 'hokies',
-    'yellow jackets', 'seminoles', 'hurricanes', 'orange', 'panthers',
-    'fighting irish', 'eagles', 'blue jays', 'hoyas', 'red storm', 'pirates',
-    'friars', 'musketeers', 'golden eagles', 'tritons', 'billikens', 'gaels',
-    'toreros', 'dons', 'waves', 'broncos', 'aztecs', 'running rebels',
-    'falcons', 'owls', 'mean green', 'miners', 'roadrunners'
-]
-
 # ============================================================================
 # NORMALIZATION LOGIC
 # ============================================================================
 def normalize_name(name):
-    """Standardizes team names by stripping mascots and punctuation."""
-    if not isinstance(name, str): return ""
-    name = name.lower().strip()
-    
-    # Strip Mascots
-    for mascot in MASCOTS:
-        pattern = r'\s+' + re.escape(mascot) + r'\s*$'
-        name = re.sub(pattern, '', name)
-        
-    # Standardize
-    name = name.replace('st.', 'st').replace('&', 'and').replace("'", '').replace('-', '')
-    name = re.sub(r'[^a-z0-9]', '', name)
-    return name.strip()
+    """Standardizes team names by stripping mascots and punctuation (shared resolver)."""
+    return team_key(name)
 
 def create_name_matcher(teams: list) -> dict:
     matcher = {}
@@ -104,61 +102,85 @@ def load_kenpom_tempo(filepath: str) -> dict:
         return {}
 
 # ============================================================================
-# MAIN PROCESSING
+# VECTORIZED ENGINE
 # ============================================================================
-def process_efficiency():
-    logger.info("=" * 60)
-    logger.info("THE BIBLE - Step 2: Efficiency Processor")
-    logger.info("=" * 60)
-    
-    games_df = pd.read_csv(INPUT_GAME_LOGS)
-    tempo_data = load_kenpom_tempo(KENPOM_DATA_FILE)
-    use_tempo = len(tempo_data) > 0
-    
-    # Create Matcher
-    tempo_matcher = create_name_matcher(list(tempo_data.keys()))
-    
+def add_game_efficiency(games_df: pd.DataFrame, tempo_by_id: dict) -> pd.DataFrame:
+    """
+    Adds Possessions / OffEff / DefEff / NetEff to every game row.
+    With tempo data: average of the two teams' tempos (team tempo is taken
+    from the team's first row, as the per-team loop did). Without: points / 1.84,
+    clipped to 50-90.
+    """
+    games = games_df.copy()
+    if tempo_by_id:
+        tempo = pd.Series(tempo_by_id, dtype='float64')
+        team_id = games.groupby('Team', sort=False)['TeamKey'].transform('first')
+        team_tempo = team_id.map(tempo).fillna(DEFAULT_TEMPO)
+        opp_tempo = games['OppKey'].map(tempo).fillna(DEFAULT_TEMPO)
+        games['Possessions'] = (team_tempo + opp_tempo) / 2
+    else:
+        poss = (games['TeamScore'] + games['OpponentScore']) / 1.84
+        games['Possessions'] = poss.clip(lower=50, upper=90)
+
+    games['OffEff'] = (games['TeamScore'] / games['Possessions']) * 100
+    games['DefEff'] = (games['OpponentScore'] / games['Possessions']) * 100
+    games['NetEff'] = games['OffEff'] - games['DefEff']
+    return games
+
+
+def build_profiles(games: pd.DataFrame) -> pd.DataFrame:
+    """One groupby over the game rows -> one profile per team (first-seen team order)."""
+    games = games.assign(Win=games['Result'] == 'W', Loss=games['Result'] == 'L')
+    grouped = games.groupby('Team', sort=False)
+    profiles = grouped.agg(
+        TeamID=('TeamKey', 'first'),
+        Games=('TeamScore', 'size'),
+        Wins=('Win', 'sum'),
+        Losses=('Loss', 'sum'),
+        WinPct=('Win', 'mean'),
+        RawOffEff=('OffEff', 'mean'),
+        RawDefEff=('DefEff', 'mean'),
+        RawNetEff=('NetEff', 'mean'),
+        AvgTempo=('Possessions', 'mean'),
+        OffEffStd=('OffEff', 'std'),
+        DefEffStd=('DefEff', 'std'),
+        AvgPointsFor=('TeamScore', 'mean'),
+        AvgPointsAgainst=('OpponentScore', 'mean'),
+        AvgMargin=('Margin', 'mean'),
+    ).reset_index()
+
+    profiles.insert(3, 'Record', profiles['Wins'].astype(str) + '-' + profiles['Losses'].astype(str))
+    profiles = profiles.drop(columns=['Wins', 'Losses'])
+    # Pseudo-IDs (negative) are per-run only
+    profiles['TeamID'] = profiles['TeamID'].where(profiles['TeamID'] > 0).astype('Int64')
+    profiles['RawRank'] = profiles['RawNetEff'].rank(ascending=False, method='min')
+    return profiles
+
+
+def build_profiles_loop(games_df: pd.DataFrame, tempo_by_id: dict) -> pd.DataFrame:
+    """Original per-team filter + iterrows implementation (kept for --benchmark)."""
+    use_tempo = len(tempo_by_id) > 0
     team_profiles = []
-    all_teams = games_df['Team'].unique()
-    
-    logger.info(f"Processing {len(all_teams)} teams...")
-    
-    for team in all_teams:
-        # Determine Team Tempo
-        team_tempo = DEFAULT_TEMPO
-        if use_tempo:
-            norm_name = normalize_name(team)
-            if norm_name in tempo_matcher:
-                matched_name = tempo_matcher[norm_name]
-                team_tempo = tempo_data[matched_name]
-        
-        # Process Games
+    for team in games_df['Team'].unique():
         team_games = games_df[games_df['Team'] == team].copy()
+        team_id = int(team_games['TeamKey'].iloc[0])
+        team_tempo = tempo_by_id.get(team_id, DEFAULT_TEMPO) if use_tempo else DEFAULT_TEMPO
+
         possessions_list = []
-        
         for _, game in team_games.iterrows():
-            opp_tempo = DEFAULT_TEMPO
-            if use_tempo:
-                opp_norm = normalize_name(game['Opponent'])
-                if opp_norm in tempo_matcher:
-                    opp_tempo = tempo_data[tempo_matcher[opp_norm]]
-            
-            # Possessions Formula
             if use_tempo:
-                poss = (team_tempo + opp_tempo) / 2
+                poss = (team_tempo + tempo_by_id.get(game['OppKey'], DEFAULT_TEMPO)) / 2
             else:
-                poss = (game['TeamScore'] + game['OpponentScore']) / 1.84
-                poss = max(50, min(90, poss))
-                
+                poss = max(50, min(90, (game['TeamScore'] + game['OpponentScore']) / 1.84))
             possessions_list.append(poss)
-        
+
         team_games['Possessions'] = possessions_list
         team_games['OffEff'] = (team_games['TeamScore'] / team_games['Possessions']) * 100
         team_games['DefEff'] = (team_games['OpponentScore'] / team_games['Possessions']) * 100
         team_games['NetEff'] = team_games['OffEff'] - team_games['DefEff']
-        
-        profile = {
+        team_profiles.append({
             'Team': team,
+            'TeamID': team_id if team_id > 0 else None,
             'Games': len(team_games),
             'Record': f"{(team_games['Result']=='W').sum()}-{((team_games['Result']=='L').sum())}",
             'WinPct': (team_games['Result']=='W').mean(),
@@ -171,15 +193,343 @@ def process_efficiency():
             'AvgPointsFor': team_games['TeamScore'].mean(),
             'AvgPointsAgainst': team_games['OpponentScore'].mean(),
             'AvgMargin': team_games['Margin'].mean(),
-        }
-        team_profiles.append(profile)
-    
+        })
     profiles_df = pd.DataFrame(team_profiles)
+    profiles_df['TeamID'] = profiles_df['TeamID'].astype('Int64')
     profiles_df['RawRank'] = profiles_df['RawNetEff'].rank(ascending=False, method='min')
-    profiles_df.sort_values('RawRank').to_csv(OUTPUT_FILE, index=False)
+    return profiles_df
+
+
+def load_games(games_df: pd.DataFrame, tempo_data: dict):
+    """Adds integer TeamKey / OppKey and re-keys the KenPom tempo dict by ID."""
+    registry = load_registry()
+    games_df = games_df.copy()
+    games_df['TeamKey'] = team_ids(games_df, 'Team', 'TeamID')
+    games_df['OppKey'] = team_ids(games_df, 'Opponent', 'OpponentID')
+    tempo_by_id = {registry.key_for(name): tempo for name, tempo in tempo_data.items()}
+    return games_df, tempo_by_id
+
+
+# ============================================================================
+# INCREMENTAL STATE
+# ============================================================================
+# Weighted sums (w*x) for every averaged column, weighted sums of squares for
+# the two std columns. Plain counts keep Games / Record exact.
+SUM_COLUMNS = ['OffEff', 'DefEff', 'NetEff', 'Possessions', 'TeamScore', 'OpponentScore', 'Margin', 'Win']
+SQUARE_COLUMNS = ['OffEff', 'DefEff']
+STATE_COLUMNS = (['TeamID', 'Games', 'Wins', 'Losses', 'W', 'W2']
+                 + [f"S_{c}" for c in SUM_COLUMNS] + [f"Q_{c}" for c in SQUARE_COLUMNS])
+
+
+def game_keys(games_df: pd.DataFrame) -> pd.Series:
+    """Stable identity per log row (Date|Team|Opponent, numbered if repeated)."""
+    base = games_df['Date'].astype(str) + '|' + games_df['Team'].astype(str) + '|' + games_df['Opponent'].astype(str)
+    return base + '#' + base.groupby(base).cumcount().astype(str)
+
+
+def tempo_fingerprint(tempo_data: dict) -> str:
+    """Possessions depend on the tempo table, so a new table invalidates the state."""
+    h = hashlib.sha1()
+    for name, tempo in sorted((str(k), float(v)) for k, v in tempo_data.items()):
+        h.update(f"{name}={tempo!r};".encode('utf-8'))
+    return h.hexdigest()[:16]
+
+
+def empty_state(half_life, tempo_fp: str) -> dict:
+    return {
+        'half_life': half_life,
+        'tempo_fingerprint': tempo_fp,
+        'as_of': None,
+        'ingested': [],
+        'teams': pd.DataFrame(columns=STATE_COLUMNS, dtype='float64').rename_axis('Team'),
+    }
+
+
+def load_state(path: str = STATE_FILE):
+    """Saved accumulator state, or None if missing/unreadable."""
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'r') as f:
+            raw = json.load(f)
+        teams = pd.DataFrame(raw['teams']['data'], index=raw['teams']['index'], columns=raw['teams']['columns'])
+        raw['teams'] = teams.rename_axis('Team').astype('float64')
+        return raw
+    except Exception as e:
+        logger.warning(f"⚠️ Could not read {path}: {e}")
+        return None
+
+
+def save_state(state: dict, path: str = STATE_FILE):
+    teams = state['teams']
+    payload = dict(state, updated=datetime.now().isoformat(timespec='seconds'),
+                   teams={'index': teams.index.tolist(), 'columns': teams.columns.tolist(),
+                          'data': teams.values.tolist()})
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix='.tmp')
+    with os.fdopen(fd, 'w') as f:
+        json.dump(payload, f)
+    os.replace(tmp, path)
+
+
+def accumulate(state: dict, games: pd.DataFrame) -> dict:
+    """
+    Folds efficiency rows (output of add_game_efficiency) into the state.
+    Cost is O(len(games)) plus one O(teams) rescale when the decay anchor
+    (latest game date) moves forward.
+    """
+    if games.empty:
+        return state
+    half_life = state['half_life']
+    dates = pd.to_datetime(games['Date'])
+    as_of = dates.max()
+    teams = state['teams']
+
+    if state['as_of'] is not None:
+        prev = pd.Timestamp(state['as_of'])
+        if half_life and as_of > prev:
+            factor = 0.5 ** ((as_of - prev).days / half_life)
+            weighted = ['W'] + [f"S_{c}" for c in SUM_COLUMNS] + [f"Q_{c}" for c in SQUARE_COLUMNS]
+            teams = teams.copy()
+            teams[weighted] *= factor
+            teams['W2'] *= factor * factor
+        as_of = max(as_of, prev)
+
+    w = 0.5 ** ((as_of - dates).dt.days / half_life) if half_life else pd.Series(1.0, index=games.index)
+    win = (games['Result'] == 'W').astype('float64')
+    parts = pd.DataFrame({
+        'Team': games['Team'],
+        'Games': 1.0,
+        'Wins': win,
+        'Losses': (games['Result'] == 'L').astype('float64'),
+        'W': w,
+        'W2': w * w,
+    })
+    values = games.assign(Win=win)
+    for c in SUM_COLUMNS:
+        parts[f"S_{c}"] = w * values[c]
+    for c in SQUARE_COLUMNS:
+        parts[f"Q_{c}"] = w * values[c] * values[c]
+    delta = parts.groupby('Team', sort=False).sum()
+
+    # Real ESPN IDs only; pseudo-IDs don't survive the run
+    ids = games.groupby('Team', sort=False)['TeamKey'].first()
+    delta['TeamID'] = ids.where(ids > 0).astype('float64')
+
+    order = teams.index.append(delta.index[~delta.index.isin(teams.index)])
+    merged = teams.reindex(order)
+    known_ids = merged['TeamID'].combine_first(delta['TeamID'].reindex(order))
+    summed = merged.drop(columns='TeamID').fillna(0.0).add(
+        delta.drop(columns='TeamID').reindex(order).fillna(0.0))
+    summed.insert(0, 'TeamID', known_ids)
+
+    return dict(state, as_of=as_of.strftime('%Y-%m-%d'), teams=summed[STATE_COLUMNS].rename_axis('Team'))
+
+
+def profiles_from_state(state: dict) -> pd.DataFrame:
+    """Same columns as build_profiles, from the accumulators (weighted when decay is on)."""
+    t = state['teams']
+    W = t['W']
+    mean = {c: t[f"S_{c}"] / W for c in SUM_COLUMNS}
+
+    # Unbiased weighted std (reliability weights); equals the sample std when all w = 1
+    def weighted_std(c):
+        var = (t[f"Q_{c}"] / W - mean[c] ** 2).clip(lower=0)
+        correction = W * W / (W * W - t['W2'])
+        return np.sqrt(var * correction).where(t['Games'] > 1)
+
+    profiles = pd.DataFrame({
+        'Team': t.index,
+        'TeamID': t['TeamID'].astype('Int64'),
+        'Games': t['Games'].astype('int64'),
+        'Record': t['Wins'].astype('int64').astype(str) + '-' + t['Losses'].astype('int64').astype(str),
+        'WinPct': mean['Win'],
+        'RawOffEff': mean['OffEff'],
+        'RawDefEff': mean['DefEff'],
+        'RawNetEff': mean['NetEff'],
+        'AvgTempo': mean['Possessions'],
+        'OffEffStd': weighted_std('OffEff'),
+        'DefEffStd': weighted_std('DefEff'),
+        'AvgPointsFor': mean['TeamScore'],
+        'AvgPointsAgainst': mean['OpponentScore'],
+        'AvgMargin': mean['Margin'],
+    }).reset_index(drop=True)
+    profiles['RawRank'] = profiles['RawNetEff'].rank(ascending=False, method='min')
+    return profiles
+
+
+def rebuild_reason(state, half_life, tempo_fp: str, keys: pd.Series):
+    """Why the saved state can't be extended (None if it can)."""
+    if state is None:
+        return "no saved state"
+    if state.get('half_life') != half_life:
+        return f"half-life changed ({state.get('half_life')} -> {half_life})"
+    if state.get('tempo_fingerprint') != tempo_fp:
+        return "KenPom tempo table changed"
+    if not set(state['ingested']).issubset(set(keys)):
+        return "rows removed/edited in the game log"
+    return None
+
+
+def full_state(games: pd.DataFrame, half_life, tempo_fp: str) -> dict:
+    """State built from scratch over every efficiency row."""
+    state = accumulate(empty_state(half_life, tempo_fp), games)
+    state['ingested'] = game_keys(games).tolist()
+    return state
+
+
+def verify(games_df: pd.DataFrame, tempo_by_id: dict, state: dict, tol: float = 1e-9) -> bool:
+    """Incremental profiles vs a from-scratch rebuild (and vs the vectorized engine without decay)."""
+    current = profiles_from_state(state).set_index('Team')
+    games = add_game_efficiency(games_df, tempo_by_id)
+    checks = {'full rebuild': profiles_from_state(
+        full_state(games, state['half_life'], state['tempo_fingerprint'])).set_index('Team')}
+    if not state['half_life']:
+        checks['vectorized engine'] = build_profiles(games).set_index('Team')
+
+    ok = True
+    for label, ref in checks.items():
+        ref = ref.reindex(current.index)
+        numeric = [c for c in current.columns if c not in ('Record', 'TeamID')]
+        diff = (current[numeric] - ref[numeric]).abs() / ref[numeric].abs().clip(lower=1.0)
+        worst = float(np.nanmax(diff.values)) if len(diff) else 0.0
+        same_nan = (current[numeric].isna() == ref[numeric].isna()).all().all()
+        same_text = (current['Record'] == ref['Record']).all() and len(ref) == len(current)
+        passed = worst <= tol and same_nan and same_text
+        ok &= passed
+        logger.info(f"{'✅' if passed else '❌'} Verify vs {label}: max rel diff {worst:.2e}"
+                    f"{'' if same_text else ' (records/teams differ)'}")
+    return ok
+
+
+# ============================================================================
+# MAIN PROCESSING
+# ============================================================================
+def compute_efficiency(games_df: pd.DataFrame, tempo_data: dict, half_life=HALF_LIFE_DAYS,
+                       rebuild: bool = False, all_facts: bool = False, state_path: str = STATE_FILE) -> dict:
+    """
+    In-process entry point: game logs in, profiles and per-game facts out.
+    Reads the accumulator state; the caller saves the returned one once the
+    outputs are written. Returns {'profiles', 'facts', 'state', 'appended'};
+    on an incremental run 'facts' holds just the new games ('appended' True)
+    unless all_facts is set.
+    """
+    if half_life is not None and not half_life > 0:
+        raise ValueError(f"half_life must be a positive number of days (or None): {half_life!r}")
     
+    # Integer keys: scraped ESPN IDs, registry lookup for names without one
+    games_df, tempo_by_id = load_games(games_df, tempo_data)
+    tempo_fp = tempo_fingerprint(tempo_data)
+    keys = game_keys(games_df)
+    
+    state = None if rebuild else load_state(state_path)
+    reason = "--rebuild" if rebuild else rebuild_reason(state, half_life, tempo_fp, keys)
+    if reason:
+        logger.info(f"Full build over {len(games_df)} games ({reason})...")
+        games = add_game_efficiency(games_df, tempo_by_id)
+        state = full_state(games, half_life, tempo_fp)
+        appended = False
+    else:
+        new_games = games_df[~keys.isin(set(state['ingested']))]
+        logger.info(f"Incremental update: {len(new_games)} new games (state as of {state['as_of']})...")
+        games = add_game_efficiency(new_games, tempo_by_id)
+        state = accumulate(state, games)
+        state['ingested'] = state['ingested'] + keys[new_games.index].tolist()
+        appended = not all_facts
+        if all_facts:
+            games = add_game_efficiency(games_df, tempo_by_id)
+    
+    profiles_df = profiles_from_state(state).sort_values('RawRank').reset_index(drop=True)
+    return {'profiles': profiles_df, 'facts': to_facts(games), 'state': state, 'appended': appended}
+
+
+def process_efficiency(half_life=HALF_LIFE_DAYS, rebuild: bool = False, verify_state: bool = False):
+    logger.info("=" * 60)
+    logger.info("THE BIBLE - Step 2: Efficiency Processor")
+    logger.info("=" * 60)
+    
+    games_df = pd.read_csv(INPUT_GAME_LOGS)
+    tempo_data = load_kenpom_tempo(KENPOM_DATA_FILE)
+    
+    # A missing fact file needs every game, not just the new ones
+    result = compute_efficiency(games_df, tempo_data, half_life=half_life, rebuild=rebuild,
+                                all_facts=not os.path.exists(FACT_FILE))
+    profiles_df, facts, state = result['profiles'], result['facts'], result['state']
+    
+    profiles_df.to_csv(OUTPUT_FILE, index=False)
+    write_game_facts(facts, FACT_FILE, append=result['appended'])
+    save_state(state)
+    
+    if half_life:
+        logger.info(f"Recency weighting: half-life {half_life} days (as of {state['as_of']})")
     logger.info(f"✅ Success! Processed {len(profiles_df)} teams.")
-    logger.info(f"Saved to {OUTPUT_FILE}")
+    logger.info(f"Saved to {OUTPUT_FILE} (+ {len(facts)} per-game rows -> {FACT_FILE})")
+    
+    if verify_state:
+        games_df, tempo_by_id = load_games(games_df, tempo_data)
+        if not verify(games_df, tempo_by_id, state):
+            sys.exit(1)
+
+# ============================================================================
+# BENCHMARK
+# ============================================================================
+def benchmark(max_scale: int = 10):
+    """
+    Times the per-team loop vs the vectorized engine on the season's logs
+    replicated 1x..max_scale x (each copy gets its own team names, so teams
+    and games both grow), and checks the two produce the same profiles.
+    """
+    import time
+
+    base = pd.read_csv(INPUT_GAME_LOGS)
+    tempo_data = load_kenpom_tempo(KENPOM_DATA_FILE)
+    games, tempo_by_id = load_games(base, tempo_data)
+
+    logger.info(f"{'Scale':>5} | {'Games':>7} | {'Teams':>6} | {'Loop (s)':>9} | {'Vector (s)':>10} | {'Speedup':>7}")
+    for scale in sorted({1, 2, 5, max_scale}):
+        copies = []
+        for k in range(scale):
+            copy = games.copy()
+            if k:
+                copy['Team'] = copy['Team'] + f" #{k}"
+                copy['TeamKey'] = copy['TeamKey'] - k * 1_000_000
+            copies.append(copy)
+        scaled = pd.concat(copies, ignore_index=True)
+
+        t0 = time.perf_counter()
+        looped = build_profiles_loop(scaled, tempo_by_id)
+        t1 = time.perf_counter()
+        vectorized = build_profiles(add_game_efficiency(scaled, tempo_by_id))
+        t2 = time.perf_counter()
+
+        pd.testing.assert_frame_equal(looped, vectorized, check_exact=False, rtol=1e-12)
+        logger.info(f"{scale:>4}x | {len(scaled):>7} | {scaled['Team'].nunique():>6} | "
+                    f"{t1 - t0:>9.2f} | {t2 - t1:>10.3f} | {(t1 - t0) / (t2 - t1):>6.0f}x")
+
+def positive_float(text: str) -> float:
+    value = float(text)
+    if not value > 0:
+        raise argparse.ArgumentTypeError(f"must be a positive number: {text!r}")
+    return value
+
+def positive_int(text: str) -> int:
+    value = int(text)
+    if value <= 0:
+        raise argparse.ArgumentTypeError(f"must be a positive integer: {text!r}")
+    return value
 
 if __name__ == "__main__":
-    process_efficiency()
+    parser = argparse.ArgumentParser(description="THE BIBLE - Step 2: Efficiency Processor")
+    parser.add_argument('--half-life', type=positive_float, metavar='DAYS', default=HALF_LIFE_DAYS,
+                        help='Recency weighting: a game DAYS old counts half (default: unweighted)')
+    parser.add_argument('--rebuild', action='store_true',
+                        help='Ignore the saved accumulator state and rebuild from every game')
+    parser.add_argument('--verify', action='store_true',
+                        help='Check the incremental state against a full rebuild')
+    parser.add_argument('--benchmark', type=positive_int, nargs='?', const=10, metavar='SCALE',
+                        help='Time loop vs vectorized engine on 1x..SCALE x the games (default 10) and exit')
+    args = parser.parse_args()
+    
+    if args.benchmark:
+        benchmark(args.benchmark)
+    else:
+        process_efficiency(half_life=args.half_life, rebuild=args.rebuild, verify_state=args.verify)
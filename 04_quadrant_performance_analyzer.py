@@ -16,19 +16,31 @@ Key Fixes from V1:
 - "Paper Tiger Score" composite metric
 
 Dependencies:
-- master_game_logs_2026.csv (from Step 1)
+- team_game_efficiency_2026.csv (per-game OffEff/DefEff/NetEff from Step 2;
+  falls back to master_game_logs_2026.csv from Step 1)
 - team_adjusted_efficiency_profiles_2026.csv (from Step 3)
 - [Optional] kenpom_2026.csv for market-based quadrants
 
 Output: team_quadrant_analysis_2026.csv
+
+Cutoff sweep (--sweep): evaluates a few hundred quadrant cutoff sets
+(uniform and location-dependent, like 08 / phd / the simulator use) in one
+pass - games are sorted by opponent rank once per team/location, and every
+cutoff becomes a searchsorted into cumulative sums.
+Output: quadrant_cutoff_sweep_2026.csv (one row per cutoff set x quadrant)
 """
 
 import pandas as pd
 import numpy as np
-import re
 import logging
+import sys
+import time
 from typing import Dict, List, Optional, Tuple
 
+from game_facts import FACT_FILE, load_game_facts
+from team_names import team_key
+from team_registry import team_ids
+
 # ============================================================================
 # CONFIGURATION
 # ============================================================================
@@ -36,6 +48,7 @@ INPUT_GAME_LOGS = "master_game_logs_2026.csv"
 INPUT_ADJ_PROFILES = "team_adjusted_efficiency_profiles_2026.csv"
 KENPOM_FILE = "kenpom_2026.csv"  # Optional - for market-based quadrants
 OUTPUT_FILE = "team_quadrant_analysis_2026.csv"
+SWEEP_FILE = "quadrant_cutoff_sweep_2026.csv"
 
 # Quadrant definitions (by rank)
 # Q1 = Top 50, Q2 = 51-100, Q3 = 101-200, Q4 = 201+
@@ -55,6 +68,15 @@ QUAD_EFF_CUTOFFS = {
     'Q4': -999    # Net Eff < -5 = below average
 }
 
+# Location-dependent cutoffs used by 08 / phd_location_enhancement_API
+# (upper rank bound of Q1, Q2, Q3 by the team's location)
+LOCATION_CUTOFFS = {
+    'Home': (30, 75, 160),
+    'Neutral': (50, 100, 200),
+    'Away': (75, 135, 240),
+}
+SWEEP_LOCATIONS = ['Home', 'Neutral', 'Away']
+
 # Minimum games for "reliable" split
 MIN_GAMES_RELIABLE = 3
 MIN_GAMES_USABLE = 1
@@ -68,43 +90,10 @@ logger = logging.getLogger(__name__)
 
 
 # ============================================================================
-# NAME NORMALIZATION (consistent with Step 3)
+# NAME NORMALIZATION (shared resolver: team_names.py)
 # ============================================================================
-MASCOTS = [
-    'crimson tide', 'razorbacks', 'tigers', 'gators', 'bulldogs', 'wildcats',
-    'rebels', 'commodores', 'gamecocks', 'volunteers', 'aggies', 'longhorns',
-    'buckeyes', 'wolverines', 'spartans', 'nittany lions', 'hawkeyes',
-    'golden gophers', 'badgers', 'boilermakers', 'hoosiers', 'fighting illini',
-    'cornhuskers', 'scarlet knights', 'terrapins', 'bruins', 'trojans',
-    'ducks', 'huskies', 'cougars', 'jayhawks', 'red raiders', 'horned frogs',
-    'bears', 'cyclones', 'sooners', 'cowboys', 'mountaineers', 'bearcats',
-    'knights', 'sun devils', 'buffaloes', 'utes', 'cardinals', 'blue devils',
-    'tar heels', 'wolfpack', 'demon deacons', 'cavaliers', 'hokies',
-    'yellow jackets', 'seminoles', 'hurricanes', 'orange', 'panthers',
-    'fighting irish', 'eagles', 'blue jays', 'hoyas', 'red storm', 'pirates',
-    'friars', 'musketeers', 'golden eagles', 'tritons', 'billikens', 'gaels',
-    'toreros', 'dons', 'waves', 'broncos', 'aztecs', 'running rebels',
-    'falcons', 'owls', 'mean green', 'miners', 'roadrunners'
-]
-
 def normalize_team_name(name: str) -> str:
-    if not isinstance(name, str):
-        return ""
-    
-    # 1. Lowercase and strip
-    name = name.lower().strip()
-    
-    # 2. NEW FIX: Strip leading digits (removes "12" from "12Gonzaga")
-    name = re.sub(r'^\d+', '', name)
-    
-    # 3. Apply your existing mascot/alias logic
-    for mascot in MASCOTS:
-        pattern = r'\s+' + re.escape(mascot) + r'\s*$'
-        name = re.sub(pattern, '', name)
-        
-    # 4. Standardize and remove special characters
-    name = name.replace('st.', 'st').replace('&', 'and').replace("'", '').replace('-', '')
-    return re.sub(r'[^a-z0-9]', '', name).strip()
+    return team_key(name)
 
 
 # ============================================================================
@@ -130,6 +119,18 @@ def assign_quadrant_by_efficiency(net_eff: float) -> str:
         return 'Q4'
 
 
+def assign_quadrants_by_rank(ranks: pd.Series) -> pd.Series:
+    """Vectorized assign_quadrant_by_rank (same inclusive ranges, Q4 otherwise)."""
+    conditions = [(ranks >= low) & (ranks <= high) for low, high in QUAD_RANK_CUTOFFS.values()]
+    return pd.Series(np.select(conditions, list(QUAD_RANK_CUTOFFS), default='Q4'), index=ranks.index)
+
+
+def confidence_levels(n_games: pd.Series) -> pd.Series:
+    """Vectorized get_confidence_level."""
+    return pd.Series(np.select([n_games >= 5, n_games >= MIN_GAMES_RELIABLE, n_games >= MIN_GAMES_USABLE],
+                               ['HIGH', 'MEDIUM', 'LOW'], default='NONE'), index=n_games.index)
+
+
 def get_confidence_level(n_games: int) -> str:
     """Returns confidence level based on sample size."""
     if n_games >= 5:
@@ -236,67 +237,90 @@ def calculate_paper_tiger_score(team_stats: Dict) -> float:
 
 
 # ============================================================================
-# MAIN ANALYSIS
+# QUADRANT ENGINE (vectorized)
 # ============================================================================
-def run_quadrant_analysis(use_kenpom: bool = False):
-    """Main analysis function."""
-    logger.info("=" * 60)
-    logger.info("THE BIBLE - Step 4: Quadrant Performance Analyzer")
-    logger.info("=" * 60)
-    
-    # Load data
-    try:
-        logs_df = pd.read_csv(INPUT_GAME_LOGS)
-        profiles_df = pd.read_csv(INPUT_ADJ_PROFILES)
-        logger.info(f"Loaded {len(logs_df)} games, {len(profiles_df)} team profiles")
-    except FileNotFoundError as e:
-        logger.error(f"Required file not found: {e}")
-        return
-    
-    # Try to load KenPom if requested
-    kenpom_df = None
-    if use_kenpom:
-        try:
-            kenpom_df = pd.read_csv(KENPOM_FILE)
-            logger.info(f"Using KenPom rankings for quadrant assignment")
-        except FileNotFoundError:
-            logger.warning(f"KenPom file not found, using internal rankings")
-            use_kenpom = False
-    
-    # Create ranking/quadrant mapping
-    if use_kenpom and kenpom_df is not None:
-        # Use KenPom rankings
-        kenpom_df['NormKey'] = kenpom_df['Team'].apply(normalize_team_name)
-        rank_map = dict(zip(kenpom_df['NormKey'], kenpom_df['Rank']))
-        quad_source = "KenPom"
+QUADS = ['Q1', 'Q2', 'Q3', 'Q4']
+COMBINED = {'Q12': ['Q1', 'Q2'], 'Q34': ['Q3', 'Q4']}
+
+
+def build_quadrant_table(logs_df: pd.DataFrame, profiles_df: pd.DataFrame, rank_map: dict) -> pd.DataFrame:
+    """
+    One row per profiled team with games: totals, per-quadrant splits,
+    Q1+Q2 / Q3+Q4 combos, Paper Tiger and Consistency scores. All from a
+    single groupby over (team, opponent quadrant); rows come out in the
+    profile file's team order, as the per-team loop produced them.
+    """
+    first = profiles_df.drop_duplicates('Team', keep='first').reset_index(drop=True)
+    key_of = profiles_df.drop_duplicates('Team', keep='last').set_index('Team')['NormKey']
+    teams = pd.DataFrame({'Team': first['Team'], 'TeamKey': first['Team'].map(key_of).to_numpy()})
+    teams['pos'] = np.arange(len(teams))
+
+    games = teams.merge(logs_df[['TeamKey', 'OppQuad', 'Result', 'Margin', 'NetEff']], on='TeamKey')
+    games['Win'] = games['Result'] == 'W'
+
+    split = games.groupby(['pos', 'OppQuad']).agg(
+        Games=('Win', 'size'), Wins=('Win', 'sum'), AvgMargin=('Margin', 'mean'),
+        NetEff=('NetEff', 'mean'), NetSum=('NetEff', 'sum'),
+    ).unstack('OppQuad')
+    split = split.reindex(columns=pd.MultiIndex.from_product([split.columns.levels[0], QUADS]))
+    played = split.index
+    count = split['Games'].fillna(0).astype(int)
+    wins = split['Wins'].fillna(0).astype(int)
+
+    if 'AdjRank' in first.columns:
+        adj_rank = first['AdjRank']
     else:
-        # Use our adjusted rankings
-        profiles_df['NormKey'] = profiles_df['Team'].apply(normalize_team_name)
-        profiles_df['Rank'] = profiles_df['AdjNetEff'].rank(ascending=False, method='min')
-        rank_map = dict(zip(profiles_df['NormKey'], profiles_df['Rank']))
-        eff_map = dict(zip(profiles_df['NormKey'], profiles_df['AdjNetEff']))
-        quad_source = "Internal Adjusted"
-    
-    logger.info(f"Quadrant source: {quad_source}")
-    
-    # Normalize game log names
-    logs_df['TeamKey'] = logs_df['Team'].apply(normalize_team_name)
-    logs_df['OppKey'] = logs_df['Opponent'].apply(normalize_team_name)
-    
-    # Assign opponent quadrant
-    logs_df['OppRank'] = logs_df['OppKey'].map(rank_map).fillna(362)
-    logs_df['OppQuad'] = logs_df['OppRank'].apply(assign_quadrant_by_rank)
-    
-    # Calculate per-game efficiency (if not already present)
-    if 'NetEff' not in logs_df.columns:
-        # Rough estimate based on margin
-        logs_df['NetEff'] = logs_df['Margin'] * 1.5
-    
-    # Analyze each team
+        adj_rank = teams['TeamKey'].map(rank_map).fillna(999)
+    adj_net = first['AdjNetEff'] if 'AdjNetEff' in first.columns else pd.Series(0, index=first.index)
+
+    result = pd.DataFrame({
+        'Team': teams['Team'].reindex(played).to_numpy(),
+        'AdjRank': adj_rank.reindex(played).to_numpy(),
+        'AdjNetEff': adj_net.reindex(played).to_numpy(),
+        'TotalGames': count.sum(axis=1).to_numpy(),
+        'TotalWins': wins.sum(axis=1).to_numpy(),
+    }, index=played)
+
+    for quad in QUADS:
+        n, w = count[quad], wins[quad]
+        result[f'{quad}_Record'] = w.astype(str) + '-' + (n - w).astype(str)
+        result[f'{quad}_Games'] = n
+        result[f'{quad}_WinPct'] = (w / n).where(n > 0)
+        result[f'{quad}_AvgMargin'] = split[('AvgMargin', quad)]
+        result[f'{quad}_NetEff'] = split[('NetEff', quad)]
+        result[f'{quad}_Confidence'] = confidence_levels(n)
+
+    # Paper Tiger: games-weighted NetEff vs Q3/Q4 minus vs Q1/Q2 (needs both)
+    weighted = (split['NetEff'] * count).where(count > 0, 0.0)
+    strong_n = count['Q1'] + count['Q2']
+    weak_n = count['Q3'] + count['Q4']
+    strong = (weighted['Q1'] + weighted['Q2']) / strong_n
+    weak = (weighted['Q3'] + weighted['Q4']) / weak_n
+    result['PaperTigerScore'] = (weak - strong).where((strong_n > 0) & (weak_n > 0))
+
+    for label, quads in COMBINED.items():
+        n = count[quads].sum(axis=1)
+        w = wins[quads].sum(axis=1)
+        result[f'{label}_Record'] = w.astype(str) + '-' + (n - w).astype(str)
+        result[f'{label}_Games'] = n
+        result[f'{label}_WinPct'] = (w / n).where(n > 0)
+        result[f'{label}_NetEff'] = (split['NetSum'][quads].sum(axis=1, min_count=1) / n).where(n > 0)
+
+    # Consistency: population std of quadrant NetEffs over quadrants with games (needs 2+)
+    quad_net = split['NetEff'].where(count >= MIN_GAMES_USABLE)
+    usable = quad_net.notna().sum(axis=1)
+    result['ConsistencyScore'] = quad_net.std(axis=1, ddof=0).where(usable >= 2)
+
+    return result.reset_index(drop=True)
+
+
+def build_quadrant_table_loop(logs_df: pd.DataFrame, profiles_df: pd.DataFrame, rank_map: dict) -> pd.DataFrame:
+    """Original per-team / per-quadrant loop (reference for --verify)."""
     all_results = []
     
+    team_keys = dict(zip(profiles_df['Team'], profiles_df['NormKey']))
     for team in profiles_df['Team'].unique():
-        team_key = normalize_team_name(team)
+        team_key = team_keys[team]
         team_games = logs_df[logs_df['TeamKey'] == team_key].copy()
         
         if team_games.empty:
@@ -315,7 +339,7 @@ def run_quadrant_analysis(use_kenpom: bool = False):
         
         # Analyze by quadrant
         quad_stats = {}
-        for quad in ['Q1', 'Q2', 'Q3', 'Q4']:
+        for quad in QUADS:
             quad_games = team_games[team_games['OppQuad'] == quad]
             stats = calculate_quadrant_stats(quad_games)
             quad_stats[quad] = stats
@@ -329,24 +353,15 @@ def run_quadrant_analysis(use_kenpom: bool = False):
             result[f'{quad}_Confidence'] = stats['Confidence']
         
         # Calculate Paper Tiger Score
-        pts = calculate_paper_tiger_score(quad_stats)
-        result['PaperTigerScore'] = pts
-        
-        # Calculate Q1+Q2 combined (strong opponents)
-        q12_games = team_games[team_games['OppQuad'].isin(['Q1', 'Q2'])]
-        q12_stats = calculate_quadrant_stats(q12_games)
-        result['Q12_Record'] = f"{q12_stats['Wins']}-{q12_stats['Losses']}"
-        result['Q12_Games'] = q12_stats['Games']
-        result['Q12_WinPct'] = q12_stats['WinPct']
-        result['Q12_NetEff'] = q12_stats['AvgNetEff']
+        result['PaperTigerScore'] = calculate_paper_tiger_score(quad_stats)
         
-        # Calculate Q3+Q4 combined (weak opponents)
-        q34_games = team_games[team_games['OppQuad'].isin(['Q3', 'Q4'])]
-        q34_stats = calculate_quadrant_stats(q34_games)
-        result['Q34_Record'] = f"{q34_stats['Wins']}-{q34_stats['Losses']}"
-        result['Q34_Games'] = q34_stats['Games']
-        result['Q34_WinPct'] = q34_stats['WinPct']
-        result['Q34_NetEff'] = q34_stats['AvgNetEff']
+        # Q1+Q2 combined (strong opponents) / Q3+Q4 combined (weak opponents)
+        for label, quads in COMBINED.items():
+            combo_stats = calculate_quadrant_stats(team_games[team_games['OppQuad'].isin(quads)])
+            result[f'{label}_Record'] = f"{combo_stats['Wins']}-{combo_stats['Losses']}"
+            result[f'{label}_Games'] = combo_stats['Games']
+            result[f'{label}_WinPct'] = combo_stats['WinPct']
+            result[f'{label}_NetEff'] = combo_stats['AvgNetEff']
         
         # Consistency score (low variance across quadrants = consistent)
         quad_effs = [s['AvgNetEff'] for s in quad_stats.values() 
@@ -358,15 +373,279 @@ def run_quadrant_analysis(use_kenpom: bool = False):
         
         all_results.append(result)
     
-    # Convert to DataFrame
-    results_df = pd.DataFrame(all_results)
-    
-    # Sort by adjusted rank
+    return pd.DataFrame(all_results)
+
+
+def finalize_results(results_df: pd.DataFrame) -> pd.DataFrame:
+    """Sort by adjusted rank and round numeric columns (the saved file's format)."""
     results_df = results_df.sort_values('AdjRank').reset_index(drop=True)
-    
-    # Round numeric columns
     numeric_cols = results_df.select_dtypes(include=[np.number]).columns
     results_df[numeric_cols] = results_df[numeric_cols].round(3)
+    return results_df
+
+
+# ============================================================================
+# CUTOFF SWEEP
+# ============================================================================
+def sweep_grid() -> pd.DataFrame:
+    """
+    Candidate cutoff sets, one row each: Family plus the Q1/Q2/Q3 upper
+    bounds for every location.
+    - current:   QUAD_RANK_CUTOFFS for every location
+    - location:  LOCATION_CUTOFFS scaled x0.50 .. x1.50
+    - uniform:   grid of b1 < b2 < b3, with home cutoffs tightened and
+                 away cutoffs loosened by a skew of 0 / 20 / 40%
+    """
+    rows = []
+
+    def add(family, cuts):
+        row = {'Family': family}
+        for loc in SWEEP_LOCATIONS:
+            for q, bound in zip(('Q1', 'Q2', 'Q3'), cuts[loc]):
+                row[f'{loc}_{q}'] = float(bound)
+        rows.append(row)
+
+    current = tuple(QUAD_RANK_CUTOFFS[q][1] for q in ('Q1', 'Q2', 'Q3'))
+    add('current', {loc: current for loc in SWEEP_LOCATIONS})
+    for scale in np.round(np.arange(0.50, 1.501, 0.05), 2):
+        add('location', {loc: tuple(round(b * scale) for b in LOCATION_CUTOFFS[loc]) for loc in SWEEP_LOCATIONS})
+    for skew in (0.0, 0.2, 0.4):
+        for b1 in (25, 30, 40, 50, 60, 75):
+            for b2 in (75, 100, 125, 150):
+                for b3 in (150, 175, 200, 225, 250):
+                    if not b1 < b2 < b3:
+                        continue
+                    base = np.array([b1, b2, b3], dtype=float)
+                    add('uniform', {'Home': np.round(base * (1 - skew)), 'Neutral': base,
+                                    'Away': np.round(base * (1 + skew))})
+    grid = pd.DataFrame(rows)
+    grid.insert(0, 'ConfigID', np.arange(len(grid)))
+    return grid
+
+
+def sweep_cutoffs(logs_df: pd.DataFrame, team_keys, grid: pd.DataFrame) -> dict:
+    """
+    Per-config, per-team, per-quadrant aggregates for every row of `grid`.
+
+    Games are sorted once by (team, location, OppRank); a cutoff b for a
+    team/location group is then searchsorted(keys, group * SPAN + b) into
+    that order, and each quadrant's totals are differences of cumulative
+    sums. Returns arrays shaped (configs, teams, 4) for Games / Wins /
+    Margin (sum) / NetEff (sum) / NetEffSq (sum of squares).
+    """
+    team_pos = pd.Series(np.arange(len(team_keys)), index=pd.Index(team_keys))
+    team_pos = team_pos[~team_pos.index.duplicated(keep='last')]
+    games = logs_df.assign(t=logs_df['TeamKey'].map(team_pos),
+                           l=logs_df['Location'].map({loc: i for i, loc in enumerate(SWEEP_LOCATIONS)}))
+    games = games.dropna(subset=['t', 'l'])
+
+    n_teams, n_locs = len(team_keys), len(SWEEP_LOCATIONS)
+    group = games['t'].to_numpy(int) * n_locs + games['l'].to_numpy(int)
+    rank = games['OppRank'].to_numpy(float)
+    span = float(max(rank.max(initial=0), grid.iloc[:, 2:].to_numpy().max()) + 1)
+
+    order = np.lexsort((rank, group))
+    keys = group[order] * span + rank[order]
+    cumulative = {}
+    for name, values in [('Games', np.ones(len(order))),
+                         ('Wins', (games['Result'].to_numpy() == 'W').astype(float)),
+                         ('Margin', games['Margin'].to_numpy(float)),
+                         ('NetEff', games['NetEff'].to_numpy(float)),
+                         ('NetEffSq', games['NetEff'].to_numpy(float) ** 2)]:
+        cumulative[name] = np.concatenate([[0.0], np.cumsum(values[order])])
+
+    # Boundaries per (config, location, team): group start, <=b1, <=b2, <=b3, group end
+    groups = (np.arange(n_teams)[None, :] * n_locs + np.arange(n_locs)[:, None]).astype(float)   # (L, T)
+    cuts = np.stack([grid[[f'{loc}_{q}' for q in ('Q1', 'Q2', 'Q3')]].to_numpy() for loc in SWEEP_LOCATIONS],
+                    axis=1)                                                                     # (C, L, 3)
+    start = np.searchsorted(keys, groups * span, side='left')
+    end = np.searchsorted(keys, (groups + 1) * span, side='left')
+    inner = np.searchsorted(keys, (groups[None, :, None, :] * span + cuts[..., None]).ravel(), side='right')
+    inner = inner.reshape(len(grid), n_locs, 3, n_teams)
+    bounds = np.concatenate([np.broadcast_to(start[None, :, None, :], (len(grid), n_locs, 1, n_teams)), inner,
+                             np.broadcast_to(end[None, :, None, :], (len(grid), n_locs, 1, n_teams))], axis=2)   # (C, L, 5, T)
+
+    result = {}
+    for name, csum in cumulative.items():
+        at = csum[bounds]
+        per_quad = (at[:, :, 1:, :] - at[:, :, :-1, :]).sum(axis=1)                              # (C, 4, T)
+        result[name] = per_quad.transpose(0, 2, 1)                                               # (C, T, 4)
+    return result
+
+
+def summarize_sweep(grid: pd.DataFrame, sweep: dict) -> pd.DataFrame:
+    """
+    Tidy table: one row per (cutoff set, quadrant) plus set-level Paper Tiger spread.
+
+    PaperTigerStd alone favours sets with tiny quadrant bins (a mean of two
+    games is mostly noise). PaperTigerNoise is the spread pure sampling error
+    would produce: the pooled within-(team, quadrant) game variance times
+    1/n_strong + 1/n_weak, averaged over teams. PaperTigerSNR = Std / Noise
+    (~1 means the spread is noise).
+    """
+    games, wins, margin, net = sweep['Games'], sweep['Wins'], sweep['Margin'], sweep['NetEff']
+
+    strong_n, weak_n = games[..., :2].sum(axis=2), games[..., 2:].sum(axis=2)
+    both = (strong_n > 0) & (weak_n > 0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        paper_tiger = net[..., 2:].sum(axis=2) / weak_n - net[..., :2].sum(axis=2) / strong_n
+        within_ss = np.where(games > 0, sweep['NetEffSq'] - net ** 2 / games, 0.0).sum(axis=(1, 2))
+        dof = games.sum(axis=(1, 2)) - (games > 0).sum(axis=(1, 2))
+        game_var = within_ss / dof                                                               # (C,)
+        noise_var = np.where(both, game_var[:, None] * (1 / strong_n + 1 / weak_n), np.nan)
+    paper_tiger = np.where(both, paper_tiger, np.nan)
+    scored = np.isfinite(paper_tiger).sum(axis=1)
+
+    league = {name: arr.sum(axis=1) for name, arr in sweep.items()}                           # (C, 4)
+    total = league['Games'].sum(axis=1, keepdims=True)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        columns = {
+            'Games': league['Games'].astype(int),
+            'GameShare': league['Games'] / total,
+            'WinPct': league['Wins'] / league['Games'],
+            'AvgMargin': league['Margin'] / league['Games'],
+            'AvgNetEff': league['NetEff'] / league['Games'],
+            'TeamsWithGames': (games > 0).sum(axis=1),
+        }
+    tidy = pd.DataFrame({name: values.ravel() for name, values in columns.items()})
+    tidy.insert(0, 'Quad', np.tile(QUADS, len(grid)))
+    tidy.insert(0, 'ConfigID', np.repeat(grid['ConfigID'].to_numpy(), len(QUADS)))
+
+    per_config = grid.assign(
+        TeamsScored=scored,
+        PaperTigerMean=pd.DataFrame(paper_tiger).mean(axis=1).to_numpy(),
+        PaperTigerStd=pd.DataFrame(paper_tiger).std(axis=1, ddof=0).to_numpy(),
+        PaperTigerNoise=np.sqrt(pd.DataFrame(noise_var).mean(axis=1).to_numpy()),
+    )
+    per_config['PaperTigerSNR'] = per_config['PaperTigerStd'] / per_config['PaperTigerNoise']
+    return per_config.merge(tidy, on='ConfigID')
+
+
+def run_cutoff_sweep(logs_df: pd.DataFrame, profiles_df: pd.DataFrame):
+    """--sweep: every candidate cutoff set in one pass -> SWEEP_FILE."""
+    grid = sweep_grid()
+    start = time.perf_counter()
+    sweep = sweep_cutoffs(logs_df, profiles_df['NormKey'].to_numpy(), grid)
+    table = summarize_sweep(grid, sweep)
+    elapsed = time.perf_counter() - start
+    table.round(4).to_csv(SWEEP_FILE, index=False)
+
+    logger.info(f"🔁 Cutoff sweep: {len(grid)} cutoff sets x {len(profiles_df)} teams "
+                f"({int(sweep['Games'][0].sum())} team-games) in {elapsed:.2f} s")
+    logger.info(f"Saved to {SWEEP_FILE}")
+
+    # Sanity check: the 'current' set must reproduce the analyzer's OppQuad counts
+    known = logs_df['TeamKey'].isin(set(profiles_df['NormKey'])) & logs_df['Location'].isin(SWEEP_LOCATIONS)
+    expected = logs_df.loc[known, 'OppQuad'].value_counts().reindex(QUADS, fill_value=0).to_numpy()
+    got = sweep['Games'][0].sum(axis=0).astype(int)
+    status = "✅" if (expected == got).all() else "❌"
+    logger.info(f"{status} 'current' cutoffs reproduce the analyzer's quadrant counts: {dict(zip(QUADS, got))}")
+
+    best = table.drop_duplicates('ConfigID').nlargest(5, 'PaperTigerSNR')
+    logger.info("Most discriminating cutoff sets (Paper Tiger spread over its sampling noise):")
+    for _, row in best.iterrows():
+        cuts = ' | '.join(f"{loc} {row[f'{loc}_Q1']:.0f}/{row[f'{loc}_Q2']:.0f}/{row[f'{loc}_Q3']:.0f}"
+                          for loc in SWEEP_LOCATIONS)
+        logger.info(f"  #{row['ConfigID']} ({row['Family']}): {cuts}  -> SNR {row['PaperTigerSNR']:.2f} "
+                    f"(std {row['PaperTigerStd']:.2f} vs noise {row['PaperTigerNoise']:.2f}), "
+                    f"{row['TeamsScored']} teams scored")
+
+
+# ============================================================================
+# MAIN ANALYSIS
+# ============================================================================
+def prepare_quadrant_inputs(logs_df: pd.DataFrame, profiles_df: pd.DataFrame, kenpom_df: pd.DataFrame = None):
+    """
+    Keys, opponent ranks/quadrants and per-game NetEff on copies of the inputs.
+    Returns (logs_df, profiles_df, rank_map, quad_source).
+    """
+    logs_df, profiles_df = logs_df.copy(), profiles_df.copy()
+    
+    # Integer team keys (ESPN TeamID; registry lookup for names without one)
+    profiles_df['NormKey'] = team_ids(profiles_df, 'Team', 'TeamID')
+    
+    # Create ranking/quadrant mapping
+    if kenpom_df is not None:
+        # Use KenPom rankings
+        rank_map = dict(zip(team_ids(kenpom_df, 'Team'), kenpom_df['Rank']))
+        quad_source = "KenPom"
+    else:
+        # Use our adjusted rankings
+        profiles_df['Rank'] = profiles_df['AdjNetEff'].rank(ascending=False, method='min')
+        rank_map = dict(zip(profiles_df['NormKey'], profiles_df['Rank']))
+        eff_map = dict(zip(profiles_df['NormKey'], profiles_df['AdjNetEff']))
+        quad_source = "Internal Adjusted"
+    
+    # Integer keys (already on the fact table; raw logs need them)
+    if 'TeamKey' not in logs_df.columns:
+        logs_df['TeamKey'] = team_ids(logs_df, 'Team', 'TeamID')
+        logs_df['OppKey'] = team_ids(logs_df, 'Opponent', 'OpponentID')
+    
+    # Assign opponent quadrant (once, vectorized)
+    logs_df['OppRank'] = logs_df['OppKey'].map(rank_map).fillna(362)
+    logs_df['OppQuad'] = assign_quadrants_by_rank(logs_df['OppRank'])
+    
+    # Per-game efficiency comes from the fact table; raw logs only have margins
+    if 'NetEff' not in logs_df.columns:
+        # Rough estimate based on margin
+        logs_df['NetEff'] = logs_df['Margin'] * 1.5
+    
+    return logs_df, profiles_df, rank_map, quad_source
+
+
+def analyze_quadrants(logs_df: pd.DataFrame, profiles_df: pd.DataFrame, kenpom_df: pd.DataFrame = None) -> pd.DataFrame:
+    """In-process entry point: facts (or raw logs) + adjusted profiles in, the quadrant table out."""
+    logs_df, profiles_df, rank_map, _ = prepare_quadrant_inputs(logs_df, profiles_df, kenpom_df)
+    return finalize_results(build_quadrant_table(logs_df, profiles_df, rank_map))
+
+
+def run_quadrant_analysis(use_kenpom: bool = False, verify: bool = False, sweep: bool = False):
+    """Main analysis function."""
+    logger.info("=" * 60)
+    logger.info("THE BIBLE - Step 4: Quadrant Performance Analyzer")
+    logger.info("=" * 60)
+    
+    # Load data
+    try:
+        logs_df = load_game_facts()
+        if logs_df is None:
+            logger.warning(f"{FACT_FILE} not found (run Step 2) - using raw game logs")
+            logs_df = pd.read_csv(INPUT_GAME_LOGS)
+        profiles_df = pd.read_csv(INPUT_ADJ_PROFILES)
+        logger.info(f"Loaded {len(logs_df)} games, {len(profiles_df)} team profiles")
+    except FileNotFoundError as e:
+        logger.error(f"Required file not found: {e}")
+        return
+    
+    # Try to load KenPom if requested
+    kenpom_df = None
+    if use_kenpom:
+        try:
+            kenpom_df = pd.read_csv(KENPOM_FILE)
+            logger.info(f"Using KenPom rankings for quadrant assignment")
+        except FileNotFoundError:
+            logger.warning(f"KenPom file not found, using internal rankings")
+            use_kenpom = False
+    
+    logs_df, profiles_df, rank_map, quad_source = prepare_quadrant_inputs(logs_df, profiles_df, kenpom_df)
+    logger.info(f"Quadrant source: {quad_source}")
+    
+    if sweep:
+        run_cutoff_sweep(logs_df, profiles_df)
+        return
+    
+    # Analyze every team / quadrant in one pass
+    results_df = finalize_results(build_quadrant_table(logs_df, profiles_df, rank_map))
+    
+    verified = True
+    if verify:
+        reference = finalize_results(build_quadrant_table_loop(logs_df, profiles_df, rank_map))
+        try:
+            pd.testing.assert_frame_equal(results_df, reference, check_dtype=False)
+            logger.info(f"✅ Verify: vectorized engine matches the per-team loop ({len(reference)} teams)")
+        except AssertionError as e:
+            logger.error(f"❌ Verify: vectorized engine differs from the per-team loop:\n{e}")
+            verified = False
     
     # Save
     results_df.to_csv(OUTPUT_FILE, index=False)
@@ -433,8 +712,11 @@ def run_quadrant_analysis(use_kenpom: bool = False):
         logger.info(
             f"  {row['Team']}: Variance = {row['ConsistencyScore']:.1f}"
         )
+    
+    if not verified:
+        sys.exit(1)
 
 
 if __name__ == "__main__":
     # Set to True if you have KenPom data, False to use internal rankings
-    run_quadrant_analysis(use_kenpom=False)
+    run_quadrant_analysis(use_kenpom=False, verify='--verify' in sys.argv, sweep='--sweep' in sys.argv)
@@ -3,127 +3,708 @@ run_pipeline.py
 ===============
 THE BIBLE - Master Pipeline Runner
 
-Executes the full data pipeline in sequence:
-1. Scrape game logs from ESPN
-2. Calculate raw efficiency profiles
-3. Apply SOS adjustments
-4. Analyze quadrant performance
+Runs the data pipeline as a DAG of steps with declared inputs/outputs:
+
+    game logs:  01 scraper -> 02 efficiency -> 03 SOS -> 04 quadrants
+    box scores: 06 box scores -> 1_Data_Miner (shots) -> 08 context matrix
+                                                       -> 09 HCA decomposer
+                                                       -> PhD home/road (KenPom)
+
+- Steps that touch the network (ESPN / KenPom) always run.
+- Every other step is fingerprinted by the content hashes of its inputs,
+  its script and the local modules it imports; if nothing changed since its
+  last successful run (and its outputs are untouched) it is skipped.
+- Independent branches run concurrently (--jobs); each line of output is
+  prefixed with the step id.
+- Fingerprints live in .pipeline_state.json.
+- --in-process runs 01-04, 08 and 09 inside this interpreter through their
+  DataFrame entry points: outputs are handed to the next step in memory and
+  the CSVs are written by a background writer (network steps under
+  --record/--replay, and the other scrapers, still run as subprocesses).
+- --telemetry records wall/CPU time, peak RSS, rows, HTTP traffic and cache
+  hit rates per step to pipeline_telemetry.jsonl and checks the run against
+  the trailing median (see pipeline_telemetry.py).
 
 Usage:
     python run_pipeline.py              # Run full pipeline
-    python run_pipeline.py --skip-scrape # Skip scraping (use existing data)
-    python run_pipeline.py --step 3     # Run only step 3+
+    python run_pipeline.py --plan       # Dry run: show the DAG and what would run
+    python run_pipeline.py --skip-scrape # Skip network steps (use existing data)
+    python run_pipeline.py --step 3     # Resume the game-log chain at step 3 (box-score branch skipped)
+    python run_pipeline.py --only sos,quadrants
+    python run_pipeline.py --force      # Ignore fingerprints
+    python run_pipeline.py --jobs 1     # One step at a time
+    python run_pipeline.py --in-process # Hand DataFrames between steps in memory
+    python run_pipeline.py --telemetry  # Per-step timing/memory/HTTP records (+ --tracemalloc)
+    python run_pipeline.py --record     # Save every HTTP response to the archive
+    python run_pipeline.py --replay     # Serve every HTTP response from the archive (offline)
 """
 
+import argparse
+import ast
+import hashlib
+import importlib.util
+import json
+import os
 import subprocess
 import sys
-import os
-import argparse
+import tempfile
+import threading
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime
 
-# Pipeline steps
+import pipeline_telemetry
+import response_archive
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+STATE_FILE = os.path.join(BASE_DIR, ".pipeline_state.json")
+DEFAULT_JOBS = 3
+
+# Rewritten by 01 / 06 on every run; the TeamKey / OppKey joins resolve through it
+REGISTRY = "team_registry_2026.csv"
+
+# Pipeline steps (declarative). 'order' keeps the legacy --step numbering.
 STEPS = [
-    ("01_master_game_log_scraper.py", "Game Log Scraper"),
-    ("02_efficiency_processor.py", "Efficiency Processor"),
-    ("03_sos_adjustment_processor.py", "SOS Adjustment"),
-    ("04_quadrant_performance_analyzer.py", "Quadrant Analysis"),
+    {'id': 'game_logs', 'script': "01_master_game_log_scraper.py", 'name': "Game Log Scraper",
+     'inputs': [], 'outputs': ["master_game_logs_2026.csv"], 'network': True, 'order': 1},
+    {'id': 'efficiency', 'script': "02_efficiency_processor.py", 'name': "Efficiency Processor",
+     'inputs': ["master_game_logs_2026.csv", "kenpom_2026.csv", REGISTRY],
+     'outputs': ["team_raw_efficiency_profiles_2026.csv", "team_game_efficiency_2026.csv"], 'order': 2},
+    {'id': 'sos', 'script': "03_sos_adjustment_processor.py", 'name': "SOS Adjustment",
+     'inputs': ["team_raw_efficiency_profiles_2026.csv", "team_game_efficiency_2026.csv", REGISTRY],
+     'outputs': ["team_adjusted_efficiency_profiles_2026.csv"], 'order': 3},
+    {'id': 'quadrants', 'script': "04_quadrant_performance_analyzer.py", 'name': "Quadrant Analysis",
+     'inputs': ["team_adjusted_efficiency_profiles_2026.csv", "team_game_efficiency_2026.csv", "kenpom_2026.csv",
+                REGISTRY],
+     'outputs': ["team_quadrant_analysis_2026.csv"], 'order': 4},
+
+    {'id': 'box_scores', 'script': "06_box_score_scraper_fixed.py", 'name': "Box Score Scraper",
+     'inputs': [], 'outputs': ["master_box_scores_2026.csv"], 'network': True},
+    # Also appends to the box-score file, so it runs after 06 rather than beside it
+    {'id': 'shot_miner', 'script': "1_Data_Miner.py", 'name': "Shot Quality Miner",
+     'inputs': [], 'after': ['box_scores'],
+     'outputs': ["cbb_style_2025_complete.csv"], 'network': True},
+    {'id': 'context_matrix', 'script': "08_context_matrix_generator.py", 'name': "Context Matrix",
+     'inputs': ["master_box_scores_2026.csv", REGISTRY], 'after': ['shot_miner'],
+     'outputs': ["team_home_performance_by_quadrant_2026.csv", "team_road_performance_by_quadrant_2026.csv"]},
+    {'id': 'hca', 'script': "09_hca_decomposer.py", 'name': "HCA Decomposer",
+     'inputs': ["master_box_scores_2026.csv"], 'after': ['shot_miner'],
+     'outputs': ["team_contextual_hca_2026.csv"]},
+    {'id': 'location_validated', 'script': "phd_location_enhancement_API.py", 'name': "PhD Home/Road (KenPom)",
+     'inputs': ["master_box_scores_2026.csv"], 'after': ['shot_miner'],
+     'outputs': ["team_home_performance_VALIDATED_2026.csv", "team_road_performance_VALIDATED_2026.csv"],
+     'network': True},
 ]
 
 # Expected outputs for validation
-EXPECTED_FILES = [
-    "master_game_logs_2026.csv",
-    "team_raw_efficiency_profiles_2026.csv",
-    "team_adjusted_efficiency_profiles_2026.csv",
-    "team_quadrant_analysis_2026.csv",
-]
+EXPECTED_FILES = [path for step in STEPS for path in step['outputs']]
 
+_print_lock = threading.Lock()
 
-def run_step(script: str, name: str) -> bool:
-    """Runs a single pipeline step."""
-    print(f"\n{'='*60}")
-    print(f"🔄 Running: {name}")
-    print(f"   Script: {script}")
-    print('='*60)
-    
+
+def log(message: str = ""):
+    with _print_lock:
+        print(message, flush=True)
+
+
+# ============================================================================
+# DAG
+# ============================================================================
+def step_dependencies(steps: list) -> dict:
+    """{step id: set of upstream step ids} from outputs -> inputs, plus explicit 'after'."""
+    producer = {path: step['id'] for step in steps for path in step['outputs']}
+    deps = {}
+    for step in steps:
+        upstream = {producer[p] for p in step['inputs'] if p in producer and producer[p] != step['id']}
+        deps[step['id']] = upstream | set(step.get('after', []))
+    return deps
+
+
+def downstream_of(step_id: str, deps: dict) -> set:
+    found, frontier = set(), {step_id}
+    while frontier:
+        frontier = {s for s, ups in deps.items() if ups & frontier} - found
+        found |= frontier
+    return found
+
+
+def branches(steps: list, deps: dict) -> list:
+    """Connected components of the DAG (each one can run beside the others)."""
+    ids = [s['id'] for s in steps]
+    parent = {i: i for i in ids}
+
+    def find(i):
+        while parent[i] != i:
+            i = parent[i]
+        return i
+
+    for s, ups in deps.items():
+        for u in ups:
+            if u in parent:
+                parent[find(s)] = find(u)
+    groups = {}
+    for i in ids:
+        groups.setdefault(find(i), []).append(i)
+    return list(groups.values())
+
+
+# ============================================================================
+# FINGERPRINTS
+# ============================================================================
+_hash_memo = {}
+
+
+def file_hash(path: str) -> str:
+    """sha256 of a file's content ('missing' if absent); memoized on (mtime, size)."""
+    full = os.path.join(BASE_DIR, path)
     try:
-        result = subprocess.run(
-            [sys.executable, script],
-            capture_output=False,
-            text=True
-        )
-        
-        if result.returncode == 0:
-            print(f"✅ {name} completed successfully")
+        st = os.stat(full)
+    except OSError:
+        return 'missing'
+    key = (full, st.st_mtime_ns, st.st_size)
+    if key not in _hash_memo:
+        h = hashlib.sha256()
+        with open(full, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                h.update(chunk)
+        _hash_memo[key] = h.hexdigest()
+    return _hash_memo[key]
+
+
+def code_files(script: str) -> list:
+    """The script plus every local module it (transitively) imports."""
+    seen, todo = [], [script]
+    while todo:
+        path = todo.pop()
+        if path in seen or not os.path.exists(os.path.join(BASE_DIR, path)):
+            continue
+        seen.append(path)
+        try:
+            with open(os.path.join(BASE_DIR, path), 'r', encoding='utf-8') as f:
+                tree = ast.parse(f.read())
+        except (OSError, SyntaxError, ValueError):
+            continue
+        for node in ast.walk(tree):
+            names = []
+            if isinstance(node, ast.Import):
+                names = [a.name for a in node.names]
+            elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                names = [node.module]
+            for name in names:
+                module = name.split('.')[0] + '.py'
+                if os.path.exists(os.path.join(BASE_DIR, module)):
+                    todo.append(module)
+    return sorted(seen)
+
+
+def fingerprint(step: dict, http_mode: str = None) -> str:
+    h = hashlib.sha256()
+    for path in code_files(step['script']):
+        h.update(f"code:{path}={file_hash(path)};".encode())
+    for path in step['inputs']:
+        h.update(f"input:{path}={file_hash(path)};".encode())
+    h.update(f"http:{http_mode or ''}".encode())
+    return h.hexdigest()
+
+
+def load_state() -> dict:
+    try:
+        with open(STATE_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_state(state: dict):
+    fd, tmp = tempfile.mkstemp(dir=BASE_DIR, suffix='.tmp')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+    os.replace(tmp, STATE_FILE)
+
+
+def cache_status(step: dict, state: dict, http_mode: str = None):
+    """(up_to_date, reason)."""
+    if step.get('network'):
+        return False, "network step"
+    record = state.get(step['id'])
+    if not record:
+        return False, "never run"
+    if record.get('fingerprint') != fingerprint(step, http_mode):
+        changed = [p for p in step['inputs'] if record.get('inputs', {}).get(p) != file_hash(p)]
+        return False, f"inputs changed ({', '.join(changed)})" if changed else "code changed"
+    for path, digest in record.get('outputs', {}).items():
+        if file_hash(path) != digest:
+            return False, f"output {path} missing/modified"
+    return True, "unchanged"
+
+
+# ============================================================================
+# EXECUTION
+# ============================================================================
+def run_step(script: str, name: str, http_mode: str = None, prefix: str = None,
+             telemetry: pipeline_telemetry.RunRecorder = None) -> bool:
+    """Runs a single pipeline step (through the record/replay or telemetry launcher if requested)."""
+    prefix = prefix or os.path.splitext(script)[0]
+    log(f"\n🔄 [{prefix}] Running: {name} ({script})")
+
+    try:
+        cmd = [sys.executable, script]
+        env = dict(os.environ, PYTHONUNBUFFERED='1', PYTHONIOENCODING='utf-8')
+        if telemetry:
+            # The telemetry launcher installs record/replay itself from the environment
+            cmd = [sys.executable] + telemetry.launcher_args(prefix) + [script]
+            if http_mode:
+                env[response_archive.MODE_ENV] = http_mode
+        elif http_mode:
+            cmd = [sys.executable, "response_archive.py", http_mode, script]
+        proc = subprocess.Popen(cmd, cwd=BASE_DIR, env=env, stdout=subprocess.PIPE,
+                                stderr=subprocess.STDOUT, text=True, encoding='utf-8', errors='replace')
+        for line in proc.stdout:
+            log(f"[{prefix}] {line.rstrip()}")
+        returncode = proc.wait()
+
+        if returncode == 0:
+            log(f"✅ [{prefix}] {name} completed successfully")
             return True
         else:
-            print(f"❌ {name} failed with return code {result.returncode}")
+            log(f"❌ [{prefix}] {name} failed with return code {returncode}")
             return False
-            
+
     except Exception as e:
-        print(f"❌ Error running {name}: {e}")
+        log(f"❌ Error running {name}: {e}")
         return False
 
 
-def validate_outputs() -> bool:
+# ============================================================================
+# IN-PROCESS MODE
+# ============================================================================
+_modules = {}
+_modules_lock = threading.Lock()
+
+
+def step_module(script: str):
+    """Imports a pipeline script (digit-prefixed, so not importable by name) once."""
+    with _modules_lock:
+        if script not in _modules:
+            name = "step_" + os.path.splitext(script)[0]
+            spec = importlib.util.spec_from_file_location(name, os.path.join(BASE_DIR, script))
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+            _modules[script] = module
+        return _modules[script]
+
+
+class FrameStore:
+    """
+    DataFrames handed between in-process steps. get() serves a frame produced
+    this run (or reads the CSV once); put() keeps the frame and queues its CSV
+    on a single background writer (atomic replace, in submission order).
+    """
+
+    def __init__(self):
+        self._frames = {}
+        self._lock = threading.Lock()
+        self._writer = ThreadPoolExecutor(max_workers=1)
+        self._pending = {}
+        self.errors = []
+
+    def get(self, path: str, reader=None):
+        with self._lock:
+            if path in self._frames:
+                return self._frames[path]
+        if reader is None:
+            import pandas as pd
+            reader = pd.read_csv
+        frame = reader(path)
+        if frame is None:
+            raise FileNotFoundError(path)
+        with self._lock:
+            return self._frames.setdefault(path, frame)
+
+    def put(self, path: str, frame, writer=None):
+        with self._lock:
+            self._frames[path] = frame
+            self._pending[path] = self._writer.submit(self._write, path, frame, writer)
+
+    def defer(self, fn):
+        """Runs fn on the writer after everything queued so far (skipped if a write failed)."""
+        self._writer.submit(lambda: None if self.errors else fn())
+
+    def _write(self, path: str, frame, writer):
+        try:
+            tmp = f"{path}.tmp"
+            if writer is None:
+                frame.to_csv(tmp, index=False)
+            else:
+                writer(frame, tmp)
+            os.replace(tmp, path)
+        except Exception as e:
+            self.errors.append((path, str(e)))
+            log(f"❌ Background write failed: {path} ({e})")
+
+    def flush(self, paths=None):
+        """Blocks until the queued writes of `paths` (default: all) are on disk."""
+        with self._lock:
+            futures = [f for p, f in self._pending.items() if paths is None or p in paths]
+        wait(futures)
+
+    def close(self):
+        self._writer.shutdown(wait=True)
+
+
+def _read_facts(path):
+    from game_facts import load_game_facts
+    return load_game_facts(path, with_keys=False)
+
+
+def _in_process_game_logs(store):
+    m = step_module("01_master_game_log_scraper.py")
+    logs = m.scrape_game_logs()
+    if logs is None:
+        raise RuntimeError("no games scraped")
+    store.put(m.OUTPUT_FILE, logs)
+
+
+def _in_process_efficiency(store):
+    from game_facts import write_game_facts
+    m = step_module("02_efficiency_processor.py")
+    result = m.compute_efficiency(store.get(m.INPUT_GAME_LOGS), m.load_kenpom_tempo(m.KENPOM_DATA_FILE),
+                                  all_facts=True)
+    store.put(m.OUTPUT_FILE, result['profiles'])
+    store.put(m.FACT_FILE, result['facts'], writer=write_game_facts)
+    # The accumulator state only moves forward once both files are written
+    store.defer(lambda: m.save_state(result['state']))
+
+
+def _in_process_sos(store):
+    from game_facts import add_keys
+    m = step_module("03_sos_adjustment_processor.py")
+    logs = add_keys(store.get(m.FACT_FILE, reader=_read_facts))
+    adjusted = m.adjust_efficiency(logs, store.get(m.INPUT_RAW_PROFILES))
+    store.put(m.OUTPUT_FILE, adjusted)
+
+
+def _in_process_quadrants(store):
+    from game_facts import add_keys
+    m = step_module("04_quadrant_performance_analyzer.py")
+    logs = add_keys(store.get(m.FACT_FILE, reader=_read_facts))
+    store.put(m.OUTPUT_FILE, m.analyze_quadrants(logs, store.get(m.INPUT_ADJ_PROFILES)))
+
+
+def _in_process_context_matrix(store):
+    m = step_module("08_context_matrix_generator.py")
+    home, road = m.build_context_matrices(store.get(m.BOX_SCORE_FILE))
+    store.put(m.OUTPUT_HOME, home)
+    store.put(m.OUTPUT_ROAD, road)
+
+
+def _in_process_hca(store):
+    m = step_module("09_hca_decomposer.py")
+    store.put(m.OUTPUT_FILE, m.decompose_hca(store.get(m.INPUT_FILE)))
+
+
+IN_PROCESS = {
+    'game_logs': _in_process_game_logs,
+    'efficiency': _in_process_efficiency,
+    'sos': _in_process_sos,
+    'quadrants': _in_process_quadrants,
+    'context_matrix': _in_process_context_matrix,
+    'hca': _in_process_hca,
+}
+
+
+def run_in_process(step: dict, store: FrameStore, telemetry: pipeline_telemetry.RunRecorder = None) -> bool:
+    sid = step['id']
+    log(f"\n🔄 [{sid}] Running in-process: {step['name']} ({step['script']})")
+    probe = telemetry.probe() if telemetry else None
+    start = time.perf_counter()
+    ok = True
+    try:
+        if probe:
+            with probe:
+                IN_PROCESS[sid](store)
+        else:
+            IN_PROCESS[sid](store)
+    except Exception as e:
+        log(traceback.format_exc())
+        log(f"❌ [{sid}] {step['name']} failed: {e}")
+        ok = False
+    if telemetry:
+        telemetry.add(step, ok, 'in-process', probe.metrics)
+    if ok:
+        log(f"✅ [{sid}] {step['name']} completed in-process ({time.perf_counter() - start:.2f}s)")
+    return ok
+
+
+def plan(steps: list, selected: set, state: dict, http_mode: str = None, force: bool = False) -> dict:
+    """{step id: (action, reason)} with action in run / cached / skip."""
+    deps = step_dependencies(steps)
+    actions = {}
+    for step in topological(steps, deps):
+        sid = step['id']
+        if sid not in selected:
+            actions[sid] = ('skip', "not selected")
+            continue
+        if force:
+            actions[sid] = ('run', "--force")
+            continue
+        upstream_runs = [u for u in deps[sid] if actions.get(u, ('skip',))[0] == 'run']
+        fresh, reason = cache_status(step, state, http_mode)
+        if upstream_runs and not step.get('network'):
+            actions[sid] = ('run', f"waits on {', '.join(sorted(upstream_runs))}; re-checked then")
+        else:
+            actions[sid] = ('cached' if fresh else 'run', reason)
+    return actions
+
+
+def topological(steps: list, deps: dict) -> list:
+    by_id = {s['id']: s for s in steps}
+    done, ordered = set(), []
+    while len(ordered) < len(steps):
+        ready = [s for s in steps if s['id'] not in done and deps[s['id']] <= done | (set(deps) - set(by_id))]
+        if not ready:
+            raise ValueError(f"Cycle in pipeline DAG among: {sorted(set(by_id) - done)}")
+        for s in ready:
+            done.add(s['id'])
+            ordered.append(s)
+    return ordered
+
+
+def print_plan(steps: list, actions: dict, jobs: int):
+    deps = step_dependencies(steps)
+    log(f"\n📋 PIPELINE PLAN ({jobs} parallel job{'s' if jobs != 1 else ''})")
+    depth = {}
+    for step in topological(steps, deps):
+        depth[step['id']] = 1 + max((depth[u] for u in deps[step['id']] if u in depth), default=-1)
+    for i, group in enumerate(branches(steps, deps), 1):
+        levels = {}
+        for sid in group:
+            levels.setdefault(depth[sid], []).append(sid)
+        stages = [ids[0] if len(ids) == 1 else '{' + ' | '.join(ids) + '}' for _, ids in sorted(levels.items())]
+        log(f"   Branch {i}: {' → '.join(stages)}")
+    log("")
+    log(f"   {'Step':<20} {'Script':<38} {'Needs':<24} Action")
+    icons = {'run': '▶️ ', 'cached': '✔️ ', 'skip': '⏭️ '}
+    for step in topological(steps, deps):
+        action, reason = actions[step['id']]
+        needs = ', '.join(sorted(deps[step['id']])) or '-'
+        log(f"   {step['id']:<20} {step['script']:<38} {needs:<24} {icons[action]}{action.upper()} ({reason})")
+
+
+def execute(steps: list, selected: set, state: dict, http_mode: str = None,
+            force: bool = False, jobs: int = DEFAULT_JOBS, in_process: bool = False,
+            telemetry: pipeline_telemetry.RunRecorder = None) -> dict:
+    """Runs the DAG. Returns {step id: 'ok' | 'cached' | 'failed' | 'blocked' | 'skipped'}."""
+    deps = step_dependencies(steps)
+    by_id = {s['id']: s for s in steps}
+    results = {sid: 'skipped' for sid in by_id if sid not in selected}
+    pending = [s['id'] for s in topological(steps, deps) if s['id'] in selected]
+    running = {}
+    store = FrameStore() if in_process else None
+    deferred = {}  # in-process steps: fingerprinted once their CSVs are on disk
+
+    def finished(sid):
+        return results.get(sid) in ('ok', 'cached', 'skipped')
+
+    def record(sid, fp, inputs, seconds):
+        state[sid] = {
+            'fingerprint': fp,
+            'inputs': inputs,
+            'outputs': {p: file_hash(p) for p in by_id[sid]['outputs']},
+            'seconds': seconds,
+            'finished_at': datetime.now().isoformat(timespec='seconds'),
+        }
+        save_state(state)
+
+    def in_memory(step):
+        # Scrapers under --record/--replay need the archive launcher
+        return store is not None and step['id'] in IN_PROCESS and not (http_mode and step.get('network'))
+
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        while pending or running:
+            for sid in list(pending):
+                ups = deps[sid]
+                if any(results.get(u) in ('failed', 'blocked') for u in ups):
+                    results[sid] = 'blocked'
+                    pending.remove(sid)
+                    log(f"⛔ [{sid}] Not run: upstream step failed")
+                    continue
+                if not all(finished(u) for u in ups) or len(running) >= max(1, jobs):
+                    continue
+                step = by_id[sid]
+                ran_upstream = [u for u in ups if u in deferred]
+                if force:
+                    fresh, reason = False, "--force"
+                elif ran_upstream:
+                    # Inputs may still be queued for writing; they changed this run anyway
+                    fresh, reason = False, f"{', '.join(sorted(ran_upstream))} ran in-process"
+                else:
+                    fresh, reason = cache_status(step, state, http_mode)
+                pending.remove(sid)
+                if fresh:
+                    results[sid] = 'cached'
+                    log(f"✔️  [{sid}] Up to date - skipped ({reason})")
+                    continue
+                log(f"▶️  [{sid}] {reason}")
+                if in_memory(step):
+                    future = pool.submit(run_in_process, step, store, telemetry)
+                    running[future] = (sid, None, None, time.time())
+                else:
+                    if store is not None:
+                        store.flush(step['inputs'])
+                    fp = fingerprint(step, http_mode)
+                    inputs = {p: file_hash(p) for p in step['inputs']}
+                    future = pool.submit(run_step, step['script'], step['name'], http_mode, sid, telemetry)
+                    running[future] = (sid, fp, inputs, time.time())
+
+            if not running:
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                sid, fp, inputs, started = running.pop(future)
+                ok = future.result()
+                results[sid] = 'ok' if ok else 'failed'
+                if telemetry and fp is not None:
+                    telemetry.add(by_id[sid], ok, 'subprocess')
+                if ok and fp is None:
+                    deferred[sid] = round(time.time() - started, 1)
+                elif ok:
+                    record(sid, fp, inputs, round(time.time() - started, 1))
+
+    if store is not None:
+        log("\n💾 Waiting for background CSV writes...")
+        store.close()
+        failed_paths = {path for path, _ in store.errors}
+        for sid, seconds in deferred.items():
+            step = by_id[sid]
+            if failed_paths & set(step['outputs']):
+                results[sid] = 'failed'
+                continue
+            record(sid, fingerprint(step, http_mode), {p: file_hash(p) for p in step['inputs']}, seconds)
+    if telemetry:
+        telemetry.save()
+    return results
+
+
+def validate_outputs(files: list = None) -> bool:
     """Validates that all expected output files exist."""
     print(f"\n{'='*60}")
     print("🔍 Validating outputs...")
     print('='*60)
-    
+
     all_valid = True
-    for filepath in EXPECTED_FILES:
+    for filepath in (EXPECTED_FILES if files is None else files):
         if os.path.exists(filepath):
             size = os.path.getsize(filepath)
             print(f"  ✅ {filepath} ({size:,} bytes)")
         else:
             print(f"  ❌ {filepath} - NOT FOUND")
             all_valid = False
-    
+
     return all_valid
 
 
+def select_steps(args) -> set:
+    selected = {s['id'] for s in STEPS}
+    if args.only:
+        wanted = {x.strip() for x in args.only.split(',') if x.strip()}
+        unknown = wanted - selected
+        if unknown:
+            print(f"❌ Unknown step(s): {', '.join(sorted(unknown))}. Steps: {', '.join(s['id'] for s in STEPS)}")
+            sys.exit(2)
+        selected = wanted
+    if args.step > 1:
+        # Legacy resume of the game-log chain: nothing else runs
+        selected -= {s['id'] for s in STEPS if not s.get('order') or s['order'] < args.step}
+    if args.skip_scrape:
+        selected -= {s['id'] for s in STEPS if s.get('network')}
+        print("⏭️  Skipping network steps (using existing data)")
+    return selected
+
+
 def main():
     parser = argparse.ArgumentParser(description="THE BIBLE Data Pipeline Runner")
-    parser.add_argument('--skip-scrape', action='store_true', 
-                       help='Skip the scraping step (use existing data)')
+    parser.add_argument('--skip-scrape', action='store_true',
+                       help='Skip the network steps (use existing data)')
     parser.add_argument('--step', type=int, default=1,
-                       help='Start from step N (1-4)')
+                       help='Resume the game-log chain from step N (1-4); the box-score branch does not run')
+    parser.add_argument('--only', default='',
+                       help='Comma-separated step ids to run (see --plan)')
+    parser.add_argument('--plan', action='store_true',
+                       help='Dry run: print the DAG and what would run')
+    parser.add_argument('--force', action='store_true',
+                       help='Run steps even if their fingerprint is unchanged')
+    parser.add_argument('--jobs', type=int, default=DEFAULT_JOBS,
+                       help='Maximum steps running at once')
+    parser.add_argument('--in-process', action='store_true',
+                       help='Run 01-04, 08 and 09 in this interpreter, handing DataFrames along in memory')
+    parser.add_argument('--telemetry', action='store_true',
+                       help='Record per-step timing, memory, rows and HTTP stats')
+    parser.add_argument('--tracemalloc', action='store_true',
+                       help='With --telemetry: also record the top memory allocators')
     parser.add_argument('--validate-only', action='store_true',
                        help='Only validate existing outputs')
+    http = parser.add_mutually_exclusive_group()
+    http.add_argument('--record', action='store_true',
+                      help='Record every HTTP response to the response archive')
+    http.add_argument('--replay', action='store_true',
+                      help='Serve every HTTP response from the response archive (no network)')
+    parser.add_argument('--archive', default=response_archive.DEFAULT_ARCHIVE,
+                        help='Response archive directory')
     args = parser.parse_args()
-    
+
+    http_mode = 'record' if args.record else 'replay' if args.replay else None
+    if http_mode:
+        # Inherited by every step; one private HTTP cache shared across steps
+        os.environ[response_archive.ARCHIVE_ENV] = os.path.abspath(args.archive)
+        os.environ.setdefault(response_archive.CACHE_DIR_ENV,
+                              tempfile.mkdtemp(prefix='bible_http_cache_'))
+
     print("="*60)
-    print("THE BIBLE - Data Pipeline v2.0")
+    print("THE BIBLE - Data Pipeline v3.0 (DAG)")
     print(f"Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    if http_mode:
+        print(f"📼 HTTP {http_mode} mode -> {os.path.abspath(args.archive)}")
     print("="*60)
-    
+
     if args.validate_only:
         success = validate_outputs()
         sys.exit(0 if success else 1)
-    
-    # Determine which steps to run
-    start_step = args.step - 1  # Convert to 0-indexed
-    
-    if args.skip_scrape and start_step == 0:
-        start_step = 1
-        print("⏭️  Skipping scrape step (using existing data)")
-    
-    # Run pipeline
-    for i, (script, name) in enumerate(STEPS):
-        if i < start_step:
-            print(f"⏭️  Skipping step {i+1}: {name}")
-            continue
-            
-        success = run_step(script, name)
-        
-        if not success:
-            print(f"\n❌ Pipeline failed at step {i+1}: {name}")
-            print("Fix the error and re-run with --step", i+1)
-            sys.exit(1)
-    
+
+    selected = select_steps(args)
+    state = load_state()
+
+    if args.plan:
+        print_plan(STEPS, plan(STEPS, selected, state, http_mode, args.force), args.jobs)
+        return
+
+    started = time.time()
+    if args.in_process:
+        os.chdir(BASE_DIR)  # the scripts use paths relative to the repo
+    telemetry = None
+    if args.telemetry or args.tracemalloc:
+        telemetry = pipeline_telemetry.RunRecorder(trace=args.tracemalloc)
+    results = execute(STEPS, selected, state, http_mode, force=args.force, jobs=args.jobs,
+                      in_process=args.in_process, telemetry=telemetry)
+
+    print(f"\n{'='*60}")
+    print(f"📊 PIPELINE SUMMARY ({time.time() - started:.0f}s)")
+    print('='*60)
+    icons = {'ok': '✅', 'cached': '✔️ ', 'failed': '❌', 'blocked': '⛔', 'skipped': '⏭️ '}
+    for step in STEPS:
+        print(f"  {icons[results[step['id']]]} {step['id']:<20} {results[step['id']]}")
+
+    failed = [sid for sid, r in results.items() if r in ('failed', 'blocked')]
+    if failed:
+        print(f"\n❌ Pipeline incomplete: {', '.join(failed)}")
+        print("Fix the error and re-run - finished steps are skipped automatically.")
+        sys.exit(1)
+
     # Validate
+    ran = [p for step in STEPS if results[step['id']] in ('ok', 'cached') for p in step['outputs']]
     print("\n")
-    if validate_outputs():
+    if validate_outputs(ran):
         print("\n" + "="*60)
         print("🎉 PIPELINE COMPLETE - All outputs validated")
         print("="*60)
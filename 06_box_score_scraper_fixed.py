@@ -8,14 +8,38 @@ FIXES:
   - Only processes completed games (has final score)
   - Better error handling and diagnostics
   - Shows you which teams/games are being processed
+  - Responses go through the persistent HTTP cache (http_cache.py):
+    final game summaries are never downloaded twice
+  - Box score parsing lives in espn_summary.py (shared with the shot miner,
+    which emits these rows from the same summary download)
+  - Scoreboard discovery (default): scans the date scoreboards since the last
+    successful run (persisted high-water mark) instead of ~362 team schedules
+  - Games that keep failing (cancelled / forfeited, summary 404s) are given up
+    after MAX_GAME_ATTEMPTS runs so they stop holding the high-water mark back
+
+Usage:
+    python 06_box_score_scraper_fixed.py                        # scoreboard discovery
+    python 06_box_score_scraper_fixed.py --discovery schedule   # per-team schedules
+    python 06_box_score_scraper_fixed.py --rescan               # ignore high-water mark, retry given-up games
 """
 
 import requests
 import pandas as pd
 import time
 import os
+import json
+import argparse
 import logging
-from datetime import datetime, timedelta
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+
+import http_cache
+import team_registry
+from espn_summary import (summary_url, parse_stat_group, calculate_four_factors,
+                          build_game_rows, append_box_scores)
+from rate_limiter import TokenBucket
 
 # ==============================================================================
 # CONFIGURATION
@@ -25,6 +49,17 @@ OUTPUT_FILE = "master_box_scores_2026.csv"
 HEADERS = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
 REQUEST_DELAY = 0.15
 
+# Scoreboard discovery
+SEASON_START = date(2025, 11, 3)
+SCAN_STATE_FILE = "box_score_scan_state_2026.json"
+MAX_GAME_ATTEMPTS = 3       # Runs a game may fail before it no longer pins the high-water mark
+
+# Parallel summary fetching
+MAX_WORKERS = 8             # Concurrent summary downloads
+IN_FLIGHT_WINDOW = 32       # Max games fetched but not yet parsed (backpressure)
+REQUESTS_PER_SECOND = 8.0   # Global request budget across workers
+SCOREBOARD_URL = "https://site.api.espn.com/apis/site/v2/sports/basketball/mens-college-basketball/scoreboard?dates={date}&limit=1000&groups=50"
+
 # Logger Setup
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -37,9 +72,8 @@ def get_d1_teams():
     """Fetches dictionary of {TeamName: ESPN_ID} for all D1 schools."""
     url = "http://site.api.espn.com/apis/site/v2/sports/basketball/mens-college-basketball/teams?limit=400"
     try:
-        resp = requests.get(url, headers=HEADERS, timeout=10)
-        resp.raise_for_status()
-        teams = resp.json()['sports'][0]['leagues'][0]['teams']
+        teams = http_cache.get_json(url, headers=HEADERS, timeout=10)['sports'][0]['leagues'][0]['teams']
+        team_registry.refresh_from_espn([t['team'] for t in teams])
         team_dict = {t['team']['displayName']: t['team']['id'] for t in teams}
         logger.info(f"✅ Loaded {len(team_dict)} D1 teams")
         return team_dict
@@ -56,11 +90,7 @@ def get_completed_games_for_team(team_id, season=SEASON_YEAR):
     url = f"http://site.api.espn.com/apis/site/v2/sports/basketball/mens-college-basketball/teams/{team_id}/schedule?season={season}"
     
     try:
-        resp = requests.get(url, headers=HEADERS, timeout=10)
-        if resp.status_code != 200:
-            return set()
-        
-        data = resp.json()
+        data = http_cache.get_json(url, headers=HEADERS, timeout=10)
         
         if 'events' not in data:
             return set()
@@ -89,88 +119,182 @@ def get_completed_games_for_team(team_id, season=SEASON_YEAR):
         logger.warning(f"⚠️ Could not fetch schedule for team {team_id}: {e}")
         return set()
 
-def fetch_game_summary(game_id):
+def get_completed_games_for_date(day):
+    """
+    Reads the D1 scoreboard for one date.
+    Returns (completed_game_ids, has_pending) where has_pending is True if
+    any game that day is scheduled or in progress.
+    Raises on network failure so the caller never advances past an unread date.
+    """
+    data = http_cache.get_json(SCOREBOARD_URL.format(date=day.strftime("%Y%m%d")),
+                               headers=HEADERS, timeout=10)
+    
+    completed_game_ids = set()
+    has_pending = False
+    
+    for event in data.get('events', []):
+        status = event.get('status', {}).get('type', {})
+        state = status.get('state', '')
+        
+        if state == 'post' and status.get('completed', True):
+            completed_game_ids.add(str(event['id']))
+        elif state in ('pre', 'in'):
+            has_pending = True
+    
+    return completed_game_ids, has_pending
+
+def _read_scan_state():
+    if not os.path.exists(SCAN_STATE_FILE):
+        return {}
+    try:
+        with open(SCAN_STATE_FILE, 'r') as f:
+            return json.load(f)
+    except Exception as e:
+        logger.warning(f"⚠️ Could not read {SCAN_STATE_FILE}: {e}")
+        return {}
+
+def load_scan_state():
+    """Loads the persisted scoreboard high-water mark (or None on first run)."""
+    try:
+        return date.fromisoformat(_read_scan_state()['high_water_mark'])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+def load_failed_games():
+    """{GameID: failed attempts} carried over from earlier runs."""
+    return {str(gid): int(n) for gid, n in _read_scan_state().get('failed_games', {}).items()}
+
+def save_scan_state(high_water_mark, failed_games=None):
+    with open(SCAN_STATE_FILE, 'w') as f:
+        json.dump({
+            'high_water_mark': high_water_mark.isoformat(),
+            'failed_games': failed_games or {},
+            'updated': datetime.now().isoformat(timespec='seconds'),
+        }, f, indent=2)
+
+def update_failed_games(failed_games, failed_ids, scraped_ids):
+    """
+    Counts this run's failures. Returns the games still worth retrying; games
+    that reached MAX_GAME_ATTEMPTS stay recorded (and skipped) but no longer
+    hold the high-water mark back.
+    """
+    for gid in scraped_ids:
+        failed_games.pop(gid, None)
+    for gid in failed_ids:
+        failed_games[gid] = failed_games.get(gid, 0) + 1
+    given_up = sorted(gid for gid in failed_ids if failed_games[gid] >= MAX_GAME_ATTEMPTS)
+    if given_up:
+        logger.warning(f"🚫 Giving up on {len(given_up)} game(s) after {MAX_GAME_ATTEMPTS} failed runs "
+                       f"(--rescan retries them): {', '.join(given_up[:10])}")
+    return set(failed_ids) - set(given_up)
+
+def settled_high_water_mark(scan, failed_ids):
+    """Pulls the high-water mark back before any date whose game failed to scrape."""
+    hwm = scan['high_water_mark']
+    failed_dates = [scan.get('game_dates', {}).get(gid) for gid in failed_ids]
+    failed_dates = [d for d in failed_dates if d is not None]
+    if failed_dates:
+        hwm = min(hwm, min(failed_dates) - timedelta(days=1))
+    return hwm
+
+def discover_games_by_scoreboard(processed_ids, scan, start_date=None, end_date=None):
+    """
+    Yields completed, not-yet-processed GameIDs from the date scoreboards.
+    
+    Scans from the persisted high-water mark (inclusive) to today. The new
+    high-water mark is the last date of the settled prefix: every date up to
+    it was read successfully and had no scheduled/in-progress games.
+    It is written into scan['high_water_mark']; the caller persists it only
+    after the scrape succeeds, so a crash simply re-scans those dates.
+    """
+    end_date = end_date or date.today()
+    start_date = start_date or load_scan_state() or SEASON_START
+    scan['high_water_mark'] = start_date - timedelta(days=1)
+    settled = True
+    seen = set()
+    
+    day = start_date
+    while day <= end_date:
+        try:
+            game_ids, has_pending = get_completed_games_for_date(day)
+        except Exception as e:
+            logger.warning(f"⚠️ Could not read scoreboard for {day}: {e}")
+            game_ids, has_pending = set(), True
+        
+        if not http_cache.last_was_hit():
+            time.sleep(REQUEST_DELAY)
+        
+        if settled and not has_pending and day < end_date:
+            scan['high_water_mark'] = day
+        else:
+            settled = False
+        
+        for gid in sorted(game_ids - processed_ids - seen):
+            seen.add(gid)
+            scan.setdefault('game_dates', {})[gid] = day
+            yield gid
+        
+        day += timedelta(days=1)
+
+def fetch_game_summary(game_id, session=None):
     """Hits the ESPN Summary API to get box score stats."""
-    url = f"http://site.api.espn.com/apis/site/v2/sports/basketball/mens-college-basketball/summary?event={game_id}"
+    url = summary_url(game_id)
     try:
-        resp = requests.get(url, headers=HEADERS, timeout=10)
-        if resp.status_code == 200:
-            return resp.json()
+        return http_cache.get_json(url, headers=HEADERS, timeout=10, session=session)
     except Exception as e:
         logger.debug(f"Failed to fetch game {game_id}: {e}")
     return None
 
-def parse_stat_group(statistics):
-    """Parses the 'statistics' list from ESPN API."""
-    stats = {}
-    for item in statistics:
-        label = item['name']
-        val = item['displayValue']
-        
-        # --- Handle "Made-Att" format (e.g. "25-60") ---
-        if '-' in val:
-            parts = val.split('-')
-            try:
-                made = int(parts[0])
-                att = int(parts[1])
-                
-                if label in ['fieldGoals', 'fieldGoalsMade']: 
-                    stats['FGM'], stats['FGA'] = made, att
-                elif label in ['threePointFieldGoals', 'threePointFieldGoalsMade']:
-                    stats['3PM'], stats['3PA'] = made, att
-                elif label in ['freeThrows', 'freeThrowsMade']:
-                    stats['FTM'], stats['FTA'] = made, att
-            except:
-                continue
-        else:
-            # --- Handle direct numbers ---
-            try:
-                num = int(val)
-                if label in ['totalRebounds', 'rebounds']: stats['REB'] = num
-                elif label in ['offensiveRebounds']: stats['OR'] = num
-                elif label in ['defensiveRebounds']: stats['DR'] = num
-                elif label in ['turnovers']: stats['TO'] = num
-                elif label in ['fouls']: stats['PF'] = num
-            except:
-                continue
-    return stats
+# ==============================================================================
+# FETCH STAGES
+# ==============================================================================
 
-def calculate_four_factors(team_stats, opp_stats):
-    """Calculates eFG%, TO%, OR%, FTR."""
-    # Validation
-    if 'FGA' not in team_stats or team_stats['FGA'] == 0:
-        return None
+def fetch_games_serial(game_ids):
+    """Yields (gid, summary) one request at a time."""
+    for gid in game_ids:
+        data = fetch_game_summary(gid)
+        yield gid, data
+        if not http_cache.last_was_hit():
+            time.sleep(REQUEST_DELAY)
 
-    fga = team_stats.get('FGA', 0)
-    or_val = team_stats.get('OR', 0)
-    to_val = team_stats.get('TO', 0)
-    fta = team_stats.get('FTA', 0)
-    
-    poss = fga - or_val + to_val + (0.475 * fta)
-    if poss <= 0: poss = 1.0
-    
-    fgm = team_stats.get('FGM', 0)
-    pm3 = team_stats.get('3PM', 0)
-    efg = (fgm + 0.5 * pm3) / fga
-    
-    to_rate = to_val / poss
+def fetch_games_parallel(game_ids, workers=MAX_WORKERS, window=IN_FLIGHT_WINDOW,
+                         rps=REQUESTS_PER_SECOND):
+    """
+    Yields (gid, summary) in input order while up to `workers` requests run
+    concurrently. At most `window` games are fetched-but-unconsumed at any
+    time, so a slow consumer (parsing, safety saves) throttles the fetchers.
+    Each worker reuses its own keep-alive session; all share one rate budget.
+    """
+    limiter = TokenBucket(rps)
+    local = threading.local()
+    cache = http_cache.get_cache()
     
-    opp_dr = opp_stats.get('DR', 0)
-    or_chances = or_val + opp_dr
-    or_rate = or_val / or_chances if or_chances > 0 else 0.0
+    def fetch(gid):
+        if not hasattr(local, 'session'):
+            local.session = requests.Session()
+            local.session.headers.update(HEADERS)
+        if not cache.is_fresh(summary_url(gid)):
+            limiter.acquire()
+        return fetch_game_summary(gid, session=local.session)
     
-    ft_rate = fta / fga
+    ids = iter(game_ids)
+    in_flight = deque()
     
-    return {
-        'Possessions': round(poss, 1),
-        'eFG%': round(efg * 100, 1),
-        'TO%': round(to_rate * 100, 1),
-        'OR%': round(or_rate * 100, 1),
-        'FTR': round(ft_rate * 100, 1),
-        'Raw_OR': or_val,
-        'Raw_TO': to_val,
-        'Raw_FT': fta
-    }
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for gid in ids:
+            in_flight.append((gid, executor.submit(fetch, gid)))
+            if len(in_flight) >= max(window, 1):
+                break
+        
+        while in_flight:
+            gid, future = in_flight.popleft()
+            data = future.result()
+            
+            next_gid = next(ids, None)
+            if next_gid is not None:
+                in_flight.append((next_gid, executor.submit(fetch, next_gid)))
+            
+            yield gid, data
 
 # ==============================================================================
 # DIAGNOSTIC FUNCTION
@@ -246,7 +370,7 @@ def test_single_game(game_id):
 # MAIN PIPELINE
 # ==============================================================================
 
-def main():
+def main(discovery='scoreboard', rescan=False, workers=MAX_WORKERS, window=IN_FLIGHT_WINDOW):
     logger.info("\n" + "="*70)
     logger.info("🏀 ESPN BOX SCORE SCRAPER - ROBUST VERSION")
     logger.info("="*70)
@@ -262,138 +386,115 @@ def main():
         except Exception as e:
             logger.warning(f"⚠️ Could not read existing file: {e}")
 
-    # 2. Get All Teams
-    teams = get_d1_teams()
-    if not teams:
-        logger.error("❌ Failed to load teams. Exiting.")
-        return
-    
-    # 3. Find Completed Games
-    all_completed_games = set()
-    logger.info("\n🔍 Scanning for COMPLETED games...")
-    
-    for i, (name, tid) in enumerate(teams.items()):
-        if i % 20 == 0:
-            logger.info(f"   Scanning team {i+1}/{len(teams)}: {name}")
+    game_failures = {} if rescan else load_failed_games()
+    given_up = {gid for gid, n in game_failures.items() if n >= MAX_GAME_ATTEMPTS}
+    if given_up:
+        logger.info(f"🚫 Skipping {len(given_up)} game(s) that failed {MAX_GAME_ATTEMPTS}+ runs")
+
+    scan = {}
+    if discovery == 'scoreboard':
+        # 2-3. Walk the date scoreboards since the last successful run
+        start_date = SEASON_START if rescan else None
+        logger.info(f"\n🔍 Scanning scoreboards from {start_date or load_scan_state() or SEASON_START}...")
+        games_to_scrape = list(discover_games_by_scoreboard(processed_ids | given_up, scan, start_date=start_date))
+    else:
+        # 2. Get All Teams
+        teams = get_d1_teams()
+        if not teams:
+            logger.error("❌ Failed to load teams. Exiting.")
+            return
         
-        completed_games = get_completed_games_for_team(tid)
-        all_completed_games.update(completed_games)
-        time.sleep(REQUEST_DELAY)
-    
-    logger.info(f"\n✅ Found {len(all_completed_games)} total completed games")
+        # 3. Find Completed Games
+        all_completed_games = set()
+        logger.info("\n🔍 Scanning for COMPLETED games...")
+        
+        for i, (name, tid) in enumerate(teams.items()):
+            if i % 20 == 0:
+                logger.info(f"   Scanning team {i+1}/{len(teams)}: {name}")
+            
+            completed_games = get_completed_games_for_team(tid)
+            all_completed_games.update(completed_games)
+            if not http_cache.last_was_hit():
+                time.sleep(REQUEST_DELAY)
+        
+        logger.info(f"\n✅ Found {len(all_completed_games)} total completed games")
+        
+        # Remove already processed
+        games_to_scrape = list(all_completed_games - processed_ids - given_up)
     
-    # Remove already processed
-    games_to_scrape = list(all_completed_games - processed_ids)
     logger.info(f"📋 New games to scrape: {len(games_to_scrape)}")
     
     if not games_to_scrape:
+        if 'high_water_mark' in scan:
+            save_scan_state(scan['high_water_mark'], game_failures)
         logger.info("✅ Database is up to date!")
+        logger.info(f"🗄️  {http_cache.summary()}")
         return
     
     # 4. Scrape New Games
     new_rows = []
     successful_games = 0
     failed_games = 0
+    failed_ids = set()
+    scraped_ids = set()
     
     logger.info(f"\n{'='*70}")
-    logger.info(f"🚀 SCRAPING {len(games_to_scrape)} NEW GAMES")
+    logger.info(f"🚀 SCRAPING {len(games_to_scrape)} NEW GAMES ({workers} workers)")
     logger.info(f"{'='*70}\n")
     
-    for i, gid in enumerate(games_to_scrape):
+    if workers > 1:
+        results = fetch_games_parallel(games_to_scrape, workers=workers, window=window)
+    else:
+        results = fetch_games_serial(games_to_scrape)
+    
+    start_time = time.time()
+    
+    for i, (gid, data) in enumerate(results):
         # Progress update
         if i % 10 == 0:
             pct = (i / len(games_to_scrape)) * 100
-            logger.info(f"⛏️  Progress: {i}/{len(games_to_scrape)} ({pct:.1f}%) | Success: {successful_games} | Failed: {failed_games}")
+            rate = i / max(time.time() - start_time, 1e-9)
+            logger.info(f"⛏️  Progress: {i}/{len(games_to_scrape)} ({pct:.1f}%) | Success: {successful_games} | Failed: {failed_games} | {rate:.1f} games/sec")
         
-        # Fetch game data
-        data = fetch_game_summary(gid)
+        try:
+            rows = build_game_rows(gid, data)
+        except Exception as e:
+            rows = None
+            if failed_games < 10:
+                logger.warning(f"⚠️ Error on game {gid}: {e}")
         
-        if not data or 'boxscore' not in data or 'teams' not in data['boxscore']:
+        if not rows:
             failed_games += 1
+            failed_ids.add(gid)
             continue
         
-        try:
-            # Parse teams
-            team1_info = data['boxscore']['teams'][0]
-            team2_info = data['boxscore']['teams'][1]
-            
-            t1_name = team1_info['team']['displayName']
-            t2_name = team2_info['team']['displayName']
-            
-            # Parse stats
-            t1_stats = parse_stat_group(team1_info['statistics'])
-            t2_stats = parse_stat_group(team2_info['statistics'])
-            
-            if not t1_stats or not t2_stats:
-                failed_games += 1
-                continue
-            
-            # Calculate four factors
-            t1_factors = calculate_four_factors(t1_stats, t2_stats)
-            t2_factors = calculate_four_factors(t2_stats, t1_stats)
-            
-            if not t1_factors or not t2_factors:
-                failed_games += 1
-                continue
-            
-            # Get game info
-            date_str = data['header']['competitions'][0]['date'][:10]
-            neutral_site = data['header']['competitions'][0]['neutralSite']
-            
-            # Determine location
-            comps = data['header']['competitions'][0]['competitors']
-            home_id = next((c['id'] for c in comps if c['homeAway'] == 'home'), None)
-            
-            t1_loc = "Home" if team1_info['team']['id'] == home_id else "Away"
-            t2_loc = "Away" if t1_loc == "Home" else "Home"
-            
-            if neutral_site:
-                t1_loc = "Neutral"
-                t2_loc = "Neutral"
-            
-            # Add rows
-            new_rows.append({
-                'GameID': gid, 'Date': date_str, 
-                'Team': t1_name, 'Opponent': t2_name,
-                'Location': t1_loc, **t1_factors
-            })
-            new_rows.append({
-                'GameID': gid, 'Date': date_str,
-                'Team': t2_name, 'Opponent': t1_name,
-                'Location': t2_loc, **t2_factors
-            })
-            
-            successful_games += 1
-            
-            # Show some successful games so you know it's working
-            if successful_games <= 5 or successful_games % 50 == 0:
-                logger.info(f"   ✅ Game {successful_games}: {t1_name} vs {t2_name}")
-            
-            # Safety save every 100 games
-            if len(new_rows) >= 200:
-                df_safe = pd.DataFrame(new_rows)
-                mode = 'a' if os.path.exists(OUTPUT_FILE) else 'w'
-                header = not os.path.exists(OUTPUT_FILE)
-                df_safe.to_csv(OUTPUT_FILE, mode=mode, header=header, index=False)
-                logger.info(f"💾 Safety save: {len(new_rows)} rows")
-                new_rows = []
+        new_rows.extend(rows)
+        successful_games += 1
+        scraped_ids.add(gid)
         
-        except Exception as e:
-            failed_games += 1
-            if failed_games <= 10:
-                logger.warning(f"⚠️ Error on game {gid}: {e}")
-            continue
+        # Show some successful games so you know it's working
+        if successful_games <= 5 or successful_games % 50 == 0:
+            logger.info(f"   ✅ Game {successful_games}: {rows[0]['Team']} vs {rows[0]['Opponent']}")
         
-        time.sleep(REQUEST_DELAY)
+        # Safety save every 100 games
+        if len(new_rows) >= 200:
+            append_box_scores(new_rows, OUTPUT_FILE)
+            logger.info(f"💾 Safety save: {len(new_rows)} rows")
+            new_rows = []
+    
+    elapsed = time.time() - start_time
     
     # Final save
     if new_rows:
-        df = pd.DataFrame(new_rows)
-        mode = 'a' if os.path.exists(OUTPUT_FILE) else 'w'
-        header = not os.path.exists(OUTPUT_FILE)
-        df.to_csv(OUTPUT_FILE, mode=mode, header=header, index=False)
+        append_box_scores(new_rows, OUTPUT_FILE)
         logger.info(f"💾 Final save: {len(new_rows)} rows")
     
+    if 'high_water_mark' in scan:
+        retry_ids = update_failed_games(game_failures, failed_ids, scraped_ids)
+        hwm = settled_high_water_mark(scan, retry_ids)
+        save_scan_state(hwm, game_failures)
+        logger.info(f"📌 Scoreboard high-water mark: {hwm}")
+    
     # Summary
     logger.info("\n" + "="*70)
     logger.info("🏁 SCRAPING COMPLETE")
@@ -401,11 +502,25 @@ def main():
     logger.info(f"✅ Successful games: {successful_games}")
     logger.info(f"❌ Failed games: {failed_games}")
     logger.info(f"📊 Success rate: {(successful_games/(successful_games+failed_games)*100):.1f}%")
+    logger.info(f"⏱️  Throughput: {len(games_to_scrape) / max(elapsed, 1e-9):.1f} games/sec ({elapsed:.1f}s)")
     logger.info(f"📁 Output file: {OUTPUT_FILE}")
+    logger.info(f"🗄️  {http_cache.summary()}")
     logger.info("="*70 + "\n")
 
 if __name__ == "__main__":
     # Uncomment this to test a specific game:
     # test_single_game("401729314")  # Replace with actual game ID
     
-    main()
+    parser = argparse.ArgumentParser(description="ESPN Box Score Scraper")
+    parser.add_argument('--discovery', choices=['scoreboard', 'schedule'], default='scoreboard',
+                        help='How to find completed games (default: date scoreboards)')
+    parser.add_argument('--rescan', action='store_true',
+                        help='Scan scoreboards from season start, ignoring the high-water mark '
+                             'and retrying given-up games')
+    parser.add_argument('--workers', type=int, default=MAX_WORKERS,
+                        help=f'Parallel summary fetches (1 = serial; default {MAX_WORKERS})')
+    parser.add_argument('--window', type=int, default=IN_FLIGHT_WINDOW,
+                        help=f'Max requests in flight / awaiting parse (default {IN_FLIGHT_WINDOW})')
+    args = parser.parse_args()
+    
+    main(discovery=args.discovery, rescan=args.rescan, workers=args.workers, window=args.window)
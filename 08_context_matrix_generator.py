@@ -7,12 +7,15 @@ PURPOSE:
   - Generates Context Files WITHOUT relying on external APIs.
   - Uses your 'Master Box Scores' to calculate internal strength ratings.
   - Solves the 'Name Mismatch' error by keeping everything internal.
+  - Teams and opponents are joined on integer ESPN TeamIDs (team_registry.py).
 """
 
 import pandas as pd
 import numpy as np
 import os
 
+from team_registry import team_ids
+
 # CONFIGURATION
 BOX_SCORE_FILE = "master_box_scores_2026.csv"
 OUTPUT_HOME = "team_home_performance_by_quadrant_2026.csv"
@@ -37,7 +40,7 @@ def calculate_internal_ranks(df):
     df['ForensicScore'] = (df['eFG%'] * 2.0) - (df['TO%'] * 1.5) + (df['OR%'] * 0.5) + (df['FTR'] * 0.3)
     
     # Group by Team to get average strength
-    team_strength = df.groupby('Team')['ForensicScore'].mean().sort_values(ascending=False)
+    team_strength = df.groupby('TeamKey')['ForensicScore'].mean().sort_values(ascending=False)
     
     # Rank them 1 to 363
     rank_map = team_strength.rank(ascending=False, method='min').to_dict()
@@ -63,9 +66,14 @@ def get_quadrant(rank, location):
         if rank <= 240: return 'Q3'
         return 'Q4'
 
-def build_matrices():
-    df = load_data()
-    if df is None: return
+def build_context_matrices(box_df):
+    """
+    In-process entry point: master box scores in, (home, road) quadrant
+    profiles out. The input frame is not modified.
+    """
+    df = box_df.copy()
+    df['TeamKey'] = team_ids(df, 'Team', 'TeamID')
+    df['OppKey'] = team_ids(df, 'Opponent', 'OpponentID')
 
     # 1. Get Ranks (Internally)
     rank_map = calculate_internal_ranks(df)
@@ -77,10 +85,10 @@ def build_matrices():
     
     for idx, row in df.iterrows():
         team = row['Team']
-        opp = row['Opponent']
+        opp = row['OppKey']
         loc = row['Location']
         
-        # Get Opponent Rank (Using internal map, so names MATCH PERFECTLY)
+        # Get Opponent Rank (internal map keyed by TeamID)
         opp_rank = rank_map.get(opp, 363) # Default to 363 if new team
         
         # Determine Quadrant
@@ -127,8 +135,15 @@ def build_matrices():
         r_row['AdjNetEff'] = round(np.mean(all_r), 2) if all_r else 0
         road_rows.append(r_row)
 
-    pd.DataFrame(home_rows).to_csv(OUTPUT_HOME, index=False)
-    pd.DataFrame(road_rows).to_csv(OUTPUT_ROAD, index=False)
+    return pd.DataFrame(home_rows), pd.DataFrame(road_rows)
+
+def build_matrices():
+    df = load_data()
+    if df is None: return
+
+    home_df, road_df = build_context_matrices(df)
+    home_df.to_csv(OUTPUT_HOME, index=False)
+    road_df.to_csv(OUTPUT_ROAD, index=False)
     
     print(f"\n✅ SUCCESS!")
     print(f"   📂 Generated: {OUTPUT_HOME}")
@@ -9,6 +9,8 @@ PURPOSE:
   - Uses Bayesian Shrinkage to fix small sample sizes.
 """
 
+import os
+
 import pandas as pd
 import numpy as np
 
@@ -23,8 +25,9 @@ def load_and_prep_data():
         print(f"❌ Error: {INPUT_FILE} not found.")
         return None
         
-    df = pd.read_csv(INPUT_FILE)
-    
+    return pd.read_csv(INPUT_FILE)
+
+def add_forensic_score(df):
     # 1. Calculate Forensic Performance Score (Efficiency Proxy)
     # Formula: (eFG*2) - (TO*1.5) + (OR*0.5) + (FTR*0.3)
     # This correlates highly with Net Rating.
@@ -154,14 +157,12 @@ def classify_drivers(df):
     df['Primary_Driver'] = df[drivers].idxmax(axis=1).map(labels)
     return df
 
-def main():
-    import os
-    print("\n--- RUNNING PHASE 4: HCA DECOMPOSER ---")
-    
-    # Pipeline
-    df = load_and_prep_data()
-    if df is None: return
-    
+def decompose_hca(box_df):
+    """
+    In-process entry point: master box scores in, the contextual HCA table
+    out. The input frame is not modified.
+    """
+    df = add_forensic_score(box_df.copy())
     df = generate_internal_ranks(df)
     df_expanded = get_opponent_stats(df)
     final_df = calculate_hca_deltas(df_expanded)
@@ -171,7 +172,16 @@ def main():
     cols = ['Team', 'OpponentQuad', 'Overall_HCA', 'HCA_Adjusted', 'Primary_Driver', 
             'Home_GameID', 'Away_GameID', 'Delta_Comfort', 'Delta_Refs', 'Delta_Crowd']
     
-    output = final_df[cols].round(2)
+    return final_df[cols].round(2)
+
+def main():
+    print("\n--- RUNNING PHASE 4: HCA DECOMPOSER ---")
+    
+    # Pipeline
+    df = load_and_prep_data()
+    if df is None: return
+    
+    output = decompose_hca(df)
     output.to_csv(OUTPUT_FILE, index=False)
     
     print(f"\n✅ SUCCESS. Analysis saved to {OUTPUT_FILE}")
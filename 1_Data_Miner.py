@@ -1,15 +1,38 @@
 import requests
 import pandas as pd
-import numpy as np
 import time
 import os
+import json
+import argparse
 import threading
 from datetime import date, timedelta, datetime
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
+import http_cache
+from rate_limiter import AdaptiveRateLimiter, parse_retry_after
+from espn_summary import summary_url, extract_summary, append_box_scores
+
 # ==============================================================================
 #   THE BIBLE: ESPN SHOT CHART SCRAPER V2.3 (DOUBLE TURBO + GEO FIX)
 #   
+#   UPDATES:
+#   - All ESPN requests go through the persistent HTTP cache (http_cache.py);
+#     summaries of final games are never re-downloaded
+#   - Single-fetch extraction (espn_summary.py): each summary is downloaded
+#     once and yields both the shot rows and the four-factor box score rows
+#     (appended to master_box_scores_2026.csv)
+#   - Incremental mining: raw shots persist in raw_shots_2026.csv keyed by
+#     game_id; a run only downloads games not already in the store, and the
+#     team stats are recomputed from the full store
+#   - Games that failed to download (and scoreboard days that failed to load)
+#     are kept in shot_scan_state_2026.json; the next run scans from the oldest
+#     of them, giving up on a game after MAX_GAME_ATTEMPTS failed runs. Games
+#     that downloaded fine but have no shot chart keep their box score rows and
+#     are recorded there as settled, so they are not downloaded again
+#   - Adaptive shared rate limiter (rate_limiter.py): every worker thread goes
+#     through one AIMD limiter that honours Retry-After on 429/503 and backs
+#     off with jitter instead of each thread sleeping 1s and retrying in lockstep
+#
 #   UPDATES (2025-12-25):
 #   - FIXED: Coordinate geometry (Layups now correctly register near rim)
 #   - FIXED: Schedule building is now parallel (10x faster startup)
@@ -20,21 +43,33 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 OUTPUT_DIR = os.path.join(BASE_DIR)
 OUTPUT_PATH = os.path.join(OUTPUT_DIR, "cbb_style_2025_complete.csv")
+BOX_SCORE_PATH = os.path.join(BASE_DIR, "master_box_scores_2026.csv")
+RAW_SHOTS_PATH = os.path.join(BASE_DIR, "raw_shots_2026.csv")
+SCAN_STATE_PATH = os.path.join(BASE_DIR, "shot_scan_state_2026.json")
 LOG_PATH = os.path.join(BASE_DIR, f"scraper_log_{datetime.now().strftime('%Y%m%d')}.txt")
 
 # Date range - Auto-updates to current season-to-date
 SEASON_START = date(2025, 11, 2)  # Start of 2025-26 season
 TODAY = date.today()
 
+# Calendar days re-scanned before the newest stored game (late finals, postponements)
+RESCAN_DAYS = 3
+# Failed runs before a game (or scoreboard day) stops pulling the scan start back
+MAX_GAME_ATTEMPTS = 3
+
 # Threading Settings
 MAX_WORKERS = 10  # Number of simultaneous downloads
 
 # Lock for thread-safe printing/logging
 log_lock = threading.Lock()
 
-# Court coordinates (Adjusted for valid dunk take-off distances)
-RIM_DISTANCE = 5.5      
-THREE_POINT_LINE = 22.0   
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+THROTTLE_STATUSES = (429, 503)
+# One limiter for the whole process: threads above its concurrency limit wait
+LIMITER = AdaptiveRateLimiter(initial_rate=4.0, max_rate=20.0,
+                              initial_concurrency=4, max_concurrency=MAX_WORKERS)
 
 # ======================================================
 # 1. LOGGING & UTILS
@@ -55,96 +90,54 @@ def log_message(message, console=True):
 
 
 def get_espn_data(url, retries=3):
-    """Fetch data from ESPN API with retry logic."""
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    }
-    
-    for attempt in range(retries):
-        try:
-            response = requests.get(url, headers=headers, timeout=10)
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException:
-            if attempt < retries - 1:
-                time.sleep(1)
-            continue
-    
-    return None
-
-# ======================================================
-# 2. GEOMETRY & CLASSIFICATION (FIXED)
-# ======================================================
-
-def calculate_shot_distance(x, y):
     """
-    Calculate distance from shot to nearest basket.
-    
-    CORRECTED LOGIC (2025-12-25):
-    - Input 'x' is actually Width (0-50) -> Maps to our Y
-    - Input 'y' is actually Length (0-94) -> Maps to our X
-    - No 0.94 scaling needed (Data is in raw feet)
+    Fetch data from ESPN API (via the on-disk cache) with retry logic.
+    Network requests are admitted by the shared adaptive limiter; fresh
+    cache entries skip it entirely. Limited fetches bypass the cache's stale
+    fallback so a 429/503 reaches the limiter; the stale copy (if any) is only
+    served once every retry has failed.
     """
-    real_x = y  # Length dimension (The long way)
-    real_y = x  # Width dimension (The short way)
-
-    # Standard Hoop Locations (Center of rim)
-    # Left Hoop: 5.25 ft from baseline
-    # Right Hoop: 88.75 ft from baseline
-    hoop_left = (5.25, 25.0)
-    hoop_right = (88.75, 25.0)
-
-    # Calculate Euclidean distance to both hoops
-    dist_1 = np.sqrt((real_x - hoop_left[0])**2 + (real_y - hoop_left[1])**2)
-    dist_2 = np.sqrt((real_x - hoop_right[0])**2 + (real_y - hoop_right[1])**2)
-
-    return min(dist_1, dist_2)
-
-
-def classify_shot_zone(distance):
-    """Classify shot into rim, mid-range, or three-point."""
-    if distance < RIM_DISTANCE:
-        return 'rim'
-    elif distance < THREE_POINT_LINE:
-        return 'mid'
-    else:
-        return 'arc'
-
-
-def is_made_shot(play):
-    """Determine if a shot was made based on play data."""
-    if play.get('scoringPlay', False):
-        return True
-    
-    desc = play.get('text', '') or play.get('shortText', '') or ""
-    desc_lower = desc.lower()
-
-    # Made indicators
-    if any(word in desc_lower for word in ['made', 'makes', 'good']):
-        return True
-    
-    # Missed indicators
-    if any(word in desc_lower for word in ['missed', 'misses', 'no good']):
-        return False
+    cache = http_cache.get_cache()
     
-    # For dunks/layups without explicit made/missed
-    if any(word in desc_lower for word in ['dunk', 'layup', 'tip in', 'tip-in']):
-        return 'missed' not in desc_lower and 'misses' not in desc_lower
+    for attempt in range(retries):
+        if cache.is_fresh(url):
+            try:
+                return cache.get_json(url, headers=HEADERS, timeout=10)
+            except (requests.exceptions.RequestException, ValueError):
+                pass
+        
+        with LIMITER.slot():
+            start = time.monotonic()
+            try:
+                data = cache.get_json(url, headers=HEADERS, timeout=10, stale_fallback=False)
+                LIMITER.on_success(time.monotonic() - start)
+                return data
+            except requests.exceptions.HTTPError as e:
+                response = e.response
+                if response is not None and response.status_code in THROTTLE_STATUSES:
+                    LIMITER.on_throttle(parse_retry_after(response.headers.get('Retry-After')), attempt)
+                    continue  # the limiter's shared pause is the backoff
+                LIMITER.on_error()
+            except (requests.exceptions.RequestException, ValueError):
+                LIMITER.on_error()
+        
+        if attempt < retries - 1:
+            time.sleep(LIMITER.backoff_delay(attempt))
     
-    return False
+    return cache.cached_copy(url)
 
 # ======================================================
 # 3. CORE PARSING LOGIC (DOUBLE TURBO)
 # ======================================================
 
 def fetch_games_for_date(date_obj):
-    """Helper to fetch games for a single date (Thread-safe)."""
+    """Helper to fetch games for a single date (Thread-safe). None if the scoreboard failed."""
     date_str = date_obj.strftime("%Y%m%d")
     url = f"https://site.api.espn.com/apis/site/v2/sports/basketball/mens-college-basketball/scoreboard?dates={date_str}&limit=1000&groups=50"
     
     scoreboard = get_espn_data(url)
     if not scoreboard:
-        return []
+        return None
 
     daily_games = []
     for event in scoreboard.get('events', []):
@@ -168,67 +161,123 @@ def fetch_games_for_date(date_obj):
 
 
 def process_single_game(game_meta):
-    """Worker function to process one game."""
+    """
+    Worker function to process one game.
+    One summary download -> {'shots': [...], 'box': [...]}, or None when the
+    summary could not be downloaded.
+    """
     game_id, date_str, home_data, away_data = game_meta
     
-    url = f"https://site.web.api.espn.com/apis/site/v2/sports/basketball/mens-college-basketball/summary?region=us&lang=en&event={game_id}"
-    data = get_espn_data(url)
-    
-    if not data or 'plays' not in data:
-        return []
+    data = get_espn_data(summary_url(game_id))
+    if not data:
+        return None
     
-    shots = []
-    home_id = str(home_data['id'])
-    away_id = str(away_data['id'])
-    
-    for play in data['plays']:
-        desc = play.get('text', "")
-        is_scoring = play.get('scoringPlay', False)
-        shot_keywords = ['made', 'missed', 'dunk', 'layup', 'jumper', 'three', 'tip-in']
-        
-        if not (is_scoring or any(k in desc.lower() for k in shot_keywords)):
-            continue
-        
-        coords = play.get('coordinate', {})
-        x = coords.get('x')
-        y = coords.get('y')
-        
-        if x is None or y is None:
-            continue
-        
-        play_team_id = str(play.get('team', {}).get('id', ''))
-        
-        if play_team_id == home_id:
-            shooting_team = home_data['name']
-            defending_team = away_data['name']
-        elif play_team_id == away_id:
-            shooting_team = away_data['name']
-            defending_team = home_data['name']
-        else:
-            continue
-        
-        distance = calculate_shot_distance(x, y)
-        
-        shots.append({
-            'game_id': game_id,
-            'date': date_str,
-            'shooting_team': shooting_team,
-            'defending_team': defending_team,
-            'x': x,
-            'y': y,
-            'distance': round(distance, 1),
-            'zone': classify_shot_zone(distance),
-            'made': is_made_shot(play),
-            'description': desc
-        })
-    
-    return shots
-
-
-def scrape_season_games(start_date=SEASON_START, end_date=TODAY):
+    meta = {'date': date_str, 'home': home_data, 'away': away_data}
+    return extract_summary(game_id, data, meta, sections=['shots', 'box'])
+
+
+# ======================================================
+# 4. RAW SHOT STORE (INCREMENTAL)
+# ======================================================
+
+SHOT_STORE_DTYPES = {'game_id': str, 'date': str}
+
+
+def load_shot_store(path=RAW_SHOTS_PATH):
+    """Loads every raw shot mined so far (empty DataFrame if none)."""
+    if not os.path.exists(path):
+        return pd.DataFrame()
+    return pd.read_csv(path, dtype=SHOT_STORE_DTYPES)
+
+
+def append_to_shot_store(new_shots, path=RAW_SHOTS_PATH):
+    """Appends newly mined raw shots to the store."""
+    if new_shots is None or new_shots.empty:
+        return
+    header = not os.path.exists(path)
+    new_shots.to_csv(path, mode='a', header=header, index=False)
+    log_message(f"🗃️  Shot store: +{len(new_shots):,} shots -> {path}")
+
+
+def load_scan_state(path=SCAN_STATE_PATH):
+    """
+    {'games': {game_id: {'date', 'attempts'}}, 'days': {date_str: attempts}}
+    of unsettled work, plus 'shotless': {game_id: date_str} of games that
+    downloaded fine but have no shot chart (never in the shot store).
+    """
+    state = {'games': {}, 'days': {}, 'shotless': {}}
+    if os.path.exists(path):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                saved = json.load(f)
+            state['games'] = dict(saved.get('games', {}))
+            state['days'] = dict(saved.get('days', {}))
+            state['shotless'] = dict(saved.get('shotless', {}))
+        except Exception as e:
+            log_message(f"⚠️ Could not read {path}: {e}")
+    return state
+
+
+def save_scan_state(state, path=SCAN_STATE_PATH):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(dict(state, updated=datetime.now().isoformat(timespec='seconds')), f, indent=2)
+
+
+def settled_games(state):
+    """Games outside the shot store that must not be downloaded again: given up or shotless."""
+    given_up = {gid for gid, entry in state['games'].items() if entry['attempts'] >= MAX_GAME_ATTEMPTS}
+    return given_up | set(state['shotless'])
+
+
+def update_scan_state(state, failed, shotless):
+    """
+    Folds one run's failures into the state: failed games / days gain an
+    attempt, and this run's shotless games join the settled ones. Every
+    retryable entry fell inside this run's scan window, so anything that did
+    not fail again is now in the store (settled).
+    """
+    games, days = {}, {}
+    for gid, entry in state['games'].items():
+        if entry['attempts'] >= MAX_GAME_ATTEMPTS:
+            games[gid] = entry  # given up: kept so it is not downloaded again
+    for gid, date_str in failed['games'].items():
+        attempts = state['games'].get(gid, {}).get('attempts', 0) + 1
+        games[gid] = {'date': date_str, 'attempts': attempts}
+        if attempts == MAX_GAME_ATTEMPTS:
+            log_message(f"🚫 Giving up on game {gid} ({date_str}) after {attempts} failed runs (--full retries it)")
+    for date_str in failed['days']:
+        days[date_str] = min(state['days'].get(date_str, 0) + 1, MAX_GAME_ATTEMPTS)
+    return {'games': games, 'days': days, 'shotless': dict(state['shotless'], **shotless)}
+
+
+def incremental_scan_start(store, state=None, lookback_days=RESCAN_DAYS):
+    """
+    First calendar day worth scanning: a few days before the newest stored
+    game, or earlier if a game or scoreboard day from before that is still
+    waiting for a retry.
+    """
+    if store.empty:
+        return SEASON_START
+    newest = datetime.strptime(store['date'].max(), "%Y%m%d").date()
+    start = newest - timedelta(days=lookback_days)
+    if state:
+        pending = [entry['date'] for entry in state['games'].values() if entry['attempts'] < MAX_GAME_ATTEMPTS]
+        pending += [d for d, attempts in state['days'].items() if attempts < MAX_GAME_ATTEMPTS]
+        if pending:
+            start = min(start, datetime.strptime(min(pending), "%Y%m%d").date())
+    return max(SEASON_START, start)
+
+
+def scrape_season_games(start_date=SEASON_START, end_date=TODAY, known_ids=None):
     """
     DOUBLE TURBO: Parallelizes both Schedule Building AND Game Downloading.
+    Games in `known_ids` (already in the shot store, or settled) are not
+    downloaded again. Returns (new shots, box score rows, failures, shotless)
+    where failures is {'games': {game_id: date_str}, 'days': [date_str]} and
+    shotless is {game_id: date_str} of downloaded games without a shot chart,
+    both for update_scan_state().
     """
+    known_ids = set(known_ids or ())
     log_message("\n" + "="*60)
     log_message("🚀 ESPN SCRAPER V2.3 (DOUBLE TURBO)")
     log_message("="*60)
@@ -240,7 +289,9 @@ def scrape_season_games(start_date=SEASON_START, end_date=TODAY):
     date_list = [start_date + timedelta(days=x) for x in range(total_days)]
     
     game_queue = []
-    processed_ids = set()
+    processed_ids = set(known_ids)
+    failed = {'games': {}, 'days': []}
+    shotless = {}
     
     # fast scan of the calendar
     log_message(f"   ⚡ Scanning {total_days} days of calendars in parallel...")
@@ -251,20 +302,28 @@ def scrape_season_games(start_date=SEASON_START, end_date=TODAY):
         
         for future in as_completed(future_to_date):
             day_games = future.result()
+            if day_games is None:
+                failed['days'].append(future_to_date[future].strftime("%Y%m%d"))
+                continue
             for game in day_games:
                 gid = game[0]
                 if gid not in processed_ids:
                     game_queue.append(game)
                     processed_ids.add(gid)
 
-    log_message(f"✅ Schedule built: Found {len(game_queue)} completed games")
+    log_message(f"✅ Schedule built: Found {len(game_queue)} new completed games "
+                f"({len(known_ids)} already stored)")
+    if failed['days']:
+        log_message(f"⚠️  {len(failed['days'])} scoreboard day(s) could not be read: "
+                    f"{', '.join(sorted(failed['days']))}")
     
     if not game_queue:
-        log_message("⚠️  No games found in date range!")
-        return pd.DataFrame()
+        log_message("⚠️  No new games found in date range!")
+        return pd.DataFrame(), [], failed, shotless
     
-    # --- PHASE 2: DOWNLOAD SHOTS (PARALLEL) ---
+    # --- PHASE 2: DOWNLOAD SHOTS + BOX SCORES (PARALLEL) ---
     all_shots = []
+    box_rows = []
     completed = 0
     total = len(game_queue)
     
@@ -274,24 +333,38 @@ def scrape_season_games(start_date=SEASON_START, end_date=TODAY):
         future_to_game = {executor.submit(process_single_game, game): game for game in game_queue}
         
         for future in as_completed(future_to_game):
+            gid, date_str = future_to_game[future][:2]
             try:
                 result = future.result()
-                if result:
-                    all_shots.extend(result)
-                
-                completed += 1
-                if completed % 100 == 0:
-                    log_message(f"   ✓ {completed}/{total} games processed... ({len(all_shots):,} shots)")
-            
             except Exception as e:
+                log_message(f"⚠️ Game {gid}: {e}", console=False)
+                result = None
+            if result is None:
+                # Download failed -> retried next run (see update_scan_state)
+                failed['games'][gid] = date_str
                 continue
+            all_shots.extend(result['shots'])
+            box_rows.extend(result['box'])
+            if not result['shots']:
+                # No shot chart: box rows kept, game settled (never in the shot store)
+                shotless[gid] = date_str
+            
+            completed += 1
+            if completed % 100 == 0:
+                log_message(f"   ✓ {completed}/{total} games processed... ({len(all_shots):,} shots)")
     
     log_message(f"\n✅ Scraping complete: {len(all_shots):,} shots")
-    return pd.DataFrame(all_shots) if all_shots else pd.DataFrame()
+    if shotless:
+        log_message(f"ℹ️  {len(shotless)} game(s) have no shot chart (box scores kept, not downloaded again)")
+    if failed['games']:
+        log_message(f"⚠️  {len(failed['games'])} game(s) failed to download and will be retried next run")
+    log_message(f"🗄️  {http_cache.summary()}")
+    log_message(f"🚦 {LIMITER.summary()}")
+    return (pd.DataFrame(all_shots) if all_shots else pd.DataFrame()), box_rows, failed, shotless
 
 
 # ======================================================
-# 4. DATA CLEANING & STATISTICS
+# 5. DATA CLEANING & STATISTICS
 # ======================================================
 
 def clean_shot_data(df):
@@ -322,22 +395,22 @@ def calculate_team_stats(df):
     
     if df.empty: return None
     
-    # Helper columns
-    df['is_rim'] = df['zone'] == 'rim'
-    df['is_mid'] = df['zone'] == 'mid'
-    df['is_arc'] = df['zone'] == 'arc'
+    # Helper columns (makes per zone precomputed so every aggregate is a plain sum)
     df['made_int'] = df['made'].astype(int)
+    for zone in ('rim', 'mid', 'arc'):
+        df[f'is_{zone}'] = (df['zone'] == zone).astype(int)
+        df[f'{zone}_made'] = df[f'is_{zone}'] * df['made_int']
     
     # --- OFFENSIVE STATS ---
     off_agg = df.groupby('shooting_team').agg(
         games=('game_id', 'nunique'),
         total_shots=('made', 'count'),
         rim_att=('is_rim', 'sum'),
-        rim_makes=('made_int', lambda x: x[df.loc[x.index, 'is_rim']].sum()),
+        rim_makes=('rim_made', 'sum'),
         mid_att=('is_mid', 'sum'),
-        mid_makes=('made_int', lambda x: x[df.loc[x.index, 'is_mid']].sum()),
+        mid_makes=('mid_made', 'sum'),
         arc_att=('is_arc', 'sum'),
-        arc_makes=('made_int', lambda x: x[df.loc[x.index, 'is_arc']].sum()),
+        arc_makes=('arc_made', 'sum'),
     ).reset_index()
     
     # Rates and Percentages
@@ -352,11 +425,11 @@ def calculate_team_stats(df):
     def_agg = df.groupby('defending_team').agg(
         opp_total_shots=('made', 'count'),
         opp_rim_att=('is_rim', 'sum'),
-        opp_rim_makes=('made_int', lambda x: x[df.loc[x.index, 'is_rim']].sum()),
+        opp_rim_makes=('rim_made', 'sum'),
         opp_mid_att=('is_mid', 'sum'),
-        opp_mid_makes=('made_int', lambda x: x[df.loc[x.index, 'is_mid']].sum()),
+        opp_mid_makes=('mid_made', 'sum'),
         opp_arc_att=('is_arc', 'sum'),
-        opp_arc_makes=('made_int', lambda x: x[df.loc[x.index, 'is_arc']].sum()),
+        opp_arc_makes=('arc_made', 'sum'),
     ).reset_index()
     
     # Opponent Rates and Percentages
@@ -381,6 +454,12 @@ def calculate_team_stats(df):
     return final
 
 
+def save_box_scores(box_rows):
+    """Appends box score rows for games not yet in the master box score file."""
+    written = append_box_scores(box_rows, BOX_SCORE_PATH, skip_existing=True)
+    log_message(f"📦 Box scores: {written} new rows -> {BOX_SCORE_PATH}")
+
+
 def save_data(df):
     """Save shot chart data to CSV with backup."""
     if df is None or df.empty:
@@ -406,16 +485,29 @@ def save_data(df):
 
 
 # ======================================================
-# 5. MAIN EXECUTION
+# 6. MAIN EXECUTION
 # ======================================================
 
-if __name__ == "__main__":
+def main(full_rescan=False):
     start_time = time.time()
     
-    # Step 1: Scrape games
-    raw_df = scrape_season_games()
+    # Step 1: Scrape only games missing from the shot store (shots + box scores from one pass)
+    store = pd.DataFrame() if full_rescan else load_shot_store()
+    state = {'games': {}, 'days': {}, 'shotless': {}} if full_rescan else load_scan_state()
+    known_ids = set(store['game_id']) if not store.empty else set()
+    scan_start = SEASON_START if full_rescan else incremental_scan_start(store, state)
+    
+    new_df, box_rows, failed, shotless = scrape_season_games(start_date=scan_start,
+                                                             known_ids=known_ids | settled_games(state))
+    save_box_scores(box_rows)
     
-    # Step 2: Process and save
+    if full_rescan and not new_df.empty and os.path.exists(RAW_SHOTS_PATH):
+        os.remove(RAW_SHOTS_PATH)
+    append_to_shot_store(new_df)
+    save_scan_state(update_scan_state(state, failed, shotless))
+    
+    # Step 2: Recompute team stats from the full store
+    raw_df = load_shot_store()
     if not raw_df.empty:
         clean_df = clean_shot_data(raw_df)
         stats_df = calculate_team_stats(clean_df)
@@ -431,3 +523,11 @@ if __name__ == "__main__":
             log_message("❌ Failed to calculate statistics")
     else:
         log_message("❌ No data collected")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="ESPN shot chart miner")
+    parser.add_argument('--full', action='store_true',
+                        help="Ignore the raw shot store (and given-up games) and re-mine the whole season")
+    args = parser.parse_args()
+    main(full_rescan=args.full)
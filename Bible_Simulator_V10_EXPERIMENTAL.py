@@ -1,14 +1,15 @@
-import requests
 import pandas as pd
 import numpy as np
 import os
 import sys
-from io import StringIO
 from datetime import datetime
 from scipy import stats
 from typing import Tuple, Dict, List, Optional
 import warnings
 
+import kenpom_client
+from team_names import KENPOM_TRANSLATION, to_kenpom, kenpom_series
+
 warnings.filterwarnings('ignore')
 
 # Define the base directory relative to this file
@@ -38,94 +39,10 @@ LOCATION_SCALING = 0.35
 CONFIDENCE_WEIGHTS = {'HIGH': 1.0, 'MEDIUM': 0.7, 'LOW': 0.3, 'INSUFFICIENT': 0.0}
 
 # ==============================================================================
-# MASTER TRANSLATION DICTIONARY (COMPLETE)
+# TEAM NAMES (KENPOM_TRANSLATION lives in team_names.py)
 # ==============================================================================
-KENPOM_TRANSLATION = {
-    # --- ACC ---
-    "Boston College Eagles": "Boston College", "California Golden Bears": "California",
-    "Clemson Tigers": "Clemson", "Duke Blue Devils": "Duke", "Florida State Seminoles": "Florida St.",
-    "Georgia Tech Yellow Jackets": "Georgia Tech", "Louisville Cardinals": "Louisville",
-    "Miami Hurricanes": "Miami FL", "NC State Wolfpack": "N.C. State",
-    "North Carolina Tar Heels": "North Carolina", "Notre Dame Fighting Irish": "Notre Dame",
-    "Pittsburgh Panthers": "Pittsburgh", "SMU Mustangs": "SMU", "Stanford Cardinal": "Stanford",
-    "Syracuse Orange": "Syracuse", "Virginia Cavaliers": "Virginia",
-    "Virginia Tech Hokies": "Virginia Tech", "Wake Forest Demon Deacons": "Wake Forest",
-
-    # --- BIG 12 ---
-    "Arizona Wildcats": "Arizona", "Arizona State Sun Devils": "Arizona St.",
-    "Baylor Bears": "Baylor", "BYU Cougars": "BYU", "UCF Golden Knights": "UCF",
-    "Cincinnati Bearcats": "Cincinnati", "Colorado Buffaloes": "Colorado",
-    "Houston Cougars": "Houston", "Iowa State Cyclones": "Iowa St.", "Kansas Jayhawks": "Kansas",
-    "Kansas State Wildcats": "Kansas St.", "Oklahoma State Cowboys": "Oklahoma St.",
-    "TCU Horned Frogs": "TCU", "Texas Tech Red Raiders": "Texas Tech", "Utah Utes": "Utah",
-    "West Virginia Mountaineers": "West Virginia",
-
-    # --- BIG EAST ---
-    "Butler Bulldogs": "Butler", "Connecticut Huskies": "Connecticut", "UConn Huskies": "Connecticut",
-    "Creighton Bluejays": "Creighton", "DePaul Blue Demons": "DePaul", "Georgetown Hoyas": "Georgetown",
-    "Marquette Golden Eagles": "Marquette", "Providence Friars": "Providence",
-    "Seton Hall Pirates": "Seton Hall", "St. John's Red Storm": "St. John's",
-    "Villanova Wildcats": "Villanova", "Xavier Musketeers": "Xavier",
-
-    # --- BIG TEN ---
-    "Illinois Fighting Illini": "Illinois", "Indiana Hoosiers": "Indiana", "Iowa Hawkeyes": "Iowa",
-    "Maryland Terrapins": "Maryland", "Michigan Wolverines": "Michigan",
-    "Michigan State Spartans": "Michigan St.", "Minnesota Golden Gophers": "Minnesota",
-    "Nebraska Cornhuskers": "Nebraska", "Northwestern Wildcats": "Northwestern",
-    "Ohio State Buckeyes": "Ohio St.", "Oregon Ducks": "Oregon", "Penn State Nittany Lions": "Penn St.",
-    "Purdue Boilermakers": "Purdue", "Rutgers Scarlet Knights": "Rutgers", "UCLA Bruins": "UCLA",
-    "USC Trojans": "USC", "Washington Huskies": "Washington", "Wisconsin Badgers": "Wisconsin",
-
-    # --- SEC ---
-    "Alabama Crimson Tide": "Alabama", "Arkansas Razorbacks": "Arkansas", "Auburn Tigers": "Auburn",
-    "Florida Gators": "Florida", "Georgia Bulldogs": "Georgia", "Kentucky Wildcats": "Kentucky",
-    "LSU Tigers": "LSU", "Mississippi Rebels": "Ole Miss", "Ole Miss Rebels": "Ole Miss",
-    "Mississippi State Bulldogs": "Mississippi St.", "Missouri Tigers": "Missouri",
-    "Oklahoma Sooners": "Oklahoma", "South Carolina Gamecocks": "South Carolina",
-    "Tennessee Volunteers": "Tennessee", "Texas Longhorns": "Texas", "Texas A&M Aggies": "Texas A&M",
-    "Vanderbilt Commodores": "Vanderbilt",
-
-    # --- MOUNTAIN WEST ---
-    "Air Force Falcons": "Air Force", "Boise State Broncos": "Boise St.", "Colorado State Rams": "Colorado St.",
-    "Fresno State Bulldogs": "Fresno St.", "Grand Canyon Antelopes": "Grand Canyon",
-    "Nevada Wolf Pack": "Nevada", "New Mexico Lobos": "New Mexico", "San Diego State Aztecs": "San Diego St.",
-    "San José State Spartans": "San Jose St.", "UNLV Runnin' Rebels": "UNLV",
-    "Utah State Aggies": "Utah St.", "Wyoming Cowboys": "Wyoming",
-
-    # --- WCC ---
-    "Gonzaga Bulldogs": "Gonzaga", "Loyola Marymount Lions": "LMU", "Oregon State Beavers": "Oregon St.",
-    "Pacific Tigers": "Pacific", "Pepperdine Waves": "Pepperdine", "Portland Pilots": "Portland",
-    "Saint Mary's Gaels": "Saint Mary's", "San Diego Toreros": "San Diego",
-    "San Francisco Dons": "San Francisco", "Santa Clara Broncos": "Santa Clara",
-    "Seattle U Redhawks": "Seattle", "Washington State Cougars": "Washington St.",
-
-    # --- GENERAL / MID-MAJORS ---
-    "Albany Great Danes": "Albany", "UAB Blazers": "UAB", "VCU Rams": "VCU",
-    "FAU Owls": "Florida Atlantic", "FIU Panthers": "FIU",
-    "Middle Tennessee Blue Raiders": "Middle Tennessee", "Louisiana Tech Bulldogs": "Louisiana Tech",
-    "Liberty Flames": "Liberty", "Dayton Flyers": "Dayton", "Saint Louis Billikens": "Saint Louis",
-    "Loyola Chicago Ramblers": "Loyola Chicago", "Memphis Tigers": "Memphis",
-    "South Florida Bulls": "South Florida", "Wichita State Shockers": "Wichita St.",
-    "College of Charleston Cougars": "Charleston", "UNC Wilmington Seahawks": "UNCW",
-    
-    # --- COMMON FIXES ---
-    "Miami (FL)": "Miami FL", "Miami (OH)": "Miami OH", "Saint Peter's": "Saint Peter's",
-    "St. Peter's": "Saint Peter's", "St. Mary's": "Saint Mary's", "Ole Miss": "Mississippi",
-    "Mississippi": "Mississippi", "UConn": "Connecticut", "Pitt": "Pittsburgh",
-    "Southern Miss": "Southern Miss", "UL Monroe": "ULM", "Louisiana-Monroe": "ULM",
-    "Louisiana Lafayette": "Louisiana", "Louisiana-Lafayette": "Louisiana", "UT Rio Grande Valley": "UTRGV",
-    "UTRGV Vaqueros": "UTRGV", "Texas A&M-Corpus Christi": "Texas A&M Corpus Chris",
-    "St. Thomas (MN)": "St. Thomas", "LIU": "Long Island", "Long Island University": "Long Island",
-    "Kansas City Roos": "Kansas City", "UMKC": "Kansas City", "Omaha": "Nebraska Omaha",
-    "Purdue Fort Wayne": "Purdue Fort Wayne", "IPFW": "Purdue Fort Wayne", "Green Bay": "Green Bay",
-    "Milwaukee": "Milwaukee", "Detroit Mercy": "Detroit Mercy", "IUPUI": "IU Indy", "IU Indianapolis": "IU Indy",
-    "Southwestern Christian": None, "Washington Adventist": None, "Southern Wesleyan": None,
-}
-
 def standardize_name(name):
-    if not isinstance(name, str): return str(name)
-    name = name.strip()
-    return KENPOM_TRANSLATION.get(name, name)
+    return to_kenpom(name)
 
 # --- PARAMETERS ---
 BASE_VARIANCE_TOTAL = 9.5
@@ -153,26 +70,19 @@ HIGH_CONFIDENCE_SPREAD = 4.0
 # ======================================================
 
 def get_kenpom_data(endpoint, year=2026):
-    url = f"https://kenpom.com/api.php?endpoint={endpoint}&y={year}"
-    headers = {"Authorization": f"Bearer {KP_API_KEY}", "User-Agent": "TheBibleModel/10.0-PROD"}
-    try:
-        response = requests.get(url, headers=headers, timeout=15)
-        response.raise_for_status()
-        if endpoint == "misc-stats": return pd.read_csv(StringIO(response.text))
-        return pd.DataFrame(response.json())
-    except Exception as e:
-        print(f"⚠️  API Error ({endpoint}): {e}"); return None
+    # Snapshot-cached (kenpom_client.py): no network inside the TTL, last good snapshot on failure
+    return kenpom_client.get_frames([endpoint], year=year, api_key=KP_API_KEY)[endpoint]
 
 def load_quadrant_data():
     if not os.path.exists(QUADRANT_DATA_PATH): return None
     df = pd.read_csv(QUADRANT_DATA_PATH)
-    df['Team'] = df['Team'].apply(standardize_name)
+    df['Team'] = kenpom_series(df['Team'])
     return df
 
 def load_efficiency_profiles():
     if not os.path.exists(ADJUSTED_EFF_PATH): return None
     df = pd.read_csv(ADJUSTED_EFF_PATH)
-    df['Team'] = df['Team'].apply(standardize_name)
+    df['Team'] = kenpom_series(df['Team'])
     return df
 
 def load_validated_location_data():
@@ -181,8 +91,8 @@ def load_validated_location_data():
             print("   ℹ️  Validated location data not found. Using standard HCA.")
             return None, None
         h_df = pd.read_csv(HOME_PERF_FILE); r_df = pd.read_csv(ROAD_PERF_FILE)
-        h_df['Team'] = h_df['Team'].apply(standardize_name)
-        r_df['Team'] = r_df['Team'].apply(standardize_name)
+        h_df['Team'] = kenpom_series(h_df['Team'])
+        r_df['Team'] = kenpom_series(r_df['Team'])
         print(f"   ✅ Validated location data: {len(h_df)} home, {len(r_df)} road profiles")
         return h_df, r_df
     except Exception as e:
@@ -190,14 +100,15 @@ def load_validated_location_data():
 
 def build_team_database():
     print("🏗️  Building Enhanced Team Database (V10)...")
-    ratings = get_kenpom_data("ratings")
-    factors = get_kenpom_data("four-factors")
+    # Both endpoints in one concurrent round-trip (or straight from the local snapshot)
+    kp = kenpom_client.get_frames(["ratings", "four-factors"], year=2026, api_key=KP_API_KEY)
+    ratings, factors = kp["ratings"], kp["four-factors"]
     if ratings is None or factors is None: return None, None, None, None, None, None
     
     if 'Rank' not in ratings.columns: ratings['Rank'] = ratings.index + 1
     ratings = ratings.rename(columns={'AdjO':'AdjOE', 'AdjD':'AdjDE', 'AdjT':'AdjTempo', 'SOS_AdjEM':'SOS'})
-    ratings['TeamName'] = ratings['TeamName'].apply(standardize_name)
-    factors['TeamName'] = factors['TeamName'].apply(standardize_name)
+    ratings['TeamName'] = kenpom_series(ratings['TeamName'])
+    factors['TeamName'] = kenpom_series(factors['TeamName'])
     
     stats = ratings[['TeamName', 'Rank', 'AdjEM', 'AdjOE', 'AdjDE', 'AdjTempo', 'Luck', 'SOS']].rename(columns={
         'AdjOE':'Off_Eff', 'AdjDE':'Def_Eff', 'AdjTempo':'Tempo'
@@ -206,7 +117,7 @@ def build_team_database():
     
     style = pd.DataFrame()
     if os.path.exists(STYLE_DB_PATH):
-        try: style = pd.read_csv(STYLE_DB_PATH); style['Team'] = style['Team'].apply(standardize_name)
+        try: style = pd.read_csv(STYLE_DB_PATH); style['Team'] = kenpom_series(style['Team'])
         except: pass
         
     quad = load_quadrant_data(); eff = load_efficiency_profiles()
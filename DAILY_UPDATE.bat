@@ -4,26 +4,20 @@ color 0A
 
 echo.
 echo ==============================================================================
-echo [1/4] Running V10 Data Pipeline (Steps 1-4)...
-echo       (Scraping Games, calculating Efficiency & SOS)
+echo [1/3] Running V10 Data Pipeline...
+echo       (Games, Efficiency & SOS in parallel with Box Scores & Shot Quality)
 echo ==============================================================================
 python 05_run_pipeline.py
 
 echo.
 echo ==============================================================================
-echo [2/4] Running ESPN Shot Quality Scraper...
-echo ==============================================================================
-python 1_Data_Miner.py
-
-echo.
-echo ==============================================================================
-echo [3/4] Bundling Files for The Lab...
+echo [2/3] Bundling Files for The Lab...
 echo ==============================================================================
 git add .
 
 echo.
 echo ==============================================================================
-echo [4/4] Deploying to Cloud...
+echo [3/3] Deploying to Cloud...
 echo ==============================================================================
 git commit -m "Daily V10 Update: %date% %time%"
 git push -u origin main
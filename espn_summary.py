@@ -0,0 +1,381 @@
+"""
+espn_summary.py
+===============
+THE BIBLE - Single-Pass ESPN Game Summary Extractor
+
+One ESPN `summary?event=` payload carries both the play-by-play (shot
+coordinates) and the team box score. Rather than downloading it once in the
+shot miner and again in the box score scraper, fetch it once and run every
+registered extractor over it:
+
+    data = http_cache.get_json(summary_url(game_id))
+    out = extract_summary(game_id, data)          # {'box': [...], 'shots': [...]}
+
+Extractors are plain functions `fn(game_id, data, meta) -> list[dict]`
+registered in EXTRACTORS; add a new section with register_extractor().
+A failing extractor is logged with the game id and section; set
+BIBLE_STRICT_EXTRACTORS=1 to let KeyError / TypeError etc. propagate instead
+(debug runs after an ESPN schema change).
+"""
+
+import logging
+import os
+
+import numpy as np
+import pandas as pd
+
+# ==============================================================================
+# CONFIGURATION
+# ==============================================================================
+STRICT_ENV = "BIBLE_STRICT_EXTRACTORS"
+# Extractor bugs rather than bad payloads: re-raised when STRICT_ENV is set
+PROGRAMMING_ERRORS = (KeyError, TypeError, AttributeError, IndexError, NameError)
+
+SUMMARY_URL = "http://site.api.espn.com/apis/site/v2/sports/basketball/mens-college-basketball/summary?event={game_id}"
+
+# Court coordinates (Adjusted for valid dunk take-off distances)
+RIM_DISTANCE = 5.5
+THREE_POINT_LINE = 22.0
+
+SHOT_KEYWORDS = ['made', 'missed', 'dunk', 'layup', 'jumper', 'three', 'tip-in']
+
+logger = logging.getLogger(__name__)
+
+
+def summary_url(game_id) -> str:
+    """Canonical summary URL, so every script shares one cache entry per game."""
+    return SUMMARY_URL.format(game_id=game_id)
+
+
+def game_meta_from_header(data: dict) -> dict:
+    """Date and home/away teams from the summary header (used when no scoreboard meta is given)."""
+    comp = data['header']['competitions'][0]
+    teams = {c['homeAway']: {'id': c['team']['id'], 'name': c['team']['displayName']}
+             for c in comp['competitors']}
+    return {
+        'date': comp['date'][:10].replace('-', ''),
+        'home': teams.get('home'),
+        'away': teams.get('away'),
+    }
+
+# ==============================================================================
+# BOX SCORE (FOUR FACTORS)
+# ==============================================================================
+
+def parse_stat_group(statistics):
+    """Parses the 'statistics' list from ESPN API (short or verbose labels)."""
+    stats = {}
+    for item in statistics:
+        label = item['name']
+        val = item['displayValue']
+
+        # --- Handle "Made-Att" format (e.g. "25-60") ---
+        if '-' in val:
+            parts = val.split('-')
+            try:
+                made = int(parts[0])
+                att = int(parts[1])
+
+                if label in ['fieldGoals', 'fieldGoalsMade', 'fieldGoalsMade-fieldGoalsAttempted']:
+                    stats['FGM'], stats['FGA'] = made, att
+                elif label in ['threePointFieldGoals', 'threePointFieldGoalsMade',
+                               'threePointFieldGoalsMade-threePointFieldGoalsAttempted']:
+                    stats['3PM'], stats['3PA'] = made, att
+                elif label in ['freeThrows', 'freeThrowsMade', 'freeThrowsMade-freeThrowsAttempted']:
+                    stats['FTM'], stats['FTA'] = made, att
+            except:
+                continue
+        else:
+            # --- Handle direct numbers ---
+            try:
+                num = int(val)
+                if label in ['totalRebounds', 'rebounds']: stats['REB'] = num
+                elif label in ['offensiveRebounds']: stats['OR'] = num
+                elif label in ['defensiveRebounds']: stats['DR'] = num
+                elif label in ['turnovers']: stats['TO'] = num
+                elif label in ['fouls']: stats['PF'] = num
+            except:
+                continue
+    return stats
+
+
+def calculate_four_factors(team_stats, opp_stats):
+    """Calculates eFG%, TO%, OR%, FTR."""
+    # Validation
+    if 'FGA' not in team_stats or team_stats['FGA'] == 0:
+        return None
+
+    fga = team_stats.get('FGA', 0)
+    or_val = team_stats.get('OR', 0)
+    to_val = team_stats.get('TO', 0)
+    fta = team_stats.get('FTA', 0)
+
+    poss = fga - or_val + to_val + (0.475 * fta)
+    if poss <= 0: poss = 1.0
+
+    fgm = team_stats.get('FGM', 0)
+    pm3 = team_stats.get('3PM', 0)
+    efg = (fgm + 0.5 * pm3) / fga
+
+    to_rate = to_val / poss
+
+    opp_dr = opp_stats.get('DR', 0)
+    or_chances = or_val + opp_dr
+    or_rate = or_val / or_chances if or_chances > 0 else 0.0
+
+    ft_rate = fta / fga
+
+    return {
+        'Possessions': round(poss, 1),
+        'eFG%': round(efg * 100, 1),
+        'TO%': round(to_rate * 100, 1),
+        'OR%': round(or_rate * 100, 1),
+        'FTR': round(ft_rate * 100, 1),
+        'Raw_OR': or_val,
+        'Raw_TO': to_val,
+        'Raw_FT': fta
+    }
+
+
+def build_game_rows(gid, data, meta=None):
+    """
+    Turns one summary payload into the two box score rows (one per team).
+    Returns None if the game has no usable box score.
+    """
+    if not data or 'boxscore' not in data or 'teams' not in data['boxscore']:
+        return None
+
+    # Parse teams
+    team1_info = data['boxscore']['teams'][0]
+    team2_info = data['boxscore']['teams'][1]
+
+    t1_name = team1_info['team']['displayName']
+    t2_name = team2_info['team']['displayName']
+    t1_id = int(team1_info['team']['id'])
+    t2_id = int(team2_info['team']['id'])
+
+    # Parse stats
+    t1_stats = parse_stat_group(team1_info['statistics'])
+    t2_stats = parse_stat_group(team2_info['statistics'])
+
+    if not t1_stats or not t2_stats:
+        return None
+
+    # Calculate four factors
+    t1_factors = calculate_four_factors(t1_stats, t2_stats)
+    t2_factors = calculate_four_factors(t2_stats, t1_stats)
+
+    if not t1_factors or not t2_factors:
+        return None
+
+    # Get game info
+    date_str = data['header']['competitions'][0]['date'][:10]
+    neutral_site = data['header']['competitions'][0]['neutralSite']
+
+    # Determine location
+    comps = data['header']['competitions'][0]['competitors']
+    home_id = next((c['id'] for c in comps if c['homeAway'] == 'home'), None)
+
+    t1_loc = "Home" if team1_info['team']['id'] == home_id else "Away"
+    t2_loc = "Away" if t1_loc == "Home" else "Home"
+
+    if neutral_site:
+        t1_loc = "Neutral"
+        t2_loc = "Neutral"
+
+    return [
+        {
+            'GameID': gid, 'Date': date_str,
+            'Team': t1_name, 'Opponent': t2_name,
+            'Location': t1_loc, **t1_factors,
+            'TeamID': t1_id, 'OpponentID': t2_id
+        },
+        {
+            'GameID': gid, 'Date': date_str,
+            'Team': t2_name, 'Opponent': t1_name,
+            'Location': t2_loc, **t2_factors,
+            'TeamID': t2_id, 'OpponentID': t1_id
+        },
+    ]
+
+
+def append_box_scores(rows, path, skip_existing=False):
+    """
+    Appends box score rows to the master CSV, aligned to the file's existing
+    header. If the rows carry columns the file lacks (Raw_*, TeamID/OpponentID
+    on older files), the file is rewritten once with the wider header. With
+    skip_existing, rows for GameIDs already in the file are dropped. Returns
+    the number of rows written.
+    """
+    if not rows:
+        return 0
+    df = pd.DataFrame(rows)
+    if not os.path.exists(path):
+        df.to_csv(path, mode='w', header=True, index=False)
+        return len(df)
+
+    existing_cols = pd.read_csv(path, nrows=0).columns.tolist()
+    if skip_existing:
+        existing_ids = set(pd.read_csv(path, usecols=['GameID'])['GameID'].astype(str))
+        df = df[~df['GameID'].astype(str).isin(existing_ids)]
+    new_cols = [c for c in df.columns if c not in existing_cols]
+    if new_cols:
+        widened = pd.concat([pd.read_csv(path), df], ignore_index=True)
+        for col in ('TeamID', 'OpponentID'):
+            if col in widened.columns:
+                widened[col] = widened[col].astype('Int64')
+        widened.reindex(columns=existing_cols + new_cols).to_csv(path, index=False)
+        return len(df)
+    df.reindex(columns=existing_cols).to_csv(path, mode='a', header=False, index=False)
+    return len(df)
+
+# ==============================================================================
+# SHOT CHART
+# ==============================================================================
+
+def calculate_shot_distance(x, y):
+    """
+    Calculate distance from shot to nearest basket.
+
+    CORRECTED LOGIC (2025-12-25):
+    - Input 'x' is actually Width (0-50) -> Maps to our Y
+    - Input 'y' is actually Length (0-94) -> Maps to our X
+    - No 0.94 scaling needed (Data is in raw feet)
+    """
+    real_x = y  # Length dimension (The long way)
+    real_y = x  # Width dimension (The short way)
+
+    # Standard Hoop Locations (Center of rim)
+    # Left Hoop: 5.25 ft from baseline
+    # Right Hoop: 88.75 ft from baseline
+    hoop_left = (5.25, 25.0)
+    hoop_right = (88.75, 25.0)
+
+    # Calculate Euclidean distance to both hoops
+    dist_1 = np.sqrt((real_x - hoop_left[0])**2 + (real_y - hoop_left[1])**2)
+    dist_2 = np.sqrt((real_x - hoop_right[0])**2 + (real_y - hoop_right[1])**2)
+
+    return min(dist_1, dist_2)
+
+
+def classify_shot_zone(distance):
+    """Classify shot into rim, mid-range, or three-point."""
+    if distance < RIM_DISTANCE:
+        return 'rim'
+    elif distance < THREE_POINT_LINE:
+        return 'mid'
+    else:
+        return 'arc'
+
+
+def is_made_shot(play):
+    """Determine if a shot was made based on play data."""
+    if play.get('scoringPlay', False):
+        return True
+
+    desc = play.get('text', '') or play.get('shortText', '') or ""
+    desc_lower = desc.lower()
+
+    # Made indicators
+    if any(word in desc_lower for word in ['made', 'makes', 'good']):
+        return True
+
+    # Missed indicators
+    if any(word in desc_lower for word in ['missed', 'misses', 'no good']):
+        return False
+
+    # For dunks/layups without explicit made/missed
+    if any(word in desc_lower for word in ['dunk', 'layup', 'tip in', 'tip-in']):
+        return 'missed' not in desc_lower and 'misses' not in desc_lower
+
+    return False
+
+
+def extract_shot_rows(game_id, data, meta=None):
+    """Every play with court coordinates, attributed to shooting/defending team."""
+    if not data or 'plays' not in data:
+        return []
+
+    meta = meta or game_meta_from_header(data)
+    date_str = meta['date']
+    home_data, away_data = meta['home'], meta['away']
+
+    shots = []
+    home_id = str(home_data['id'])
+    away_id = str(away_data['id'])
+
+    for play in data['plays']:
+        desc = play.get('text', "")
+        is_scoring = play.get('scoringPlay', False)
+
+        if not (is_scoring or any(k in desc.lower() for k in SHOT_KEYWORDS)):
+            continue
+
+        coords = play.get('coordinate', {})
+        x = coords.get('x')
+        y = coords.get('y')
+
+        if x is None or y is None:
+            continue
+
+        play_team_id = str(play.get('team', {}).get('id', ''))
+
+        if play_team_id == home_id:
+            shooting_team = home_data['name']
+            defending_team = away_data['name']
+        elif play_team_id == away_id:
+            shooting_team = away_data['name']
+            defending_team = home_data['name']
+        else:
+            continue
+
+        distance = calculate_shot_distance(x, y)
+
+        shots.append({
+            'game_id': game_id,
+            'date': date_str,
+            'shooting_team': shooting_team,
+            'defending_team': defending_team,
+            'x': x,
+            'y': y,
+            'distance': round(distance, 1),
+            'zone': classify_shot_zone(distance),
+            'made': is_made_shot(play),
+            'description': desc
+        })
+
+    return shots
+
+# ==============================================================================
+# EXTRACTOR REGISTRY
+# ==============================================================================
+
+EXTRACTORS = {
+    'box': lambda gid, data, meta: build_game_rows(gid, data, meta) or [],
+    'shots': extract_shot_rows,
+}
+
+
+def register_extractor(name, fn):
+    """Adds a section extractor: fn(game_id, data, meta) -> list of row dicts."""
+    EXTRACTORS[name] = fn
+
+
+def extract_summary(game_id, data, meta=None, sections=None):
+    """
+    Runs each requested extractor over one already-parsed summary payload.
+    Returns {section: rows}. A failing extractor is logged and yields [] for
+    its section without affecting the others (unless STRICT_ENV is set).
+    """
+    sections = list(EXTRACTORS) if sections is None else sections
+    strict = os.environ.get(STRICT_ENV, '').strip() not in ('', '0')
+    out = {}
+    for name in sections:
+        try:
+            out[name] = EXTRACTORS[name](game_id, data, meta)
+        except Exception as e:
+            if strict and isinstance(e, PROGRAMMING_ERRORS):
+                raise
+            logger.warning(f"⚠️ Game {game_id}: '{name}' extractor failed ({type(e).__name__}: {e})")
+            out[name] = []
+    return out
@@ -0,0 +1,255 @@
+"""
+fuzzy_match.py
+==============
+THE BIBLE - Indexed Fuzzy Name Matcher (drop-in for difflib.get_close_matches)
+
+difflib.get_close_matches scores the query against every candidate. This
+matcher returns the same matches (same scorer, same cutoff, same tie-break)
+while running SequenceMatcher on a handful of candidates:
+
+1. Character-trigram inverted index -> the candidates sharing the most
+   trigrams with the query are scored first. The true best match is almost
+   always among them, so the score to beat rises immediately.
+2. Character-count bound -> quick_ratio() (2 * shared characters / total
+   length) is an upper bound on ratio(). It is computed for every candidate
+   at once with numpy; candidates whose bound is below the cutoff, or below
+   the score to beat, are never scored. That keeps the result exact.
+3. Resolution cache -> resolved names are persisted to .fuzzy_match_cache.json,
+   keyed by a fingerprint of the candidate list, so the next run does no
+   matching at all until the KenPom name list changes.
+
+Every result carries a confidence (the SequenceMatcher ratio, 0-1), and the
+matcher keeps a report of low-confidence and unmatched names.
+
+Usage:
+    from fuzzy_match import FuzzyMatcher
+    matcher = FuzzyMatcher(kp_names)
+    name, score = matcher.best("Miami (FL)")          # (None, 0.0) if nothing passes the cutoff
+    matcher.get_close_matches("Miami (FL)", n=3)      # same list difflib would return
+    matcher.print_report(); matcher.save_cache()
+"""
+
+import hashlib
+import heapq
+import json
+import os
+import tempfile
+from collections import defaultdict
+from difflib import SequenceMatcher
+
+import numpy as np
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_FILE = os.path.join(BASE_DIR, ".fuzzy_match_cache.json")
+
+DEFAULT_CUTOFF = 0.6        # difflib.get_close_matches default
+NGRAM = 3
+SEED_CANDIDATES = 8         # top trigram-overlap candidates scored before bound pruning
+LOW_CONFIDENCE = 0.8        # fuzzy matches below this are listed in the report
+KEEP_FINGERPRINTS = 5       # candidate lists remembered in the cache file
+
+
+def _ngrams(text: str, n: int = NGRAM) -> set:
+    padded = f" {text.lower()} "
+    if len(padded) <= n:
+        return {padded}
+    return {padded[i:i + n] for i in range(len(padded) - n + 1)}
+
+
+def candidates_fingerprint(candidates, cutoff: float = DEFAULT_CUTOFF) -> str:
+    """Stable id for a candidate list + cutoff (cache namespace)."""
+    h = hashlib.sha1(f"{cutoff:.6f}".encode('utf-8'))
+    for name in sorted(set(candidates)):
+        h.update(b'\x00' + name.encode('utf-8'))
+    return h.hexdigest()[:16]
+
+
+class FuzzyMatcher:
+    """Trigram-indexed, bound-pruned equivalent of get_close_matches over a fixed candidate list."""
+
+    def __init__(self, candidates, cutoff: float = DEFAULT_CUTOFF, cache_path: str = CACHE_FILE):
+        if not 0.0 <= cutoff <= 1.0:
+            raise ValueError(f"cutoff must be in [0.0, 1.0]: {cutoff!r}")
+        # Order-preserving de-duplication; difflib would only repeat a name in n>1 results
+        self.names = list(dict.fromkeys(str(c) for c in candidates))
+        self.cutoff = cutoff
+        self.cache_path = cache_path
+        self.fingerprint = candidates_fingerprint(self.names, cutoff)
+        self._build_index()
+
+        self._cache = self._load_cache()
+        self._cache_dirty = False
+        self.results = {}  # query -> (name or None, score) resolved this run
+        self.stats = {'cache_hits': 0, 'scored': 0, 'queries': 0}
+
+    # ------------------------------------------------------------------
+    # Index
+    # ------------------------------------------------------------------
+    def _build_index(self):
+        postings = defaultdict(list)
+        for i, name in enumerate(self.names):
+            for gram in _ngrams(name):
+                postings[gram].append(i)
+        self._postings = {g: np.array(ids, dtype=np.int32) for g, ids in postings.items()}
+
+        alphabet = sorted({ch for name in self.names for ch in name})
+        self._char_pos = {ch: j for j, ch in enumerate(alphabet)}
+        counts = np.zeros((len(self.names), len(alphabet)), dtype=np.int16)
+        for i, name in enumerate(self.names):
+            for ch in name:
+                counts[i, self._char_pos[ch]] += 1
+        self._counts = counts
+        self._lengths = np.array([len(n) for n in self.names], dtype=np.int32)
+
+    def _upper_bounds(self, query: str) -> np.ndarray:
+        """quick_ratio() of the query against every candidate (upper bound of ratio())."""
+        q = np.zeros(len(self._char_pos), dtype=np.int16)
+        for ch in query:
+            j = self._char_pos.get(ch)
+            if j is not None:
+                q[j] += 1
+        shared = np.minimum(self._counts, q).sum(axis=1)
+        total = self._lengths + len(query)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            bounds = np.where(total > 0, 2.0 * shared / total, 1.0)
+        return bounds
+
+    def _trigram_seeds(self, query: str) -> np.ndarray:
+        overlap = np.zeros(len(self.names), dtype=np.int32)
+        for gram in _ngrams(query):
+            ids = self._postings.get(gram)
+            if ids is not None:
+                overlap[ids] += 1
+        if not overlap.any():
+            return np.empty(0, dtype=np.int64)
+        k = min(SEED_CANDIDATES, len(overlap))
+        top = np.argpartition(-overlap, k - 1)[:k]
+        return top[overlap[top] > 0]
+
+    # ------------------------------------------------------------------
+    # Matching
+    # ------------------------------------------------------------------
+    def get_close_matches(self, word: str, n: int = 3) -> list:
+        """Same result as difflib.get_close_matches(word, candidates, n, cutoff)."""
+        return [name for _, name in self._top(word, n)]
+
+    def _top(self, word: str, n: int) -> list:
+        if n <= 0:
+            raise ValueError(f"n must be > 0: {n!r}")
+        if not self.names:
+            return []
+
+        s = SequenceMatcher()
+        s.set_seq2(word)  # same orientation as difflib: candidate is seq1
+        bounds = self._upper_bounds(word)
+        scored = set()
+        heap = []  # n best (score, name) so far; heap[0] is the score to beat
+
+        def consider(i):
+            scored.add(i)
+            s.set_seq1(self.names[i])
+            score = s.ratio()
+            self.stats['scored'] += 1
+            if score >= self.cutoff:
+                item = (score, self.names[i])
+                if len(heap) < n:
+                    heapq.heappush(heap, item)
+                elif item > heap[0]:
+                    heapq.heapreplace(heap, item)
+
+        for i in self._trigram_seeds(word):
+            if bounds[i] >= self.cutoff:
+                consider(int(i))
+
+        for i in np.argsort(-bounds, kind='stable'):
+            bar = heap[0][0] if len(heap) == n else self.cutoff
+            if bounds[i] < bar:
+                break  # sorted: nothing further can reach the bar
+            if int(i) not in scored:
+                consider(int(i))
+
+        return heapq.nlargest(n, heap)
+
+    def best(self, word: str):
+        """(best candidate, confidence) or (None, 0.0). Uses and fills the resolution cache."""
+        word = str(word)
+        self.stats['queries'] += 1
+        cached = self._cache.get(word)
+        if cached is not None:
+            self.stats['cache_hits'] += 1
+            result = (cached[0], float(cached[1]))
+        else:
+            top = self._top(word, 1)
+            result = (top[0][1], round(top[0][0], 4)) if top else (None, 0.0)
+            self._cache[word] = list(result)
+            self._cache_dirty = True
+        self.results[word] = result
+        return result
+
+    def match_all(self, words) -> dict:
+        """{word: (best candidate or None, confidence)} for every distinct word."""
+        return {w: self.best(w) for w in dict.fromkeys(str(w) for w in words)}
+
+    # ------------------------------------------------------------------
+    # Reporting
+    # ------------------------------------------------------------------
+    def unmatched(self) -> list:
+        return sorted(w for w, (name, _) in self.results.items() if name is None)
+
+    def low_confidence(self, threshold: float = LOW_CONFIDENCE) -> list:
+        """[(word, match, score)] for matches below `threshold`, weakest first."""
+        rows = [(w, name, score) for w, (name, score) in self.results.items()
+                if name is not None and score < threshold]
+        return sorted(rows, key=lambda r: r[2])
+
+    def print_report(self, limit: int = 10):
+        s = self.stats
+        print(f"   🔎 Fuzzy matcher: {s['queries']} queries, {s['cache_hits']} from cache, "
+              f"{s['scored']} candidates scored (of {len(self.names)} names)")
+        weak = self.low_confidence()
+        if weak:
+            print(f"   ⚠️  Low-confidence matches ({len(weak)} below {LOW_CONFIDENCE:.0%}):")
+            for word, name, score in weak[:limit]:
+                print(f"      {score:.2f}  '{word}' ➡️ '{name}'")
+        missing = self.unmatched()
+        if missing:
+            print(f"   ❌ No match above cutoff {self.cutoff} ({len(missing)}): {', '.join(missing[:limit])}"
+                  + (" ..." if len(missing) > limit else ""))
+
+    # ------------------------------------------------------------------
+    # Resolution cache
+    # ------------------------------------------------------------------
+    def _read_cache_file(self) -> dict:
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return {}
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def _load_cache(self) -> dict:
+        entry = self._read_cache_file().get(self.fingerprint, {})
+        return dict(entry.get('resolved', {}))
+
+    def save_cache(self):
+        """Persists this run's resolutions (atomic; keeps the newest few candidate lists)."""
+        if not self.cache_path or not self._cache_dirty:
+            return
+        data = self._read_cache_file()
+        data[self.fingerprint] = {'candidates': len(self.names), 'cutoff': self.cutoff,
+                                  'order': max((v.get('order', 0) for v in data.values()), default=0) + 1,
+                                  'resolved': self._cache}
+        newest = sorted(data, key=lambda k: data[k].get('order', 0), reverse=True)[:KEEP_FINGERPRINTS]
+        data = {k: data[k] for k in newest}
+
+        directory = os.path.dirname(os.path.abspath(self.cache_path))
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=1, sort_keys=True)
+        os.replace(tmp, self.cache_path)
+        self._cache_dirty = False
@@ -0,0 +1,90 @@
+"""
+game_facts.py
+=============
+THE BIBLE - Per-Game Efficiency Fact Table
+
+Step 2 computes possessions and OffEff / DefEff / NetEff for every team-game.
+It writes them here once, so later steps load the numbers instead of
+re-deriving (or approximating) them:
+
+    team_game_efficiency_2026.csv
+    Date | Team | Opponent | TeamID | OpponentID | Location | Result | IsOT |
+    TeamScore | OpponentScore | Margin | Possessions | OffEff | DefEff | NetEff
+
+One row per team-game (each game appears twice, once from each side).
+TeamID / OpponentID are real ESPN IDs, or empty when the registry doesn't know
+the name. load_game_facts() adds the integer join keys TeamKey / OppKey the rest of
+the pipeline uses: the ESPN ID, or a registry pseudo-ID for that run.
+
+Usage:
+    from game_facts import load_game_facts
+    facts = load_game_facts()            # typed DataFrame, or None if Step 2 hasn't run
+    facts.groupby('TeamKey')['NetEff'].mean()
+"""
+
+import os
+
+import pandas as pd
+
+from team_registry import team_ids
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+FACT_FILE = "team_game_efficiency_2026.csv"
+
+SCHEMA = {
+    'Date': 'object',
+    'Team': 'object',
+    'Opponent': 'object',
+    'TeamID': 'Int64',
+    'OpponentID': 'Int64',
+    'Location': 'object',
+    'Result': 'object',
+    'IsOT': 'bool',
+    'TeamScore': 'int64',
+    'OpponentScore': 'int64',
+    'Margin': 'int64',
+    'Possessions': 'float64',
+    'OffEff': 'float64',
+    'DefEff': 'float64',
+    'NetEff': 'float64',
+}
+COLUMNS = list(SCHEMA)
+
+
+def to_facts(games: pd.DataFrame) -> pd.DataFrame:
+    """
+    Fact rows from Step 2's per-game frame (add_game_efficiency output).
+    IDs come from TeamKey / OppKey, with pseudo-IDs (negative) left empty.
+    """
+    facts = games.copy()
+    facts['TeamID'] = facts['TeamKey'].where(facts['TeamKey'] > 0)
+    facts['OpponentID'] = facts['OppKey'].where(facts['OppKey'] > 0)
+    if 'IsOT' not in facts.columns:
+        facts['IsOT'] = False
+    return facts[COLUMNS].astype(SCHEMA)
+
+
+def write_game_facts(facts: pd.DataFrame, path: str = FACT_FILE, append: bool = False):
+    """Full rewrite, or append (Step 2 incremental runs) when the file already exists."""
+    if append and os.path.exists(path):
+        facts[COLUMNS].to_csv(path, mode='a', header=False, index=False)
+    else:
+        facts[COLUMNS].to_csv(path, index=False)
+
+
+def load_game_facts(path: str = FACT_FILE, with_keys: bool = True):
+    """Typed fact table (plus TeamKey / OppKey), or None if the file is missing."""
+    if not os.path.exists(path):
+        return None
+    facts = pd.read_csv(path, dtype=SCHEMA)
+    return add_keys(facts) if with_keys else facts
+
+
+def add_keys(facts: pd.DataFrame) -> pd.DataFrame:
+    """Copy of a fact table with the TeamKey / OppKey join keys added."""
+    facts = facts.copy()
+    facts['TeamKey'] = team_ids(facts, 'Team', 'TeamID')
+    facts['OppKey'] = team_ids(facts, 'Opponent', 'OpponentID')
+    return facts
@@ -0,0 +1,259 @@
+"""
+http_cache.py
+=============
+THE BIBLE - Persistent HTTP Response Cache
+
+On-disk, content-addressed cache for the ESPN JSON endpoints.
+
+Layout (under .http_cache/):
+    index/<sha256(url)>.json      -> metadata (url, body hash, etag, fetched_at, immutable)
+    objects/<ab>/<sha256(body)>.gz -> gzipped response body (shared by identical payloads)
+
+Policy:
+- Game summaries whose game is in the 'post' state never change -> cached forever.
+- Everything else (team lists, schedules, scoreboards) is served from disk
+  within a TTL, then revalidated with If-None-Match / If-Modified-Since.
+  A 304 refreshes the entry without re-downloading the body.
+- If the network fails and a stale copy exists, the stale copy is served
+  (stale_fallback=False raises instead, so callers that pace themselves on
+  429/503 see the throttle; they can still fall back with cached_copy()).
+
+Usage:
+    import http_cache
+    data = http_cache.get_json(url, headers=HEADERS, timeout=10)
+    logger.info(http_cache.summary())
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+
+import requests
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+# Overridable so record/replay runs (response_archive.py) get a private cache
+CACHE_DIR = os.environ.get("BIBLE_HTTP_CACHE_DIR") or os.path.join(BASE_DIR, ".http_cache")
+
+DEFAULT_TTL = 15 * 60  # seconds
+
+# First matching substring wins
+TTL_RULES = [
+    ("/teams?", 24 * 3600),     # D1 team list - changes a few times a season
+    ("/schedule", 3600),        # Team schedules
+    ("/scoreboard", 10 * 60),   # Date scoreboards
+    ("/summary", 5 * 60),       # Summaries of games not yet final
+]
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _atomic_write(path: str, data: bytes):
+    """Write-then-rename so a crash never leaves a half-written entry."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except Exception:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def is_final_summary(url: str, data) -> bool:
+    """True for a game summary whose game is completed ('post' state)."""
+    if '/summary' not in url or not isinstance(data, dict):
+        return False
+    try:
+        status = data['header']['competitions'][0]['status']['type']
+    except (KeyError, IndexError, TypeError):
+        return False
+    return status.get('state') == 'post' or status.get('completed') is True
+
+
+class ResponseCache:
+    """Thread-safe persistent cache for JSON GET requests."""
+
+    def __init__(self, cache_dir: str = CACHE_DIR, ttl_rules=None,
+                 default_ttl: float = DEFAULT_TTL, immutable_check=is_final_summary):
+        self.cache_dir = cache_dir
+        self.ttl_rules = TTL_RULES if ttl_rules is None else ttl_rules
+        self.default_ttl = default_ttl
+        self.immutable_check = immutable_check
+        self.stats = {'hits': 0, 'misses': 0, 'revalidated': 0, 'stale': 0}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    # ------------------------------------------------------------------
+    # Storage
+    # ------------------------------------------------------------------
+    def _index_path(self, url: str) -> str:
+        return os.path.join(self.cache_dir, 'index', _sha256(url.encode('utf-8')) + '.json')
+
+    def _object_path(self, body_hash: str) -> str:
+        return os.path.join(self.cache_dir, 'objects', body_hash[:2], body_hash + '.gz')
+
+    def _load_entry(self, url: str):
+        path = self._index_path(url)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            if entry.get('url') != url or not os.path.exists(self._object_path(entry['body'])):
+                return None
+            return entry
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _load_body(self, entry: dict):
+        with gzip.open(self._object_path(entry['body']), 'rb') as f:
+            return json.loads(f.read())
+
+    def _store(self, url: str, response: requests.Response, data) -> dict:
+        body_hash = _sha256(response.content)
+        obj_path = self._object_path(body_hash)
+        if not os.path.exists(obj_path):
+            _atomic_write(obj_path, gzip.compress(response.content))
+        entry = {
+            'url': url,
+            'body': body_hash,
+            'fetched_at': time.time(),
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'immutable': bool(self.immutable_check(url, data)),
+        }
+        self._write_entry(url, entry)
+        return entry
+
+    def _write_entry(self, url: str, entry: dict):
+        _atomic_write(self._index_path(url), json.dumps(entry).encode('utf-8'))
+
+    # ------------------------------------------------------------------
+    # Policy
+    # ------------------------------------------------------------------
+    def ttl_for(self, url: str) -> float:
+        for pattern, ttl in self.ttl_rules:
+            if pattern in url:
+                return ttl
+        return self.default_ttl
+
+    def _count(self, key: str):
+        with self._lock:
+            self.stats[key] += 1
+        self._local.last_hit = key != 'misses'
+
+    def is_fresh(self, url: str, ttl: float = None) -> bool:
+        """True if get_json(url) would be answered from disk without a request."""
+        entry = self._load_entry(url)
+        if not entry:
+            return False
+        max_age = self.ttl_for(url) if ttl is None else ttl
+        return entry['immutable'] or time.time() - entry['fetched_at'] < max_age
+
+    def last_was_hit(self) -> bool:
+        """True if this thread's most recent get_json() avoided a download."""
+        return getattr(self._local, 'last_hit', False)
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    def cached_copy(self, url: str):
+        """The cached JSON for `url` whatever its age (counted as stale), or None."""
+        entry = self._load_entry(url)
+        if not entry:
+            return None
+        try:
+            data = self._load_body(entry)
+        except (OSError, ValueError):
+            return None
+        self._count('stale')
+        return data
+
+    def get_json(self, url: str, headers: dict = None, timeout: float = 10,
+                 session: requests.Session = None, ttl: float = None, stale_fallback: bool = True):
+        """
+        Returns the parsed JSON for `url`, from disk when possible.
+        Raises requests exceptions only when there is no cached copy to fall back on
+        (or always, with stale_fallback=False).
+        """
+        entry = self._load_entry(url)
+        max_age = self.ttl_for(url) if ttl is None else ttl
+
+        if entry and (entry['immutable'] or time.time() - entry['fetched_at'] < max_age):
+            try:
+                data = self._load_body(entry)
+                self._count('hits')
+                return data
+            except (OSError, ValueError):
+                entry = None
+
+        req_headers = dict(headers or {})
+        if entry:
+            if entry.get('etag'):
+                req_headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                req_headers['If-Modified-Since'] = entry['last_modified']
+
+        getter = session.get if session is not None else requests.get
+        try:
+            response = getter(url, headers=req_headers, timeout=timeout)
+            if response.status_code == 304 and entry:
+                entry['fetched_at'] = time.time()
+                self._write_entry(url, entry)
+                self._count('revalidated')
+                return self._load_body(entry)
+            response.raise_for_status()
+            data = response.json()
+        except (requests.RequestException, ValueError):
+            if entry and stale_fallback:
+                self._count('stale')
+                return self._load_body(entry)
+            raise
+
+        self._store(url, response, data)
+        self._count('misses')
+        return data
+
+    def hit_rate(self) -> float:
+        with self._lock:
+            served = self.stats['hits'] + self.stats['revalidated'] + self.stats['stale']
+            total = served + self.stats['misses']
+        return served / total if total else 0.0
+
+    def summary(self) -> str:
+        s = self.stats
+        return (f"HTTP cache: {s['hits']} hits, {s['revalidated']} revalidated, "
+                f"{s['stale']} stale, {s['misses']} misses ({self.hit_rate() * 100:.1f}% served from disk)")
+
+
+# Process-wide cache shared by every scraper function
+_default_cache = ResponseCache()
+
+
+def get_cache() -> ResponseCache:
+    return _default_cache
+
+
+def get_json(url: str, headers: dict = None, timeout: float = 10,
+             session: requests.Session = None, ttl: float = None, stale_fallback: bool = True):
+    return _default_cache.get_json(url, headers=headers, timeout=timeout, session=session, ttl=ttl,
+                                   stale_fallback=stale_fallback)
+
+
+def last_was_hit() -> bool:
+    return _default_cache.last_was_hit()
+
+
+def summary() -> str:
+    return _default_cache.summary()
@@ -0,0 +1,182 @@
+"""
+kenpom_client.py
+================
+THE BIBLE - Shared KenPom API Client with Local Snapshots
+
+The simulator, the app and the PhD location script all pull the same KenPom
+endpoints. This client:
+- fetches every requested endpoint concurrently (one round-trip of latency,
+  not one per endpoint),
+- writes the raw payloads to a timestamped snapshot under .kenpom_snapshots/,
+- serves the newest snapshot while it is younger than the TTL (no network on
+  a warm start),
+- falls back to the last good snapshot if the API is down or the key is bad.
+
+Callers pass their own API key; nothing is stored here.
+
+Usage:
+    import kenpom_client
+    frames = kenpom_client.get_frames(["ratings", "four-factors"], year=2026, api_key=KP_API_KEY)
+    ratings = frames["ratings"]          # DataFrame, or None if unavailable
+"""
+
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from io import StringIO
+
+import pandas as pd
+import requests
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+SNAPSHOT_DIR = os.path.join(BASE_DIR, ".kenpom_snapshots")
+KENPOM_URL = "https://kenpom.com/api.php?endpoint={endpoint}&y={year}"
+
+DEFAULT_TTL = 6 * 3600      # seconds - KenPom updates ratings once a day
+REQUEST_TIMEOUT = 15
+KEEP_SNAPSHOTS = 10         # older snapshot files are pruned
+
+# Endpoints that return CSV text instead of JSON
+CSV_ENDPOINTS = {"misc-stats"}
+
+# Process-wide counters (read by pipeline_telemetry.py)
+stats = {'snapshot_hits': 0, 'fetches': 0, 'fallbacks': 0}
+
+
+# ============================================================================
+# SNAPSHOT STORAGE
+# ============================================================================
+def _snapshot_files(year: int) -> list:
+    """Snapshot paths for `year`, newest first (timestamps sort lexically)."""
+    if not os.path.isdir(SNAPSHOT_DIR):
+        return []
+    prefix = f"kenpom_{year}_"
+    names = sorted((n for n in os.listdir(SNAPSHOT_DIR) if n.startswith(prefix) and n.endswith('.json')),
+                   reverse=True)
+    return [os.path.join(SNAPSHOT_DIR, n) for n in names]
+
+
+def load_snapshot(endpoints, year: int, max_age: float = None):
+    """
+    Newest snapshot holding every endpoint in `endpoints`, or None.
+    With max_age, snapshots older than that many seconds are ignored.
+    """
+    for path in _snapshot_files(year):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                snap = json.load(f)
+        except (OSError, ValueError):
+            continue
+        if max_age is not None and time.time() - snap.get('fetched_at', 0) > max_age:
+            return None  # newest-first: everything after this is older still
+        if all(ep in snap.get('endpoints', {}) for ep in endpoints):
+            return snap
+    return None
+
+
+def save_snapshot(payloads: dict, year: int) -> str:
+    """Writes a snapshot atomically and prunes old ones. Returns its path."""
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+    snap = {'fetched_at': time.time(), 'year': year, 'endpoints': payloads}
+    path = os.path.join(SNAPSHOT_DIR, f"kenpom_{year}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+
+    fd, tmp = tempfile.mkstemp(dir=SNAPSHOT_DIR, suffix='.tmp')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump(snap, f)
+    os.replace(tmp, path)
+
+    for old in _snapshot_files(year)[KEEP_SNAPSHOTS:]:
+        try:
+            os.remove(old)
+        except OSError:
+            pass
+    return path
+
+
+# ============================================================================
+# FETCHING
+# ============================================================================
+def fetch_endpoint(endpoint: str, year: int, api_key: str, timeout: float = REQUEST_TIMEOUT):
+    """Raw payload for one endpoint: parsed JSON, or CSV text for CSV endpoints."""
+    headers = {
+        "Authorization": f"Bearer {api_key}",
+        "Accept": "application/json",
+        "User-Agent": "TheBibleModel/10.0-PROD",
+    }
+    response = requests.get(KENPOM_URL.format(endpoint=endpoint, year=year), headers=headers, timeout=timeout)
+    response.raise_for_status()
+    return response.text if endpoint in CSV_ENDPOINTS else response.json()
+
+
+def get_payloads(endpoints, year: int, api_key: str, ttl: float = DEFAULT_TTL,
+                 force_refresh: bool = False) -> dict:
+    """
+    {endpoint: raw payload or None}. Served from a fresh snapshot when
+    possible; otherwise all endpoints are fetched in parallel. If any fetch
+    fails, the last good snapshot is used instead.
+    """
+    endpoints = list(endpoints)
+
+    if not force_refresh:
+        snap = load_snapshot(endpoints, year, max_age=ttl)
+        if snap:
+            age_min = (time.time() - snap['fetched_at']) / 60
+            print(f"   📸 KenPom snapshot ({age_min:.0f} min old): {', '.join(endpoints)}")
+            stats['snapshot_hits'] += 1
+            return {ep: snap['endpoints'][ep] for ep in endpoints}
+
+    def fetch(ep):
+        try:
+            return ep, fetch_endpoint(ep, year, api_key), None
+        except (requests.RequestException, ValueError) as e:
+            return ep, None, e
+
+    with ThreadPoolExecutor(max_workers=max(1, len(endpoints))) as executor:
+        results = list(executor.map(fetch, endpoints))
+    stats['fetches'] += 1
+
+    payloads = {ep: data for ep, data, _ in results}
+    errors = {ep: err for ep, _, err in results if err is not None}
+
+    if not errors:
+        save_snapshot(payloads, year)
+        print(f"   ☁️  KenPom API: fetched {', '.join(endpoints)} (snapshot saved)")
+        return payloads
+
+    for ep, err in errors.items():
+        print(f"⚠️  API Error ({ep}): {err}")
+
+    snap = load_snapshot(endpoints, year)
+    if snap:
+        stamp = datetime.fromtimestamp(snap['fetched_at']).strftime('%Y-%m-%d %H:%M')
+        print(f"   ↩️  Falling back to last good KenPom snapshot ({stamp})")
+        stats['fallbacks'] += 1
+        return {ep: snap['endpoints'][ep] for ep in endpoints}
+
+    return payloads
+
+
+def to_frame(endpoint: str, payload):
+    """Converts a raw payload to a DataFrame (None stays None)."""
+    if payload is None:
+        return None
+    try:
+        if endpoint in CSV_ENDPOINTS:
+            return pd.read_csv(StringIO(payload))
+        return pd.DataFrame(payload)
+    except (ValueError, TypeError) as e:
+        print(f"⚠️  Unexpected KenPom payload ({endpoint}): {e}")
+        return None
+
+
+def get_frames(endpoints, year: int, api_key: str, ttl: float = DEFAULT_TTL,
+               force_refresh: bool = False) -> dict:
+    """{endpoint: DataFrame or None} - the entry point most callers want."""
+    payloads = get_payloads(endpoints, year, api_key, ttl=ttl, force_refresh=force_refresh)
+    return {ep: to_frame(ep, payloads.get(ep)) for ep in endpoints}
@@ -10,9 +10,10 @@ PhD-Level Home/Road Quadrant Enhancement (API + Master Translation)
 
 import pandas as pd
 import numpy as np
-import requests
 import os
-import difflib
+
+import kenpom_client
+from fuzzy_match import FuzzyMatcher
 
 # ==============================================================================
 # CONFIGURATION
@@ -636,6 +637,7 @@ def create_smart_rank_map(box_names, kp_names, kp_ranks):
     
     # Track which KenPom teams are found
     found_kp_teams = set()
+    matcher = FuzzyMatcher(kp_names)
     
     for name in box_names:
         clean_name = str(name).strip()
@@ -659,9 +661,9 @@ def create_smart_rank_map(box_names, kp_names, kp_ranks):
 
         # 3. Fuzzy Match (Fallback)
         if not target_kp_name:
-            matches = difflib.get_close_matches(clean_name, kp_names, n=1, cutoff=0.6)
-            if matches:
-                target_kp_name = matches[0]
+            fuzzy_name, confidence = matcher.best(clean_name)
+            if fuzzy_name:
+                target_kp_name = fuzzy_name
                 match_type = "Fuzzy"
 
         # 4. Save Match
@@ -674,11 +676,13 @@ def create_smart_rank_map(box_names, kp_names, kp_ranks):
                 elif match_type == "Fuzzy": 
                     fuzzy_count += 1
                     if fuzzy_count <= 5:
-                        print(f"   ✨ Fuzzy Match: '{clean_name}' ➡️ '{target_kp_name}'")
+                        print(f"   ✨ Fuzzy Match: '{clean_name}' ➡️ '{target_kp_name}' ({confidence:.2f})")
     
     print(f"   ✅ Total Matched: {matched_count}")
     print(f"      - Dictionary Fixes: {dict_match_count}")
     print(f"      - Fuzzy Matches: {fuzzy_count}")
+    matcher.print_report()
+    matcher.save_cache()
     
     # Report Missing Teams
     all_kp_set = set(kp_names)
@@ -709,18 +713,10 @@ def generate_validated_home_road_data():
     # 2. Get Live KenPom Data
     print(f"   ☁️  Connecting to KenPom API (Year: {SEASON_YEAR})...")
     
-    url = f"https://kenpom.com/api.php?endpoint=ratings&y={SEASON_YEAR}"
-    headers = {
-        "Authorization": f"Bearer {KP_API_KEY}",
-        "Accept": "application/json"
-    }
-    
     try:
-        response = requests.get(url, headers=headers, timeout=15)
-        response.raise_for_status()
-        data = response.json()
-        
-        kp_df = pd.DataFrame(data)
+        kp_df = kenpom_client.get_frames(["ratings"], year=SEASON_YEAR, api_key=KP_API_KEY)["ratings"]
+        if kp_df is None:
+            raise RuntimeError("no ratings from API or local snapshot")
         
         if 'TeamName' not in kp_df.columns: kp_df.rename(columns={'Team': 'TeamName'}, inplace=True)
         kp_df['AdjEM'] = pd.to_numeric(kp_df['AdjEM'])
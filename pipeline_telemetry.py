@@ -0,0 +1,480 @@
+"""
+pipeline_telemetry.py
+=====================
+THE BIBLE - Per-Step Performance Telemetry
+
+One record per pipeline step run, appended to pipeline_telemetry.jsonl:
+
+    run_id | ts | step | script | mode | status | wall_s | cpu_s | rss_peak_mb |
+    rows_in | rows_out | http {requests, bytes, errors} | cache {...} |
+    (traced_peak_mb, top_allocations with --tracemalloc)
+
+- Subprocess steps run through this file's launcher (runpy, like
+  response_archive.py), which measures the whole process.
+- In-process steps (05 --in-process) are measured with StepProbe on their
+  worker thread: CPU is the thread's, while peak RSS, HTTP and tracemalloc
+  are process-wide (marked scope='process').
+- HTTP counts come from a counting wrapper on requests.Session.send (bytes =
+  decoded body); cache counters from http_cache and kenpom_client.
+- rows_in / rows_out are data lines of the step's declared CSVs.
+
+`compare` checks a run against the trailing median of the previous runs of
+each step and flags regressions (slower, more memory, more requests), with
+the row growth alongside so season-driven slowdowns show up early.
+
+Usage:
+    python 05_run_pipeline.py --telemetry                 # record every step
+    python 05_run_pipeline.py --telemetry --tracemalloc   # + top allocators
+    python pipeline_telemetry.py run 02_efficiency_processor.py   # one script
+    python pipeline_telemetry.py compare                  # latest run vs trailing median
+    python pipeline_telemetry.py show --last 20
+"""
+
+import argparse
+import json
+import os
+import runpy
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import traceback
+from datetime import datetime
+
+import requests
+
+import response_archive
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+HISTORY_FILE = os.path.join(BASE_DIR, "pipeline_telemetry.jsonl")
+
+TRACE_FRAMES = 1
+TOP_ALLOCATIONS = 10
+TRACE_EXCLUDE = [tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),   # module imports
+                 tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+                 tracemalloc.Filter(False, tracemalloc.__file__)]
+
+BASELINE_WINDOW = 7         # previous runs of a step forming the median
+MIN_BASELINE = 3            # fewer than this -> no verdict
+REGRESSION_RATIO = 1.25     # flagged when > 25% over the median...
+MIN_DELTA = {               # ...and by more than this absolute amount
+    'wall_s': 1.0,
+    'cpu_s': 1.0,
+    'rss_peak_mb': 50.0,
+    'http_requests': 50,
+}
+
+
+# ============================================================================
+# COUNTERS
+# ============================================================================
+_http = {'requests': 0, 'bytes': 0, 'errors': 0}
+_http_lock = threading.Lock()
+
+
+def install_http_counter():
+    """Wraps requests.Session.send (whatever is installed, e.g. the response archive) once."""
+    inner = requests.Session.send
+    if getattr(inner, '_telemetry', False):
+        return
+
+    def send(self, request, **kwargs):
+        try:
+            response = inner(self, request, **kwargs)
+        except Exception:
+            with _http_lock:
+                _http['requests'] += 1
+                _http['errors'] += 1
+            raise
+        if kwargs.get('stream'):
+            size = int(response.headers.get('Content-Length') or 0)
+        else:
+            size = len(response.content or b'')
+        with _http_lock:
+            _http['requests'] += 1
+            _http['bytes'] += size
+            _http['errors'] += int(response.status_code >= 400)
+        return response
+
+    send._telemetry = True
+    requests.Session.send = send
+
+
+def http_counters() -> dict:
+    with _http_lock:
+        return dict(_http)
+
+
+def cache_counters() -> dict:
+    """Counters of the caches this process has imported (absent = not used)."""
+    counters = {}
+    http_cache = sys.modules.get('http_cache')
+    if http_cache is not None:
+        counters['http_cache'] = dict(http_cache.get_cache().stats)
+    kenpom_client = sys.modules.get('kenpom_client')
+    if kenpom_client is not None and hasattr(kenpom_client, 'stats'):
+        counters['kenpom'] = dict(kenpom_client.stats)
+    return counters
+
+
+def _delta(after: dict, before: dict) -> dict:
+    return {k: v - before.get(k, 0) for k, v in after.items()}
+
+
+def cache_delta(after: dict, before: dict) -> dict:
+    out = {}
+    for name, counts in after.items():
+        d = _delta(counts, before.get(name, {}))
+        if name == 'http_cache':
+            served = d['hits'] + d['revalidated'] + d['stale']
+            total = served + d['misses']
+            d['hit_rate'] = round(served / total, 4) if total else None
+        elif name == 'kenpom':
+            total = d['snapshot_hits'] + d['fetches']
+            d['hit_rate'] = round(d['snapshot_hits'] / total, 4) if total else None
+        if any(v for k, v in d.items() if k != 'hit_rate'):
+            out[name] = d
+    return out
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB (None if unavailable)."""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return round(peak / (2**20 if sys.platform == 'darwin' else 2**10), 1)
+    except ImportError:
+        pass
+    try:  # Windows
+        import ctypes
+        from ctypes import wintypes
+
+        class Counters(ctypes.Structure):
+            _fields_ = [('cb', wintypes.DWORD), ('PageFaultCount', wintypes.DWORD),
+                        ('PeakWorkingSetSize', ctypes.c_size_t), ('WorkingSetSize', ctypes.c_size_t),
+                        ('QuotaPeakPagedPoolUsage', ctypes.c_size_t), ('QuotaPagedPoolUsage', ctypes.c_size_t),
+                        ('QuotaPeakNonPagedPoolUsage', ctypes.c_size_t), ('QuotaNonPagedPoolUsage', ctypes.c_size_t),
+                        ('PagefileUsage', ctypes.c_size_t), ('PeakPagefileUsage', ctypes.c_size_t)]
+
+        counters = Counters()
+        counters.cb = ctypes.sizeof(Counters)
+        handle = ctypes.windll.kernel32.GetCurrentProcess()
+        if ctypes.windll.psapi.GetProcessMemoryInfo(handle, ctypes.byref(counters), counters.cb):
+            return round(counters.PeakWorkingSetSize / 2**20, 1)
+    except Exception:
+        pass
+    return None
+
+
+def count_rows(path: str):
+    """Data lines of a CSV (header excluded), or None if the file is missing."""
+    try:
+        lines, last = 0, b'\n'
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                lines += chunk.count(b'\n')
+                last = chunk[-1:]
+    except OSError:
+        return None
+    if last != b'\n':
+        lines += 1
+    return max(lines - 1, 0)
+
+
+# ============================================================================
+# PROBE
+# ============================================================================
+_trace_users = 0
+_trace_lock = threading.Lock()
+
+
+class StepProbe:
+    """
+    Context manager measuring one step. thread_cpu=True counts the calling
+    thread's CPU only (in-process steps sharing the runner).
+    """
+
+    def __init__(self, trace: bool = False, thread_cpu: bool = False, top: int = TOP_ALLOCATIONS):
+        self.trace = trace
+        self.thread_cpu = thread_cpu
+        self.top = top
+        self.metrics = {}
+
+    def _cpu(self) -> float:
+        return time.thread_time() if self.thread_cpu else time.process_time()
+
+    def __enter__(self):
+        global _trace_users
+        install_http_counter()
+        if self.trace:
+            with _trace_lock:
+                if not tracemalloc.is_tracing():
+                    tracemalloc.start(TRACE_FRAMES)
+                _trace_users += 1
+        self._http0, self._cache0 = http_counters(), cache_counters()
+        self._wall0, self._cpu0 = time.perf_counter(), self._cpu()
+        return self
+
+    def __exit__(self, *exc):
+        global _trace_users
+        self.metrics = {
+            'wall_s': round(time.perf_counter() - self._wall0, 3),
+            'cpu_s': round(self._cpu() - self._cpu0, 3),
+            'rss_peak_mb': peak_rss_mb(),
+            'http': _delta(http_counters(), self._http0),
+            'cache': cache_delta(cache_counters(), self._cache0),
+        }
+        if self.thread_cpu:
+            self.metrics['scope'] = 'process'
+        if self.trace:
+            snapshot = tracemalloc.take_snapshot().filter_traces(TRACE_EXCLUDE)
+            self.metrics['traced_peak_mb'] = round(tracemalloc.get_traced_memory()[1] / 2**20, 1)
+            self.metrics['top_allocations'] = [
+                {'where': f"{os.path.basename(s.traceback[0].filename)}:{s.traceback[0].lineno}",
+                 'mb': round(s.size / 2**20, 2), 'count': s.count}
+                for s in snapshot.statistics('lineno')[:self.top]
+            ]
+            with _trace_lock:
+                _trace_users -= 1
+                if _trace_users == 0:
+                    tracemalloc.stop()
+        return False
+
+
+# ============================================================================
+# RUN RECORDER (used by 05_run_pipeline.py)
+# ============================================================================
+class RunRecorder:
+    """Collects the records of one pipeline run and appends them to the history."""
+
+    def __init__(self, trace: bool = False, history: str = HISTORY_FILE):
+        self.run_id = datetime.now().strftime('%Y%m%d-%H%M%S')
+        self.trace = trace
+        self.history = history
+        self.records = []
+        self._steps = {}
+        self._lock = threading.Lock()
+        self._dir = tempfile.mkdtemp(prefix='bible_telemetry_')
+
+    def launcher_args(self, step_id: str) -> list:
+        """Arguments placing this file's launcher in front of a step script."""
+        args = [os.path.join(BASE_DIR, "pipeline_telemetry.py"), "run",
+                "--out", os.path.join(self._dir, f"{step_id}.json")]
+        return args + (["--tracemalloc"] if self.trace else [])
+
+    def probe(self) -> StepProbe:
+        return StepProbe(trace=self.trace, thread_cpu=True)
+
+    def add(self, step: dict, ok: bool, mode: str, metrics: dict = None):
+        if metrics is None:  # subprocess: the launcher left them in a file
+            try:
+                with open(os.path.join(self._dir, f"{step['id']}.json"), 'r', encoding='utf-8') as f:
+                    metrics = json.load(f)
+            except (OSError, ValueError):
+                metrics = {}
+        record = {'run_id': self.run_id, 'ts': datetime.now().isoformat(timespec='seconds'),
+                  'step': step['id'], 'script': step['script'], 'mode': mode,
+                  'status': 'ok' if ok else 'failed'}
+        record.update(metrics)
+        with self._lock:
+            self.records.append(record)
+            self._steps[step['id']] = step
+
+    def save(self):
+        """Row counts (files are all on disk by now), history append, summary + regression check."""
+        for record in self.records:
+            step = self._steps[record['step']]
+            record['rows_in'] = {p: count_rows(p) for p in step['inputs'] if os.path.exists(p)}
+            record['rows_out'] = {p: count_rows(p) for p in step['outputs']}
+        append_history(self.records, self.history)
+        shutil.rmtree(self._dir, ignore_errors=True)
+        if self.records:
+            print_records(self.records, title=f"⏱️  STEP TELEMETRY (run {self.run_id})")
+            compare(load_history(self.history), run_id=self.run_id)
+            print(f"   (history: {self.history})")
+
+
+# ============================================================================
+# HISTORY
+# ============================================================================
+def append_history(records: list, path: str = HISTORY_FILE):
+    if not records:
+        return
+    with open(path, 'a', encoding='utf-8') as f:
+        for record in records:
+            f.write(json.dumps(record, sort_keys=True) + "\n")
+
+
+def load_history(path: str = HISTORY_FILE) -> list:
+    records = []
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    continue  # torn line from an interrupted run
+    except OSError:
+        pass
+    return records
+
+
+def _metric(record: dict, name: str):
+    if name == 'http_requests':
+        return (record.get('http') or {}).get('requests')
+    if name == 'rows_out':
+        rows = [n for n in (record.get('rows_out') or {}).values() if n is not None]
+        return sum(rows) if rows else None
+    return record.get(name)
+
+
+def _fmt(value, unit: str = '') -> str:
+    if value is None:
+        return '-'
+    if isinstance(value, float):
+        return f"{value:,.1f}{unit}" if abs(value) >= 10 else f"{value:.2f}{unit}"
+    return f"{value:,}{unit}"
+
+
+def print_records(records: list, title: str = "⏱️  STEP TELEMETRY"):
+    print(f"\n{'='*60}")
+    print(title)
+    print('='*60)
+    print(f"  {'Step':<20} {'Mode':<10} {'Status':<7} {'Wall':>8} {'CPU':>8} {'PeakRSS':>9} "
+          f"{'RowsOut':>9} {'HTTP':>7} {'HTTP MB':>7} {'Cache':>6}")
+    for r in records:
+        http = r.get('http') or {}
+        rates = [c.get('hit_rate') for c in (r.get('cache') or {}).values() if c.get('hit_rate') is not None]
+        cache = f"{min(rates):.0%}" if rates else '-'
+        print(f"  {r['step']:<20} {r.get('mode', '-'):<10} {r['status']:<7} "
+              f"{_fmt(r.get('wall_s'), 's'):>8} {_fmt(r.get('cpu_s'), 's'):>8} "
+              f"{_fmt(r.get('rss_peak_mb'), 'MB'):>9} {_fmt(_metric(r, 'rows_out')):>9} "
+              f"{_fmt(http.get('requests')):>7} {_fmt(round(http.get('bytes', 0) / 2**20, 1) if http else None):>7} "
+              f"{cache:>6}")
+        for alloc in (r.get('top_allocations') or [])[:3]:
+            print(f"      ↳ {alloc['mb']:>8.2f} MB  {alloc['where']}")
+
+
+def compare(history: list, run_id: str = None, window: int = BASELINE_WINDOW,
+            threshold: float = REGRESSION_RATIO) -> list:
+    """
+    Each step of `run_id` (default: the latest run) vs the median of the
+    step's previous `window` successful runs. Returns the regressions
+    [(step, metric, value, median)] and prints the comparison.
+    """
+    ok = [r for r in history if r.get('status') == 'ok']
+    if not ok:
+        print("No telemetry recorded yet.")
+        return []
+    run_id = run_id or ok[-1]['run_id']
+    current = [r for r in ok if r['run_id'] == run_id]
+
+    print(f"\n📈 Regression check: run {run_id} vs trailing median "
+          f"(last {window} runs, flag > {threshold - 1:.0%} over)")
+    regressions = []
+    for record in current:
+        # Same step, same mode: in-process and subprocess numbers aren't comparable
+        previous = [r for r in ok if r['step'] == record['step'] and r.get('mode') == record.get('mode')
+                    and r['run_id'] < run_id][-window:]
+        if len(previous) < MIN_BASELINE:
+            print(f"  {record['step']:<20} (baseline: {len(previous)} runs - need {MIN_BASELINE})")
+            continue
+        notes = []
+        for metric, min_delta in MIN_DELTA.items():
+            value = _metric(record, metric)
+            past = [v for v in (_metric(r, metric) for r in previous) if v is not None]
+            if value is None or not past:
+                continue
+            median = statistics.median(past)
+            if value > median * threshold and value - median > min_delta:
+                regressions.append((record['step'], metric, value, median))
+                notes.append(f"⚠️  {metric} {_fmt(value)} vs {_fmt(median)}")
+        rows, past_rows = _metric(record, 'rows_out'), [_metric(r, 'rows_out') for r in previous]
+        past_rows = [v for v in past_rows if v]
+        growth = f"rows {rows / statistics.median(past_rows) - 1:+.0%}" if rows and past_rows else "rows -"
+        verdict = "; ".join(notes) if notes else "✅ within range"
+        print(f"  {record['step']:<20} {verdict} ({growth})")
+    if regressions:
+        print(f"  ❌ {len(regressions)} regression(s)")
+    return regressions
+
+
+# ============================================================================
+# LAUNCHER
+# ============================================================================
+def run_script(script: str, script_args: list, out: str = None, step: str = None,
+               trace: bool = False, history: str = HISTORY_FILE) -> int:
+    """Runs a script under StepProbe. Metrics go to `out` (05) or a history record (standalone)."""
+    # Record/replay first, so the counter wraps the archive (replayed responses count too)
+    if os.environ.get(response_archive.MODE_ENV):
+        response_archive.install_from_env()
+
+    sys.argv = [script] + script_args
+    sys.path.insert(0, os.path.dirname(os.path.abspath(script)))
+    code = 0
+    with StepProbe(trace=trace) as probe:
+        try:
+            runpy.run_path(script, run_name='__main__')
+        except SystemExit as e:
+            code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+        except Exception:
+            traceback.print_exc()
+            code = 1
+
+    if out:
+        with open(out, 'w', encoding='utf-8') as f:
+            json.dump(probe.metrics, f)
+    else:
+        record = {'run_id': datetime.now().strftime('%Y%m%d-%H%M%S'),
+                  'ts': datetime.now().isoformat(timespec='seconds'),
+                  'step': step or os.path.splitext(os.path.basename(script))[0],
+                  'script': os.path.basename(script), 'mode': 'standalone',
+                  'status': 'ok' if code == 0 else 'failed'}
+        record.update(probe.metrics)
+        append_history([record], history)
+        print_records([record])
+    return code
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="THE BIBLE - Pipeline step telemetry")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    run = sub.add_parser('run', help='Run a script and record its telemetry')
+    run.add_argument('--out', help='Write the metrics JSON here instead of the history')
+    run.add_argument('--step', help='Step name for the history record')
+    run.add_argument('--tracemalloc', action='store_true', help='Record the top allocators')
+    run.add_argument('script')
+    run.add_argument('args', nargs=argparse.REMAINDER)
+
+    cmp_ = sub.add_parser('compare', help='Flag regressions against the trailing median')
+    cmp_.add_argument('--run', help='Run id to check (default: latest)')
+    cmp_.add_argument('--window', type=int, default=BASELINE_WINDOW)
+    cmp_.add_argument('--threshold', type=float, default=REGRESSION_RATIO)
+
+    show = sub.add_parser('show', help='Print the most recent records')
+    show.add_argument('--last', type=int, default=20)
+
+    for p in (run, cmp_, show):
+        p.add_argument('--history', default=HISTORY_FILE)
+    args = parser.parse_args(argv)
+
+    if args.command == 'run':
+        return run_script(args.script, args.args, out=args.out, step=args.step,
+                          trace=args.tracemalloc, history=args.history)
+    if args.command == 'compare':
+        regressions = compare(load_history(args.history), run_id=args.run,
+                              window=args.window, threshold=args.threshold)
+        return 1 if regressions else 0
+    print_records(load_history(args.history)[-args.last:])
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,207 @@
+"""
+rate_limiter.py
+===============
+THE BIBLE - Shared Request Rate Limiting
+
+Thread-safe token bucket shared by every worker of a scraper, so the total
+request rate against ESPN stays inside a fixed budget no matter how many
+threads are in flight.
+
+AdaptiveRateLimiter wraps the bucket with AIMD control: the rate and the
+number of requests in flight creep up while responses are healthy, and are
+cut in half (with a shared pause honouring Retry-After) when ESPN throttles.
+
+Usage:
+    limiter = TokenBucket(rate=4.0)   # 4 requests/second across all threads
+    limiter.acquire()                 # blocks until a token is available
+    session.get(url)
+
+    limiter = AdaptiveRateLimiter(initial_rate=4.0, max_concurrency=10)
+    with limiter.slot():
+        ...request...                 # then on_success / on_throttle / on_error
+"""
+
+import random
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+
+class TokenBucket:
+    """
+    Classic token bucket: tokens refill continuously at `rate` per second up
+    to `capacity`. Each request spends one token; callers block when empty.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.capacity = max(1.0, float(capacity))
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def set_rate(self, rate: float):
+        """Changes the refill rate (tokens already earned are kept)."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = float(rate)
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def acquire(self, tokens: float = 1.0):
+        """Blocks until `tokens` are available, then spends them."""
+        while True:
+            with self._lock:
+                self._refill(time.monotonic())
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait = (tokens - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+def parse_retry_after(value) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP-date), or None."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=timezone.utc)
+        return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+class AdaptiveRateLimiter:
+    """
+    Process-wide AIMD limiter shared by every worker thread.
+
+    - Additive increase: each healthy response adds `increase_step` req/s; once
+      a full window of responses comes back under `target_latency`, one more
+      request may be in flight (up to `max_concurrency`).
+    - Multiplicative decrease: a throttle (429/503) halves the rate and the
+      concurrency limit and pauses *all* workers for Retry-After (or a jittered
+      backoff). Decreases are rate-limited so one burst of 429s from ten
+      threads counts as a single congestion event.
+    """
+
+    def __init__(self, initial_rate: float = 4.0, min_rate: float = 0.5, max_rate: float = 20.0,
+                 initial_concurrency: int = 4, min_concurrency: int = 1, max_concurrency: int = 10,
+                 increase_step: float = 0.1, decrease_factor: float = 0.5,
+                 target_latency: float = 1.0, base_backoff: float = 1.0, max_backoff: float = 60.0):
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.min_concurrency = max(1, min_concurrency)
+        self.max_concurrency = max(self.min_concurrency, max_concurrency)
+        self.increase_step = increase_step
+        self.decrease_factor = decrease_factor
+        self.target_latency = target_latency
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+
+        self.rate = min(max(initial_rate, min_rate), max_rate)
+        self.concurrency = min(max(initial_concurrency, self.min_concurrency), self.max_concurrency)
+        self._bucket = TokenBucket(self.rate)
+        self._cond = threading.Condition()
+        self._in_flight = 0
+        self._healthy_streak = 0
+        self._paused_until = 0.0
+        self._last_decrease = 0.0
+        self.stats = {'requests': 0, 'throttled': 0, 'errors': 0, 'peak_rate': self.rate,
+                      'peak_concurrency': self.concurrency}
+
+    # ------------------------------------------------------------------
+    # Admission
+    # ------------------------------------------------------------------
+    @contextmanager
+    def slot(self):
+        """Blocks for a concurrency slot, any shared pause, and a rate token."""
+        with self._cond:
+            while self._in_flight >= self.concurrency:
+                self._cond.wait()
+            self._in_flight += 1
+        try:
+            while True:
+                wait = self._paused_until - time.monotonic()
+                if wait <= 0:
+                    break
+                time.sleep(wait)
+            self._bucket.acquire()
+            with self._cond:
+                self.stats['requests'] += 1
+            yield
+        finally:
+            with self._cond:
+                self._in_flight -= 1
+                self._cond.notify()
+
+    # ------------------------------------------------------------------
+    # Feedback
+    # ------------------------------------------------------------------
+    def on_success(self, latency: float):
+        with self._cond:
+            self.rate = min(self.max_rate, self.rate + self.increase_step)
+            if latency <= self.target_latency:
+                self._healthy_streak += 1
+                if self._healthy_streak >= self.concurrency and self.concurrency < self.max_concurrency:
+                    self.concurrency += 1
+                    self._healthy_streak = 0
+                    self._cond.notify()
+            else:
+                self._healthy_streak = 0
+                if latency > 2 * self.target_latency and self.concurrency > self.min_concurrency:
+                    self.concurrency -= 1
+            self.stats['peak_rate'] = max(self.stats['peak_rate'], self.rate)
+            self.stats['peak_concurrency'] = max(self.stats['peak_concurrency'], self.concurrency)
+            rate = self.rate
+        self._bucket.set_rate(rate)
+
+    def on_throttle(self, retry_after: Optional[float] = None, attempt: int = 0):
+        """Server pushed back (429/503): back off everyone, not just this thread."""
+        pause = retry_after if retry_after is not None else self.backoff_delay(attempt)
+        with self._cond:
+            self.stats['throttled'] += 1
+            now = time.monotonic()
+            self._paused_until = max(self._paused_until, now + pause)
+            self._decrease(now)
+            rate = self.rate
+        self._bucket.set_rate(rate)
+
+    def on_error(self):
+        """Timeouts / connection errors: treated as a (milder) congestion signal."""
+        with self._cond:
+            self.stats['errors'] += 1
+            self._healthy_streak = 0
+            if self.concurrency > self.min_concurrency:
+                self.concurrency -= 1
+
+    def _decrease(self, now: float):
+        # One congestion event per second, however many threads report it
+        if now - self._last_decrease < 1.0:
+            return
+        self._last_decrease = now
+        self._healthy_streak = 0
+        self.rate = max(self.min_rate, self.rate * self.decrease_factor)
+        self.concurrency = max(self.min_concurrency, int(self.concurrency * self.decrease_factor))
+
+    def backoff_delay(self, attempt: int) -> float:
+        """Exponential backoff with full jitter: uniform(0, base * 2^attempt), capped."""
+        return random.uniform(0, min(self.max_backoff, self.base_backoff * (2 ** attempt)))
+
+    def summary(self) -> str:
+        s = self.stats
+        return (f"Rate limiter: {s['requests']} requests, {s['throttled']} throttled, "
+                f"{s['errors']} errors | now {self.rate:.1f} req/s x {self.concurrency} "
+                f"(peak {s['peak_rate']:.1f} req/s x {s['peak_concurrency']})")
@@ -0,0 +1,222 @@
+"""
+response_archive.py
+===================
+THE BIBLE - Record / Replay Archive of Upstream HTTP Responses
+
+Every scraper and KenPom loader talks to the network through `requests`, so
+one patch on requests.Session.send covers them all:
+
+    record  -> each real response is stored (gzipped body + index line)
+    replay  -> responses are served from the archive; nothing touches the
+               network, and a URL missing from the archive fails like an
+               offline connection
+
+Layout (under the archive directory, default .http_archive/):
+    index.jsonl                      -> one line per response: method, url, status, headers, blob
+    blobs/<ab>/<sha256(body)>.gz     -> gzipped body (identical payloads shared)
+
+Request headers are never written, so Authorization (KenPom API key) and
+cookies stay out of the archive.
+
+Usage:
+    python response_archive.py record 06_box_score_scraper_fixed.py
+    python response_archive.py replay 1_Data_Miner.py --full
+    python 05_run_pipeline.py --replay              # whole pipeline, offline
+
+    # or from inside a script
+    import response_archive
+    response_archive.install_from_env()   # BIBLE_HTTP_MODE=record|replay, BIBLE_HTTP_ARCHIVE=<dir>
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import runpy
+import sys
+import tempfile
+import threading
+import time
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_ARCHIVE = os.path.join(BASE_DIR, ".http_archive")
+
+MODE_ENV = "BIBLE_HTTP_MODE"
+ARCHIVE_ENV = "BIBLE_HTTP_ARCHIVE"
+CACHE_DIR_ENV = "BIBLE_HTTP_CACHE_DIR"  # read by http_cache.py
+MODES = ('record', 'replay')
+
+# Response headers that describe the wire encoding, not the (decoded) body we store
+DROP_HEADERS = {'content-encoding', 'content-length', 'transfer-encoding', 'set-cookie'}
+
+
+def _request_key(method: str, url: str) -> str:
+    return f"{method.upper()} {url}"
+
+
+class ResponseArchive:
+    """Append-only, content-addressed store of raw responses."""
+
+    def __init__(self, archive_dir: str = DEFAULT_ARCHIVE):
+        self.archive_dir = archive_dir
+        self.index_path = os.path.join(archive_dir, 'index.jsonl')
+        self._lock = threading.Lock()
+        self._index = None
+        self.stats = {'recorded': 0, 'replayed': 0, 'missing': 0}
+
+    def _blob_path(self, digest: str) -> str:
+        return os.path.join(self.archive_dir, 'blobs', digest[:2], digest + '.gz')
+
+    def load_index(self) -> dict:
+        """{'METHOD url': entry}; the newest recording of a URL wins."""
+        if self._index is None:
+            index = {}
+            if os.path.exists(self.index_path):
+                with open(self.index_path, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        if line.strip():
+                            entry = json.loads(line)
+                            index[_request_key(entry['method'], entry['url'])] = entry
+            self._index = index
+        return self._index
+
+    def record(self, request: requests.PreparedRequest, response: requests.Response):
+        body = response.content
+        digest = hashlib.sha256(body).hexdigest()
+        entry = {
+            'method': request.method,
+            'url': request.url,
+            'status': response.status_code,
+            'reason': response.reason,
+            'headers': {k: v for k, v in response.headers.items() if k.lower() not in DROP_HEADERS},
+            'blob': digest,
+            'recorded_at': time.time(),
+        }
+        with self._lock:
+            blob_path = self._blob_path(digest)
+            if not os.path.exists(blob_path):
+                os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+                with open(blob_path, 'wb') as f:
+                    f.write(gzip.compress(body))
+            with open(self.index_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry) + "\n")
+            if self._index is not None:
+                self._index[_request_key(entry['method'], entry['url'])] = entry
+            self.stats['recorded'] += 1
+
+    def replay(self, request: requests.PreparedRequest) -> requests.Response:
+        entry = self.load_index().get(_request_key(request.method, request.url))
+        if entry is None:
+            with self._lock:
+                self.stats['missing'] += 1
+            raise requests.ConnectionError(f"Not in response archive: {request.url}", request=request)
+
+        with gzip.open(self._blob_path(entry['blob']), 'rb') as f:
+            body = f.read()
+
+        response = requests.Response()
+        response.status_code = entry['status']
+        response.reason = entry.get('reason')
+        response.headers = CaseInsensitiveDict(entry['headers'])
+        response.encoding = get_encoding_from_headers(response.headers)
+        response._content = body
+        response.url = request.url
+        response.request = request
+        with self._lock:
+            self.stats['replayed'] += 1
+        return response
+
+    def summary(self) -> str:
+        s = self.stats
+        return (f"Response archive ({self.archive_dir}): {s['recorded']} recorded, "
+                f"{s['replayed']} replayed, {s['missing']} missing")
+
+
+# ============================================================================
+# INSTALLATION (patches requests.Session.send)
+# ============================================================================
+_original_send = requests.Session.send
+_active = None
+
+
+def install(mode: str, archive_dir: str = DEFAULT_ARCHIVE) -> ResponseArchive:
+    """Routes every requests call in this process through the archive."""
+    global _active
+    if mode not in MODES:
+        raise ValueError(f"mode must be one of {MODES}, got {mode!r}")
+
+    os.makedirs(archive_dir, exist_ok=True)
+    archive = ResponseArchive(archive_dir)
+
+    # The on-disk HTTP cache would otherwise answer requests before they reach
+    # us (nothing recorded / replay not exercised). Give this run a private one.
+    os.environ.setdefault(CACHE_DIR_ENV, tempfile.mkdtemp(prefix='bible_http_cache_'))
+
+    if mode == 'record':
+        def send(self, request, **kwargs):
+            response = _original_send(self, request, **kwargs)
+            archive.record(request, response)
+            return response
+    else:
+        def send(self, request, **kwargs):
+            return archive.replay(request)
+
+    requests.Session.send = send
+    _active = archive
+    return archive
+
+
+def uninstall():
+    global _active
+    requests.Session.send = _original_send
+    _active = None
+
+
+def install_from_env():
+    """Installs record/replay if BIBLE_HTTP_MODE is set; returns the archive or None."""
+    mode = os.environ.get(MODE_ENV, '').strip().lower()
+    if not mode:
+        return None
+    return install(mode, os.environ.get(ARCHIVE_ENV) or DEFAULT_ARCHIVE)
+
+
+def active_archive():
+    return _active
+
+
+# ============================================================================
+# LAUNCHER
+# ============================================================================
+def main(argv=None):
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if len(argv) < 2 or argv[0] not in MODES:
+        print("Usage: python response_archive.py record|replay <script.py> [script args...]")
+        print(f"       archive dir: ${ARCHIVE_ENV} (default {DEFAULT_ARCHIVE})")
+        return 2
+
+    mode, script = argv[0], argv[1]
+    os.environ[MODE_ENV] = mode
+    os.environ.setdefault(ARCHIVE_ENV, DEFAULT_ARCHIVE)
+    archive = install_from_env()
+    print(f"📼 HTTP {mode} mode -> {archive.archive_dir}")
+
+    sys.argv = [script] + argv[2:]
+    sys.path.insert(0, os.path.dirname(os.path.abspath(script)))
+    try:
+        runpy.run_path(script, run_name='__main__')
+    except SystemExit as e:
+        print(f"📼 {archive.summary()}")
+        return e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+    print(f"📼 {archive.summary()}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,6 +6,7 @@ THE BIBLE - PHASE 2: BOX SCORE ENGINE (SOLVED)
 FIX:
   - Updated parser to handle ESPN's verbose stat labels:
     "fieldGoalsMade-fieldGoalsAttempted" instead of "fieldGoals"
+  - Box scores are read through the persistent HTTP cache (http_cache.py)
 """
 
 import requests
@@ -15,6 +16,8 @@ import os
 import logging
 import re
 
+import http_cache
+
 # ==============================================================================
 # CONFIGURATION
 # ==============================================================================
@@ -60,8 +63,7 @@ def get_completed_games(team_id):
 def fetch_box_score(game_id):
     url = f"http://site.api.espn.com/apis/site/v2/sports/basketball/mens-college-basketball/summary?event={game_id}"
     try:
-        resp = requests.get(url, headers=HEADERS, timeout=10)
-        return resp.json() if resp.status_code == 200 else None
+        return http_cache.get_json(url, headers=HEADERS, timeout=10)
     except:
         return None
 
@@ -213,7 +215,8 @@ def main():
         except Exception as e:
             continue
             
-        time.sleep(REQUEST_DELAY)
+        if not http_cache.last_was_hit():
+            time.sleep(REQUEST_DELAY)
 
     # FINAL SAVE
     if len(new_rows) > 0:
@@ -221,6 +224,7 @@ def main():
         if os.path.exists(OUTPUT_FILE): df.to_csv(OUTPUT_FILE, mode='a', header=False, index=False)
         else: df.to_csv(OUTPUT_FILE, mode='w', header=True, index=False)
         print("   [FINAL SAVE] Process Complete.")
+    logger.info(http_cache.summary())
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,351 @@
+"""
+team_names.py
+=============
+THE BIBLE - Shared Team Name Resolver
+
+Every stage used to carry its own mascot list and normalizer (01 clean_team_name,
+02 normalize_name, 03/04 normalize_team_name, simulator standardize_name),
+each running one re.sub per mascot per call, row by row. This module is the
+single source for all of them:
+
+    team_key(name)            -> join key, e.g. "UConn Huskies" -> "connecticut"
+    clean_display_name(name)  -> schedule-page opponent text -> "UConn"
+    to_kenpom(name)           -> ESPN display name -> KenPom name
+
+The ~200 mascots are compiled into ONE anchored alternation (longest first,
+so "golden eagles" wins over "eagles"), every function is memoized, and the
+*_series helpers normalize each distinct name once (pd.factorize) and
+broadcast the result back.
+
+Usage:
+    from team_names import team_key, keys_series
+    logs['TeamKey'] = keys_series(logs['Team'])
+"""
+
+import re
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+# ============================================================================
+# DATA: MASCOTS & ALIASES
+# ============================================================================
+MASCOTS = [
+    'crimson tide', 'razorbacks', 'tigers', 'gators', 'bulldogs', 'wildcats',
+    'rebels', 'commodores', 'gamecocks', 'volunteers', 'vols', 'aggies', 
+    'longhorns', 'buckeyes', 'wolverines', 'spartans', 'nittany lions', 'hawkeyes',
+    'golden gophers', 'gophers', 'badgers', 'boilermakers', 'hoosiers', 
+    'fighting illini', 'illini', 'cornhuskers', 'huskers', 'scarlet knights',
+    'terrapins', 'terps', 'bruins', 'trojans', 'ducks', 'huskies', 'cougars',
+    'jayhawks', 'red raiders', 'horned frogs', 'bears', 'cyclones', 'sooners',
+    'cowboys', 'cowgirls', 'mountaineers', 'bearcats', 'knights', 'sun devils',
+    'buffaloes', 'buffs', 'utes', 'cardinals', 'red storm', 'blue devils', 
+    'tar heels', 'wolfpack', 'wolf pack', 'demon deacons', 'cavaliers', 'wahoos', 
+    'hokies', 'yellow jackets', 'ramblin wreck', 'seminoles', 'noles', 'hurricanes', 
+    'canes', 'orange', 'orangemen', 'panthers', 'fighting irish', 'irish', 'eagles', 
+    'cardinal', 'blue jays', 'bluejays', 'hoyas', 'pirates', 'friars', 'musketeers',
+    'golden eagles', 'marquette golden eagles', 'providence friars', 'green wave', 
+    'owls', 'mustangs', 'bulls', 'blazers', 'mean green', 'roadrunners', 
+    'thundering herd', 'aztecs', 'falcons', 'rams', 'lobos', 'running rebels', 
+    'broncos', 'rainbow warriors', 'warriors', 'gaels', 'toreros', 'dons', 'waves', 
+    'lions', 'pilots', 'zags', 'gonzaga bulldogs', 'big green', 'crimson', 'quakers', 
+    'big red', 'leopards', 'mountain hawks', 'raiders', 'crusaders', 'bison', 
+    'black knights', 'cadets', 'midshipmen', 'mids', 'tribe', 'monarchs', 'dukes', 
+    'patriots', 'pride', 'phoenix', 'seahawks', 'dragons', 'billikens', 'colonials', 
+    'explorers', 'hawks', 'flyers', 'bonnies', 'spiders', 'rhodies', 'redbirds', 
+    'braves', 'shockers', 'sycamores', 'leathernecks', 'salukis', 'catamounts', 
+    'great danes', 'retrievers', 'river hawks', 'seawolves', 'terriers', 'mastodons',
+    'flames', 'penguins', 'norse', 'vikings', 'jaguars', 'roos', 'coyotes', 
+    'jackrabbits', 'jaspers', 'peacocks', 'red foxes', 'purple eagles', 'stags', 
+    'griffs', 'golden griffins', 'saints', 'mocs', 'paladins', 'keydets', 
+    'buccaneers', 'bucs', 'rattlers', 'lumberjacks', 'vandals', 'grizzlies', 'griz', 
+    'bobcats', 'bengals', 'thunderbirds', 'matadors', 'gauchos', 'highlanders', 
+    'anteaters', 'titans', 'beach', 'governors', 'govs', 'colonels', 'racers', 
+    'redhawks', 'skyhawks', 'demons', 'privateers', 'tritons', 'banana slugs', 
+    'fighting camels', 'ichabods', 'penmen', 'blue hose', 'chanticleers', 'firebirds',
+    'villanova wildcats', 'miners', 'rockets', 'zips', 'golden flashes', 'flashes',
+    'red wolves', 'golden lions', 'lancers', 'golden bears', 'chippewas', '49ers',
+    'blue demons', 'blue hens', 'pioneers', "runnin' bulldogs", 'revolutionaries',
+    'lopes', 'dolphins', 'bisons', 'sharks', "ragin' cajuns", 'ramblers', 'greyhounds',
+    'black bears', 'minutemen', 'lakers', 'delta devils', 'chargers', 'fighting hawks',
+    'golden grizzlies', 'mavericks', 'beavers', 'broncs', 'red flash', 'tommies',
+    'hatters', 'texans', 'warhawks', 'vaqueros', 'trailblazers', 'wolves',
+    'hilltoppers', 'purple aces', 'beacons', 'hornets', 'ospreys', 'islanders',
+    'bearkats', 'golden hurricane', 'blue raiders'
+]
+
+# Raw/lowercased name -> normalized join key (checked before and after mascot stripping)
+KEY_ALIASES = {
+    'uc san diego': 'ucsd', 'uc davis': 'ucdavis', 'uc irvine': 'ucirvine',
+    'uc riverside': 'ucriverside', 'uc santa barbara': 'ucsb',
+    'cal state fullerton': 'csfullerton', 'cal state northridge': 'csnorthridge',
+    'cal state bakersfield': 'csbakersfield', 'long beach state': 'longbeachstate',
+    'san diego state': 'sandiegostate', 'san jose state': 'sanjosestate',
+    'fresno state': 'fresnostate', 'usc': 'southerncal', 'ucla': 'ucla',
+    'unlv': 'unlv', 'utep': 'utep', 'utsa': 'utsa', 'unc': 'northcarolina',
+    'uconn': 'connecticut', 'smu': 'smu', 'tcu': 'tcu', 'lsu': 'lsu', 'vcu': 'vcu',
+    'fiu': 'fiu', 'fau': 'fau', 'byu': 'byu', 'ucf': 'ucf', 'penn state': 'pennstate',
+    'penn st': 'pennstate', 'ohio state': 'ohiostate', 'ohio st': 'ohiostate',
+    'michigan state': 'michiganstate', 'michigan st': 'michiganstate',
+    'florida state': 'floridastate', 'florida st': 'floridastate',
+    'nc state': 'ncstate', 'north carolina state': 'ncstate',
+    'iowa state': 'iowastate', 'kansas state': 'kansasstate',
+    'oklahoma state': 'oklahomastate', 'oregon state': 'oregonstate',
+    'washington state': 'washingtonstate', 'arizona state': 'arizonastate',
+    'colorado state': 'coloradostate', "saint mary's": 'stmarys',
+    "st. mary's": 'stmarys', "st mary's": 'stmarys', "saint john's": 'stjohns',
+    "st. john's": 'stjohns', "st john's": 'stjohns', "saint joseph's": 'saintjosephs',
+    "st. joseph's": 'saintjosephs', "saint louis": 'saintlouis',
+    "st. louis": 'saintlouis', "saint peter's": 'stpeters', "st. peter's": 'stpeters',
+    "saint bonaventure": 'stbonaventure', "st. bonaventure": 'stbonaventure',
+    'north carolina': 'northcarolina', 'south carolina': 'southcarolina',
+    'north texas': 'northtexas', 'south florida': 'southflorida',
+    'east carolina': 'eastcarolina', 'west virginia': 'westvirginia',
+    'northern iowa': 'northerniowa', 'southern illinois': 'southernillinois',
+    'western kentucky': 'westernkentucky', 'eastern kentucky': 'easternkentucky',
+    'middle tennessee': 'middletennessee', 'ole miss': 'mississippi',
+    'pitt': 'pittsburgh', "hawai'i": 'hawaii', 'miami (fl)': 'miami',
+    'miami (oh)': 'miamioh', 'miami florida': 'miami', 'miami ohio': 'miamioh',
+    'louisiana': 'louisiana', 'louisiana-lafayette': 'louisiana',
+    'ul lafayette': 'louisiana', 'louisiana-monroe': 'ulmonroe',
+    'ul monroe': 'ulmonroe', 'texas a&m': 'texasam', 'texas a & m': 'texasam',
+    # Post-normalization forms (full ESPN display names after mascot stripping)
+    'calstatebakersfield': 'csbakersfield', 'calstatenorthridge': 'csnorthridge',
+    'calstatefullerton': 'csfullerton', 'ucsandiego': 'ucsd', 'ucsantabarbara': 'ucsb',
+    'olemiss': 'mississippi', 'saintmarys': 'stmarys', 'saintpeters': 'stpeters',
+    'texasaandm': 'texasam',
+}
+
+# Lowercased schedule text -> display name (Step 1 output)
+DISPLAY_ALIASES = {
+    # California schools
+    'uc san diego': 'UC San Diego',
+    'ucsd': 'UC San Diego',
+    'uc davis': 'UC Davis',
+    'uc irvine': 'UC Irvine',
+    'uc riverside': 'UC Riverside',
+    'uc santa barbara': 'UC Santa Barbara',
+    'ucsb': 'UC Santa Barbara',
+    
+    # State abbreviations
+    'usc': 'USC',
+    'ucla': 'UCLA',
+    'unlv': 'UNLV',
+    'utep': 'UTEP',
+    'utsa': 'UTSA',
+    'unc': 'North Carolina',
+    'uconn': 'UConn',
+    'smu': 'SMU',
+    'tcu': 'TCU',
+    'lsu': 'LSU',
+    'vcu': 'VCU',
+    'fiu': 'FIU',
+    'fau': 'FAU',
+    
+    # Saint vs St.
+    "saint mary's": "Saint Mary's",
+    "st. mary's": "Saint Mary's",
+    "saint john's": "St. John's",
+    "saint joseph's": "Saint Joseph's",
+    "saint louis": "Saint Louis",
+    "st. louis": "Saint Louis",
+    "saint peter's": "Saint Peter's",
+    "saint bonaventure": "St. Bonaventure",
+    
+    # Other variations
+    'miami (fl)': 'Miami',
+    'miami florida': 'Miami',
+    'miami (oh)': 'Miami (OH)',
+    'miami ohio': 'Miami (OH)',
+    "hawai'i": "Hawaii",
+    'hawaii rainbow warriors': 'Hawaii',
+    'ole miss': 'Ole Miss',
+    'mississippi': 'Ole Miss',
+    'pitt': 'Pittsburgh',
+    'nc state': 'NC State',
+    'north carolina state': 'NC State',
+}
+
+# ESPN display name -> KenPom team name (None = non-D1)
+KENPOM_TRANSLATION = {
+    # --- ACC ---
+    "Boston College Eagles": "Boston College", "California Golden Bears": "California",
+    "Clemson Tigers": "Clemson", "Duke Blue Devils": "Duke", "Florida State Seminoles": "Florida St.",
+    "Georgia Tech Yellow Jackets": "Georgia Tech", "Louisville Cardinals": "Louisville",
+    "Miami Hurricanes": "Miami FL", "NC State Wolfpack": "N.C. State",
+    "North Carolina Tar Heels": "North Carolina", "Notre Dame Fighting Irish": "Notre Dame",
+    "Pittsburgh Panthers": "Pittsburgh", "SMU Mustangs": "SMU", "Stanford Cardinal": "Stanford",
+    "Syracuse Orange": "Syracuse", "Virginia Cavaliers": "Virginia",
+    "Virginia Tech Hokies": "Virginia Tech", "Wake Forest Demon Deacons": "Wake Forest",
+
+    # --- BIG 12 ---
+    "Arizona Wildcats": "Arizona", "Arizona State Sun Devils": "Arizona St.",
+    "Baylor Bears": "Baylor", "BYU Cougars": "BYU", "UCF Golden Knights": "UCF",
+    "Cincinnati Bearcats": "Cincinnati", "Colorado Buffaloes": "Colorado",
+    "Houston Cougars": "Houston", "Iowa State Cyclones": "Iowa St.", "Kansas Jayhawks": "Kansas",
+    "Kansas State Wildcats": "Kansas St.", "Oklahoma State Cowboys": "Oklahoma St.",
+    "TCU Horned Frogs": "TCU", "Texas Tech Red Raiders": "Texas Tech", "Utah Utes": "Utah",
+    "West Virginia Mountaineers": "West Virginia",
+
+    # --- BIG EAST ---
+    "Butler Bulldogs": "Butler", "Connecticut Huskies": "Connecticut", "UConn Huskies": "Connecticut",
+    "Creighton Bluejays": "Creighton", "DePaul Blue Demons": "DePaul", "Georgetown Hoyas": "Georgetown",
+    "Marquette Golden Eagles": "Marquette", "Providence Friars": "Providence",
+    "Seton Hall Pirates": "Seton Hall", "St. John's Red Storm": "St. John's",
+    "Villanova Wildcats": "Villanova", "Xavier Musketeers": "Xavier",
+
+    # --- BIG TEN ---
+    "Illinois Fighting Illini": "Illinois", "Indiana Hoosiers": "Indiana", "Iowa Hawkeyes": "Iowa",
+    "Maryland Terrapins": "Maryland", "Michigan Wolverines": "Michigan",
+    "Michigan State Spartans": "Michigan St.", "Minnesota Golden Gophers": "Minnesota",
+    "Nebraska Cornhuskers": "Nebraska", "Northwestern Wildcats": "Northwestern",
+    "Ohio State Buckeyes": "Ohio St.", "Oregon Ducks": "Oregon", "Penn State Nittany Lions": "Penn St.",
+    "Purdue Boilermakers": "Purdue", "Rutgers Scarlet Knights": "Rutgers", "UCLA Bruins": "UCLA",
+    "USC Trojans": "USC", "Washington Huskies": "Washington", "Wisconsin Badgers": "Wisconsin",
+
+    # --- SEC ---
+    "Alabama Crimson Tide": "Alabama", "Arkansas Razorbacks": "Arkansas", "Auburn Tigers": "Auburn",
+    "Florida Gators": "Florida", "Georgia Bulldogs": "Georgia", "Kentucky Wildcats": "Kentucky",
+    "LSU Tigers": "LSU", "Mississippi Rebels": "Ole Miss", "Ole Miss Rebels": "Ole Miss",
+    "Mississippi State Bulldogs": "Mississippi St.", "Missouri Tigers": "Missouri",
+    "Oklahoma Sooners": "Oklahoma", "South Carolina Gamecocks": "South Carolina",
+    "Tennessee Volunteers": "Tennessee", "Texas Longhorns": "Texas", "Texas A&M Aggies": "Texas A&M",
+    "Vanderbilt Commodores": "Vanderbilt",
+
+    # --- MOUNTAIN WEST ---
+    "Air Force Falcons": "Air Force", "Boise State Broncos": "Boise St.", "Colorado State Rams": "Colorado St.",
+    "Fresno State Bulldogs": "Fresno St.", "Grand Canyon Antelopes": "Grand Canyon",
+    "Nevada Wolf Pack": "Nevada", "New Mexico Lobos": "New Mexico", "San Diego State Aztecs": "San Diego St.",
+    "San José State Spartans": "San Jose St.", "UNLV Runnin' Rebels": "UNLV",
+    "Utah State Aggies": "Utah St.", "Wyoming Cowboys": "Wyoming",
+
+    # --- WCC ---
+    "Gonzaga Bulldogs": "Gonzaga", "Loyola Marymount Lions": "LMU", "Oregon State Beavers": "Oregon St.",
+    "Pacific Tigers": "Pacific", "Pepperdine Waves": "Pepperdine", "Portland Pilots": "Portland",
+    "Saint Mary's Gaels": "Saint Mary's", "San Diego Toreros": "San Diego",
+    "San Francisco Dons": "San Francisco", "Santa Clara Broncos": "Santa Clara",
+    "Seattle U Redhawks": "Seattle", "Washington State Cougars": "Washington St.",
+
+    # --- GENERAL / MID-MAJORS ---
+    "Albany Great Danes": "Albany", "UAB Blazers": "UAB", "VCU Rams": "VCU",
+    "FAU Owls": "Florida Atlantic", "FIU Panthers": "FIU",
+    "Middle Tennessee Blue Raiders": "Middle Tennessee", "Louisiana Tech Bulldogs": "Louisiana Tech",
+    "Liberty Flames": "Liberty", "Dayton Flyers": "Dayton", "Saint Louis Billikens": "Saint Louis",
+    "Loyola Chicago Ramblers": "Loyola Chicago", "Memphis Tigers": "Memphis",
+    "South Florida Bulls": "South Florida", "Wichita State Shockers": "Wichita St.",
+    "College of Charleston Cougars": "Charleston", "UNC Wilmington Seahawks": "UNCW",
+    
+    # --- COMMON FIXES ---
+    "Miami (FL)": "Miami FL", "Miami (OH)": "Miami OH", "Saint Peter's": "Saint Peter's",
+    "St. Peter's": "Saint Peter's", "St. Mary's": "Saint Mary's", "Ole Miss": "Mississippi",
+    "Mississippi": "Mississippi", "UConn": "Connecticut", "Pitt": "Pittsburgh",
+    "Southern Miss": "Southern Miss", "UL Monroe": "ULM", "Louisiana-Monroe": "ULM",
+    "Louisiana Lafayette": "Louisiana", "Louisiana-Lafayette": "Louisiana", "UT Rio Grande Valley": "UTRGV",
+    "UTRGV Vaqueros": "UTRGV", "Texas A&M-Corpus Christi": "Texas A&M Corpus Chris",
+    "St. Thomas (MN)": "St. Thomas", "LIU": "Long Island", "Long Island University": "Long Island",
+    "Kansas City Roos": "Kansas City", "UMKC": "Kansas City", "Omaha": "Nebraska Omaha",
+    "Purdue Fort Wayne": "Purdue Fort Wayne", "IPFW": "Purdue Fort Wayne", "Green Bay": "Green Bay",
+    "Milwaukee": "Milwaukee", "Detroit Mercy": "Detroit Mercy", "IUPUI": "IU Indy", "IU Indianapolis": "IU Indy",
+    "Southwestern Christian": None, "Washington Adventist": None, "Southern Wesleyan": None,
+}
+
+# ============================================================================
+# COMPILED PATTERNS
+# ============================================================================
+_MASCOT_ALTERNATION = '|'.join(re.escape(m) for m in sorted(set(MASCOTS), key=len, reverse=True))
+_MASCOT_SUFFIX = re.compile(r'\s+(?:' + _MASCOT_ALTERNATION + r')\s*$')
+_MASCOT_SUFFIX_CI = re.compile(r'\s+(?:' + _MASCOT_ALTERNATION + r')$', re.IGNORECASE)
+
+_LEADING_DIGITS = re.compile(r'^\d+')
+_NON_ALNUM = re.compile(r'[^a-z0-9]')
+_RANK_PREFIX = re.compile(r'^#\d+\s+')
+_VS_PREFIX = re.compile(r'^(@|vs\.?)\s*')
+_TRAILING_MARKS = re.compile(r'[\*†‡]+$')
+
+
+# ============================================================================
+# SCALAR API (memoized)
+# ============================================================================
+@lru_cache(maxsize=None)
+def _team_key(name: str) -> str:
+    name = name.lower().strip()
+    
+    # Strip leading digits (e.g., "12Gonzaga" -> "gonzaga")
+    name = _LEADING_DIGITS.sub('', name)
+    
+    if name in KEY_ALIASES: return KEY_ALIASES[name]
+    
+    name = _MASCOT_SUFFIX.sub('', name)
+    name = name.replace('st.', 'st').replace('&', 'and').replace("'", '').replace('-', '')
+    name = _NON_ALNUM.sub('', name).strip()
+    
+    return KEY_ALIASES.get(name, name)
+
+
+def team_key(name) -> str:
+    """Normalized join key shared by every pipeline stage ("" for non-strings)."""
+    if not isinstance(name, str): return ""
+    return _team_key(name)
+
+
+@lru_cache(maxsize=None)
+def _clean_display_name(raw_name: str) -> str:
+    name = raw_name.strip()
+    
+    # Remove ranking prefix (e.g., "#5 Duke" -> "Duke")
+    name = _RANK_PREFIX.sub('', name)
+    
+    # Remove @ or vs prefix
+    name = _VS_PREFIX.sub('', name)
+    
+    # Remove trailing asterisks or special chars
+    name = _TRAILING_MARKS.sub('', name).strip()
+    
+    # Check aliases first (case-insensitive)
+    name_lower = name.lower()
+    if name_lower in DISPLAY_ALIASES:
+        return DISPLAY_ALIASES[name_lower]
+    
+    return _MASCOT_SUFFIX_CI.sub('', name).strip()
+
+
+def clean_display_name(raw_name) -> str:
+    """Cleans schedule-page team text into a display name ("" for non-strings)."""
+    if not isinstance(raw_name, str):
+        return ""
+    return _clean_display_name(raw_name)
+
+
+@lru_cache(maxsize=None)
+def _to_kenpom(name: str):
+    name = name.strip()
+    return KENPOM_TRANSLATION.get(name, name)
+
+
+def to_kenpom(name):
+    """ESPN display name -> KenPom name (unknown names pass through)."""
+    if not isinstance(name, str): return str(name)
+    return _to_kenpom(name)
+
+
+# ============================================================================
+# SERIES API (one call per distinct name)
+# ============================================================================
+def _map_unique(series: pd.Series, fn, missing="") -> pd.Series:
+    codes, uniques = pd.factorize(series)
+    mapped = np.array([fn(u) for u in uniques] + [missing], dtype=object)
+    # factorize marks NaN as -1 -> last slot
+    return pd.Series(mapped[codes], index=series.index, name=series.name)
+
+
+def keys_series(series: pd.Series) -> pd.Series:
+    return _map_unique(series, team_key, missing=team_key(None))
+
+
+def display_series(series: pd.Series) -> pd.Series:
+    return _map_unique(series, clean_display_name, missing=clean_display_name(None))
+
+
+def kenpom_series(series: pd.Series) -> pd.Series:
+    return _map_unique(series, to_kenpom, missing=to_kenpom(np.nan))
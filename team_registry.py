@@ -0,0 +1,206 @@
+"""
+team_registry.py
+================
+THE BIBLE - Canonical Team Registry (ESPN ID keyed)
+
+One row per D1 team, keyed by ESPN team ID, persisted to
+team_registry_2026.csv:
+
+    TeamID | ESPNName | Location | ShortName | Abbrev | KenPomName | OddsName | Aliases
+
+The scrapers (01, 06, 1_Data_Miner via espn_summary) write TeamID /
+OpponentID columns straight from ESPN, and refresh the registry from the
+ESPN team list. Downstream stages join on those integer IDs; names that
+arrive without an ID (KenPom files, older CSVs) are resolved once per
+distinct name through the registry's alias index.
+
+Names the registry cannot place get a stable *negative* pseudo-ID per
+normalized name (team_names.team_key), so they still join with each other
+exactly as the old string keys did - they just never collide with a real team.
+
+Usage:
+    from team_registry import load_registry, team_ids
+    reg = load_registry()
+    logs['TeamKey'] = team_ids(logs, 'Team', 'TeamID')
+    logs['OppKey'] = team_ids(logs, 'Opponent', 'OpponentID')
+"""
+
+import os
+import tempfile
+import threading
+
+import numpy as np
+import pandas as pd
+
+from team_names import team_key, to_kenpom
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+REGISTRY_FILE = os.path.join(BASE_DIR, "team_registry_2026.csv")
+TEAMS_URL = "http://site.api.espn.com/apis/site/v2/sports/basketball/mens-college-basketball/teams?limit=400"
+
+COLUMNS = ['TeamID', 'ESPNName', 'Location', 'ShortName', 'Abbrev', 'KenPomName', 'OddsName', 'Aliases']
+ALIAS_SEP = '|'
+
+# Alias index priority: earlier columns win when two teams share a normalized name
+INDEX_COLUMNS = ['ESPNName', 'KenPomName', 'OddsName', 'Location', 'ShortName']
+
+
+class TeamRegistry:
+    """In-memory registry with a normalized-name -> TeamID index."""
+
+    def __init__(self, df: pd.DataFrame = None):
+        df = pd.DataFrame(columns=COLUMNS) if df is None else df
+        self.df = df.reindex(columns=COLUMNS)
+        self.df['TeamID'] = self.df['TeamID'].astype('int64')
+        self._lock = threading.Lock()
+        self._pseudo = {}
+        self._build_index()
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+    @classmethod
+    def load(cls, path: str = REGISTRY_FILE) -> 'TeamRegistry':
+        if not os.path.exists(path):
+            return cls()
+        return cls(pd.read_csv(path, dtype={'TeamID': 'int64'}, keep_default_na=False))
+
+    def save(self, path: str = REGISTRY_FILE):
+        # Atomic: the game-log and box-score scrapers can save at the same time
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8', newline='') as f:
+            self.df.sort_values('TeamID').to_csv(f, index=False)
+        os.replace(tmp, path)
+
+    def _build_index(self):
+        index = {}
+        for col in INDEX_COLUMNS + ['Aliases']:
+            for tid, value in zip(self.df['TeamID'], self.df[col]):
+                names = str(value).split(ALIAS_SEP) if col == 'Aliases' else [value]
+                for name in names:
+                    key = team_key(name)
+                    if key and key not in index:
+                        index[key] = int(tid)
+        self._index = index
+        self._names = dict(zip(self.df['TeamID'].astype(int), self.df['ESPNName']))
+        self._kenpom = dict(zip(self.df['TeamID'].astype(int), self.df['KenPomName']))
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+    def update_from_espn(self, teams: list) -> int:
+        """
+        Merges ESPN team dicts (the 'team' objects of the teams endpoint).
+        Existing KenPom/Odds names and aliases are kept. Returns # new teams.
+        """
+        rows = {int(r.TeamID): r._asdict() for r in self.df.itertuples(index=False)}
+        added = 0
+        for t in teams:
+            tid = int(t['id'])
+            row = rows.get(tid)
+            if row is None:
+                added += 1
+                row = {'TeamID': tid, 'KenPomName': '', 'OddsName': '', 'Aliases': ''}
+            row['ESPNName'] = t.get('displayName', '')
+            row['Location'] = t.get('location', '')
+            row['ShortName'] = t.get('shortDisplayName', '')
+            row['Abbrev'] = t.get('abbreviation', '')
+            if not row['KenPomName']:
+                row['KenPomName'] = to_kenpom(row['ESPNName']) or ''
+            if not row['OddsName']:
+                row['OddsName'] = row['ESPNName']
+            rows[tid] = row
+        with self._lock:
+            self.df = pd.DataFrame(list(rows.values()), columns=COLUMNS)
+            self.df['TeamID'] = self.df['TeamID'].astype('int64')
+            self._build_index()
+        return added
+
+    def add_alias(self, team_id: int, alias: str):
+        """Teaches the registry another spelling for a team."""
+        with self._lock:
+            mask = self.df['TeamID'] == int(team_id)
+            if not mask.any() or not alias:
+                return
+            current = [a for a in str(self.df.loc[mask, 'Aliases'].iloc[0]).split(ALIAS_SEP) if a]
+            if alias not in current:
+                self.df.loc[mask, 'Aliases'] = ALIAS_SEP.join(current + [alias])
+                self._index.setdefault(team_key(alias), int(team_id))
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+    def id_for(self, name):
+        """ESPN TeamID for any known spelling, or None."""
+        return self._index.get(team_key(name))
+
+    def key_for(self, name) -> int:
+        """TeamID, or a stable negative pseudo-ID for names the registry doesn't know."""
+        key = team_key(name)
+        tid = self._index.get(key)
+        if tid is not None:
+            return tid
+        with self._lock:
+            return self._pseudo.setdefault(key, -(len(self._pseudo) + 1))
+
+    def ids_series(self, names: pd.Series) -> pd.Series:
+        """Vectorized key_for: one lookup per distinct name."""
+        codes, uniques = pd.factorize(names)
+        mapped = np.array([self.key_for(u) for u in uniques] + [self.key_for(None)], dtype='int64')
+        return pd.Series(mapped[codes], index=names.index, name=names.name)
+
+    def name_for(self, team_id):
+        return self._names.get(int(team_id))
+
+    def kenpom_for(self, team_id):
+        return self._kenpom.get(int(team_id))
+
+    def unresolved(self) -> list:
+        """Normalized names that only got pseudo-IDs this run."""
+        return sorted(self._pseudo)
+
+    def __len__(self):
+        return len(self.df)
+
+
+# ============================================================================
+# MODULE-LEVEL HELPERS
+# ============================================================================
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def load_registry(path: str = REGISTRY_FILE) -> TeamRegistry:
+    """Process-wide registry, loaded from disk once."""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = TeamRegistry.load(path)
+        return _registry
+
+
+def refresh_from_espn(teams: list, path: str = REGISTRY_FILE) -> TeamRegistry:
+    """Called by the scrapers with the ESPN team list they already fetched."""
+    reg = load_registry(path)
+    added = reg.update_from_espn(teams)
+    reg.save(path)
+    if added:
+        print(f"   🗂️  Team registry: +{added} teams ({len(reg)} total)")
+    return reg
+
+
+def team_ids(df: pd.DataFrame, name_col: str, id_col: str = None) -> pd.Series:
+    """
+    Integer join key for each row: the scraped ESPN ID when the frame has
+    one, otherwise the registry lookup of the name column.
+    """
+    reg = load_registry()
+    keys = reg.ids_series(df[name_col])
+    if id_col and id_col in df.columns:
+        scraped = pd.to_numeric(df[id_col], errors='coerce')
+        keys = scraped.fillna(keys).astype('int64')
+    return keys